@@ -4,15 +4,13 @@ Hysen Heating Controller integration for Home Assistant.
 This integration supports binary sensor, climate, sensor, and switch entities for Hysen devices.
 """
 
-import asyncio
 import logging
-import binascii
 import voluptuous as vol
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.exceptions import ConfigEntryNotReady, ServiceValidationError
 from homeassistant.helpers import config_validation as cv
-from hysen import HysenHeatingDevice
 from .const import (
     DOMAIN,
     PLATFORMS,
@@ -20,10 +18,13 @@ from .const import (
     CONF_MAC, 
     CONF_NAME, 
     CONF_TIMEOUT,
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
     DEFAULT_NAME, 
     DEFAULT_TIMEOUT,
-    DEFAULT_SYNC_CLOCK,
-    DEFAULT_SYNC_HOUR,
+    DEFAULT_REPLAY_FILE,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_LOOP_BLOCK_THRESHOLD,
     ATTR_ENTITY_ID,
     ATTR_HVAC_MODE,
     ATTR_TEMPERATURE,
@@ -32,9 +33,35 @@ from .const import (
     SERVICE_SET_TEMPERATURE,
     SERVICE_SET_HVAC_MODE,
     SERVICE_SET_PRESET_MODE,
+    SERVICE_EXPORT_TRACES,
+    ATTR_TRACE_ID,
+    ATTR_LIMIT,
+    ATTR_CLEAR,
+    ATTR_DURATION,
+    SERVICE_PROFILE_START,
+    SERVICE_PROFILE_STOP,
+    DEFAULT_PROFILE_DURATION,
+    MAX_PROFILE_DURATION,
+    DATA_TRACER,
+    DATA_PROFILER,
+    DATA_WATCHDOG,
+    DATA_DISCOVERY_CACHE,
+    DATA_SESSIONS,
+    DATA_EXECUTOR,
+    DATA_GATEWAY,
+    DATA_TRANSPORT,
+    DATA_FLEET,
     HVACMode,
 )
-from .coordinator import HysenCoordinator
+from .coordinator import HysenCoordinator, get_entry_setting
+from .trace import HysenTracer
+from .metrics import HysenMetricsView
+from .profiler import HysenProfiler
+from .device import create_device
+from .watchdog import HysenLoopWatchdog
+from .session import HysenSessionStore
+from .executor import HysenExecutor
+from .capture import create_replay_device
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,52 +79,123 @@ async def async_setup(hass: HomeAssistant, config: dict):
     """
     _LOGGER.info("Initializing HysenHeating integration")
     hass.data.setdefault(DOMAIN, {})
+    tracer = hass.data.setdefault(DATA_TRACER, HysenTracer())
+    profiler = hass.data.setdefault(DATA_PROFILER, HysenProfiler(hass))
+    if DATA_SESSIONS not in hass.data:
+        sessions = HysenSessionStore(hass)
+        await sessions.async_load()
+        hass.data[DATA_SESSIONS] = sessions
+
+    async def async_export_traces_handler(service_call):
+        """Handle the hysenheat.export_traces service call.
+
+        Returns the spans recorded for commands and polls, oldest first.
+
+        Args:
+            service_call (homeassistant.core.ServiceCall): The service call object. Accepts an
+                optional 'trace_id' to select a single trace, 'limit' to return only the most
+                recent spans and 'clear' to empty the buffer after exporting.
+
+        Returns:
+            dict: The recorded spans under the 'spans' key.
+
+        Example:
+            Service call data:
+            service: hysenheat.export_traces
+            data:
+              limit: 50
+        """
+        spans = tracer.export(
+            trace_id=service_call.data.get(ATTR_TRACE_ID),
+            limit=service_call.data.get(ATTR_LIMIT),
+        )
+        if service_call.data.get(ATTR_CLEAR):
+            tracer.clear()
+        return {"spans": spans}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_TRACES,
+        async_export_traces_handler,
+        schema=vol.Schema({
+            vol.Optional(ATTR_TRACE_ID): cv.string,
+            vol.Optional(ATTR_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(ATTR_CLEAR, default=False): cv.boolean,
+        }),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_profile_start_handler(service_call):
+        """Handle the hysenheat.profile_start service call.
+
+        Starts profiling the integration's executor jobs and coroutine hot paths for a bounded
+        window. The results are written to the config directory when the window ends.
+
+        Args:
+            service_call (homeassistant.core.ServiceCall): The service call object. Accepts an
+                optional 'duration' in seconds.
+
+        Raises:
+            ServiceValidationError: If profiling is already running.
+        """
+        duration = service_call.data[ATTR_DURATION]
+        if not profiler.async_start(duration):
+            _LOGGER.error("Profiling is already running")
+            raise ServiceValidationError(
+                "Hysen: Profiling is already running",
+                translation_domain=DOMAIN,
+                translation_key="profiling_running",
+            )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_START,
+        async_profile_start_handler,
+        schema=vol.Schema({
+            vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+            ),
+        }),
+    )
+
+    async def async_profile_stop_handler(service_call):
+        """Handle the hysenheat.profile_stop service call.
+
+        Stops the running profiling window early and writes the results.
+
+        Args:
+            service_call (homeassistant.core.ServiceCall): The service call object.
+
+        Returns:
+            dict: The path of the written statistics file under the 'path' key.
+        """
+        return {"path": await profiler.async_stop()}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_STOP,
+        async_profile_stop_handler,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.http.register_view(HysenMetricsView())
     return True
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
-    """Set up HysenHeat from a config entry.
+@callback
+def _async_register_device_services(hass: HomeAssistant):
+    """Register the domain services that act on Hysen climate entities.
 
-    Initializes the Hysen device, coordinator, and platform entities based on the config entry.
+    The handlers only look up entities and shared helpers at call time, so they
+    do not hold on to any config entry and serve every configured device.
 
     Args:
         hass: The Home Assistant instance.
-        entry: The configuration entry containing device details.
 
     Returns:
-        bool: True if setup is successful, raises ConfigEntryNotReady on failure.
+        None
     """
-    host = entry.data[CONF_HOST]
-    mac = entry.data[CONF_MAC]
-    name = entry.data.get(CONF_NAME, DEFAULT_NAME)
-    timeout = entry.data.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
-
-    _LOGGER.info("Starting setup for device '%s' (MAC: %s, Host: %s, Entry ID: %s)", name, mac, host, entry.entry_id)
-
-    try:
-        mac_bytes = binascii.unhexlify(mac.replace(":", ""))
-        device = HysenHeatingDevice(
-            host=(host, 80),
-            mac=mac_bytes,
-            timeout=timeout,
-            sync_clock=DEFAULT_SYNC_CLOCK,
-            sync_hour=DEFAULT_SYNC_HOUR,
-        )
-        _LOGGER.debug("Initialized Hysen device at %s (MAC: %s)", host, mac)
-    except Exception as e:
-        _LOGGER.error("Failed to initialize Hysen device at %s: %s", host, e)
-        raise ConfigEntryNotReady from e
-
-    coordinator = HysenCoordinator(hass, device, host)
-    await coordinator.async_config_entry_first_refresh()
-
-    hass.data[DOMAIN][entry.entry_id] = {
-        "host": host,
-        "mac": mac,
-        "name": name,
-        "timeout": timeout,
-        "coordinator": coordinator,
-    }
-    _LOGGER.debug("Registered Hysen device with ID %s for MAC %s", entry.entry_id, mac)
+    tracer = hass.data[DATA_TRACER]
+    profiler = hass.data[DATA_PROFILER]
 
     # Register custom service for set_hvac_mode
     async def async_set_hvac_mode_handler(service_call):
@@ -183,18 +281,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             )
         
         # Process valid entity_ids
-        for entity_id in valid_entity_ids:
-            try:
-                await hass.services.async_call(
-                    'climate',
-                    SERVICE_SET_HVAC_MODE,
-                    {'entity_id': entity_id, 'hvac_mode': hvac_mode},
-                    context=service_call.context
-                )
-                _LOGGER.debug("Called climate.set_hvac_mode for %s with hvac_mode %s", entity_id, hvac_mode)
-            except Exception as e:
-                _LOGGER.error("Failed to set hvac mode for %s: %s", entity_id, e)
-                raise
+        with tracer.span(f"service.{SERVICE_SET_HVAC_MODE}"), profiler.section(f"service.{SERVICE_SET_HVAC_MODE}"):
+            for entity_id in valid_entity_ids:
+                try:
+                    with tracer.span("climate.dispatch", entity_id=entity_id):
+                        await hass.services.async_call(
+                            'climate',
+                            SERVICE_SET_HVAC_MODE,
+                            {'entity_id': entity_id, 'hvac_mode': hvac_mode},
+                            blocking=True,
+                            context=service_call.context
+                        )
+                    _LOGGER.debug("Called climate.set_hvac_mode for %s with hvac_mode %s", entity_id, hvac_mode)
+                except Exception as e:
+                    _LOGGER.error("Failed to set hvac mode for %s: %s", entity_id, e)
+                    raise
 
     hass.services.async_register(
         DOMAIN,
@@ -289,18 +390,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             )
         
         # Process valid entity_ids
-        for entity_id in valid_entity_ids:
-            try:
-                await hass.services.async_call(
-                    'climate',
-                    SERVICE_SET_TEMPERATURE,
-                    {'entity_id': entity_id, 'temperature': temperature},
-                    context=service_call.context
-                )
-                _LOGGER.debug("Called climate.set_temperature for %s with temperature %s", entity_id, temperature)
-            except Exception as e:
-                _LOGGER.error("Failed to set temperature for %s: %s", entity_id, e)
-                raise
+        with tracer.span(f"service.{SERVICE_SET_TEMPERATURE}"), profiler.section(f"service.{SERVICE_SET_TEMPERATURE}"):
+            for entity_id in valid_entity_ids:
+                try:
+                    with tracer.span("climate.dispatch", entity_id=entity_id):
+                        await hass.services.async_call(
+                            'climate',
+                            SERVICE_SET_TEMPERATURE,
+                            {'entity_id': entity_id, 'temperature': temperature},
+                            blocking=True,
+                            context=service_call.context
+                        )
+                    _LOGGER.debug("Called climate.set_temperature for %s with temperature %s", entity_id, temperature)
+                except Exception as e:
+                    _LOGGER.error("Failed to set temperature for %s: %s", entity_id, e)
+                    raise
 
     hass.services.async_register(
         DOMAIN,
@@ -396,18 +500,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             )
         
         # Process valid entity_ids
-        for entity_id in valid_entity_ids:
-            try:
-                await hass.services.async_call(
-                    'climate',
-                    SERVICE_SET_PRESET_MODE,
-                    {'entity_id': entity_id, 'preset_mode': preset_mode},
-                    context=service_call.context
-                )
-                _LOGGER.debug("Called climate.set_preset_mode for %s with preset %s", entity_id, preset_mode)
-            except Exception as e:
-                _LOGGER.error("Failed to set preset mode for %s: %s", entity_id, e)
-                raise
+        with tracer.span(f"service.{SERVICE_SET_PRESET_MODE}"), profiler.section(f"service.{SERVICE_SET_PRESET_MODE}"):
+            for entity_id in valid_entity_ids:
+                try:
+                    with tracer.span("climate.dispatch", entity_id=entity_id):
+                        await hass.services.async_call(
+                            'climate',
+                            SERVICE_SET_PRESET_MODE,
+                            {'entity_id': entity_id, 'preset_mode': preset_mode},
+                            blocking=True,
+                            context=service_call.context
+                        )
+                    _LOGGER.debug("Called climate.set_preset_mode for %s with preset %s", entity_id, preset_mode)
+                except Exception as e:
+                    _LOGGER.error("Failed to set preset mode for %s: %s", entity_id, e)
+                    raise
 
     # Register the service with updated schema
     hass.services.async_register(
@@ -420,16 +527,156 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         })
     )
 
+@callback
+def _async_start_watchdog(hass: HomeAssistant):
+    """Start the event loop watchdog when debug logging is enabled.
+
+    The watchdog is kept in hass.data together with the removal of its stop
+    listener, so that unloading the last entry removes both.
+
+    Args:
+        hass: The Home Assistant instance.
+
+    Returns:
+        None
+    """
+    if not logging.getLogger(__package__).isEnabledFor(logging.DEBUG) or DATA_WATCHDOG in hass.data:
+        return
+    watchdog = HysenLoopWatchdog(hass.loop, DEFAULT_LOOP_BLOCK_THRESHOLD)
+    watchdog.start()
+
+    @callback
+    def _async_stop_watchdog(_event):
+        # The listener is gone once it ran
+        hass.data.pop(DATA_WATCHDOG, None)
+        watchdog.stop()
+
+    unsub_stop = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_watchdog)
+    hass.data[DATA_WATCHDOG] = (watchdog, unsub_stop)
+    _LOGGER.debug("Started event loop watchdog with a %s s threshold", DEFAULT_LOOP_BLOCK_THRESHOLD)
+
+def _replay_settings(entry: ConfigEntry):
+    """Return the capture an entry replays instead of talking to the device.
+
+    Args:
+        entry: The configuration entry of the device.
+
+    Returns:
+        tuple: The capture file and replay speed, or None if the device is not replayed.
+    """
+    replay_file = get_entry_setting(entry, CONF_REPLAY_FILE, DEFAULT_REPLAY_FILE)
+    if not replay_file:
+        return None
+    return replay_file, get_entry_setting(entry, CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED)
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Set up HysenHeat from a config entry.
+
+    Initializes the Hysen device, coordinator, and platform entities based on the config entry.
+
+    Args:
+        hass: The Home Assistant instance.
+        entry: The configuration entry containing device details.
+
+    Returns:
+        bool: True if setup is successful, raises ConfigEntryNotReady on failure.
+    """
+    host = entry.data[CONF_HOST]
+    mac = entry.data[CONF_MAC]
+    name = entry.data.get(CONF_NAME, DEFAULT_NAME)
+    timeout = get_entry_setting(entry, CONF_TIMEOUT, DEFAULT_TIMEOUT)
+    replay = _replay_settings(entry)
+
+    _LOGGER.info("Starting setup for device '%s' (MAC: %s, Host: %s, Entry ID: %s)", name, mac, host, entry.entry_id)
+
+    sessions = hass.data[DATA_SESSIONS]
+    # Device calls run in a pool owned by the integration, sized for all configured devices
+    devices = len(hass.config_entries.async_entries(DOMAIN))
+    executor = hass.data.get(DATA_EXECUTOR)
+    if executor is None:
+        executor = hass.data[DATA_EXECUTOR] = HysenExecutor(devices)
+    else:
+        executor.resize(devices)
+    try:
+        if replay is not None:
+            # Answer from a recorded capture instead of the network
+            device = await executor.async_run(
+                create_replay_device, hass.config.path(replay[0]), host, mac, timeout, replay[1]
+            )
+        else:
+            # Reuse the session negotiated before the reload or restart, if any
+            device = await executor.async_run(create_device, host, mac, timeout, sessions.get(mac))
+        _LOGGER.debug("Initialized Hysen device at %s (MAC: %s)", host, mac)
+    except Exception as e:
+        _LOGGER.error("Failed to initialize Hysen device at %s: %s", host, e)
+        raise ConfigEntryNotReady from e
+
+    tracer = hass.data[DATA_TRACER]
+    profiler = hass.data[DATA_PROFILER]
+    coordinator = HysenCoordinator(hass, entry, device, host, tracer, profiler, sessions, executor)
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Release the scheduler, capture and fleet registration before retrying
+        await coordinator.async_shutdown()
+        raise
+
+    hass.data[DOMAIN][entry.entry_id] = {
+        "host": host,
+        "mac": mac,
+        "name": name,
+        "timeout": timeout,
+        "replay": replay,
+        "coordinator": coordinator,
+    }
+    _LOGGER.debug("Registered Hysen device with ID %s for MAC %s", entry.entry_id, mac)
+
+    # Report integration code blocking the event loop when debug logging is enabled
+    _async_start_watchdog(hass)
+
+    # Domain services are shared by all entries and registered by the first one
+    if not hass.services.has_service(DOMAIN, SERVICE_SET_HVAC_MODE):
+        _async_register_device_services(hass)
+
+    # Apply option and host changes to the running coordinator instead of reloading
+    entry.async_on_unload(entry.add_update_listener(async_update_entry_listener))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     _LOGGER.debug("Forwarding setup to %s platforms for MAC %s", PLATFORMS, mac)
 
     _LOGGER.info("Completed setup for device with MAC %s", mac)
     return True
 
+async def async_update_entry_listener(hass: HomeAssistant, entry: ConfigEntry):
+    """Handle an update of a Hysen config entry.
+
+    Applies changed options and host to the running coordinator in place, so the
+    entities are kept and the device session is not renegotiated. Starting,
+    stopping or changing a replay reloads the entry, as the device is replaced.
+
+    Args:
+        hass: The Home Assistant instance.
+        entry: The updated configuration entry.
+
+    Returns:
+        None
+    """
+    device_data = hass.data[DOMAIN].get(entry.entry_id)
+    if device_data is None:
+        return
+    replay = _replay_settings(entry)
+    if replay != device_data["replay"]:
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    await device_data["coordinator"].async_apply_entry_update()
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a Hysen config entry.
 
-    Removes the device and its associated platforms from Home Assistant.
+    Removes the device and its associated platforms from Home Assistant and shuts
+    down its coordinator. When the last entry goes away, the shared domain services
+    are removed and the watchdog, profiler, thread pool, gateway process, shared
+    transport and fleet monitor are stopped, so reloads do not leak.
 
     Args:
         hass: The Home Assistant instance.
@@ -441,6 +688,34 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     mac = entry.data[CONF_MAC]
     _LOGGER.debug("Unloading config entry for device with MAC %s", mac)
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
-    return unload_ok
+    if not unload_ok:
+        return False
+    device_data = hass.data[DOMAIN].pop(entry.entry_id, None)
+    if device_data is not None:
+        await device_data["coordinator"].async_shutdown()
+
+    if hass.data[DOMAIN]:
+        return True
+    _LOGGER.debug("Last device unloaded, releasing shared resources")
+    for service in (SERVICE_SET_HVAC_MODE, SERVICE_SET_TEMPERATURE, SERVICE_SET_PRESET_MODE):
+        hass.services.async_remove(DOMAIN, service)
+    watchdog = hass.data.pop(DATA_WATCHDOG, None)
+    if watchdog is not None:
+        watchdog, unsub_stop = watchdog
+        unsub_stop()
+        watchdog.stop()
+    await hass.data[DATA_PROFILER].async_stop()
+    hass.data.pop(DATA_DISCOVERY_CACHE, None)
+    executor = hass.data.pop(DATA_EXECUTOR, None)
+    if executor is not None:
+        executor.shutdown()
+    gateway = hass.data.pop(DATA_GATEWAY, None)
+    if gateway is not None:
+        await gateway.async_stop()
+    transport = hass.data.pop(DATA_TRANSPORT, None)
+    if transport is not None:
+        transport.close()
+    fleet = hass.data.pop(DATA_FLEET, None)
+    if fleet is not None:
+        fleet.stop()
+    return True
@@ -16,6 +16,7 @@ from .const import (
     SERVICE_SET_TIME, 
 )
 from .entity import HysenEntity
+from .trace import traced
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -61,6 +62,7 @@ class HysenSetTimeNowButton(HysenEntity, ButtonEntity):
         self._host = device_data["host"]
         self._mac = device_data["mac"]
 
+    @traced("button.press")
     async def async_press(self):
         """Handle the button press to set the device time to now.
 
@@ -75,8 +77,7 @@ class HysenSetTimeNowButton(HysenEntity, ButtonEntity):
         success = await self.async_set_time(time_str, weekday)
         if success:
             _LOGGER.info("[%s] Successfully set device time to %s, weekday %s", self._host, time_str, weekday)
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command()
         else:
             _LOGGER.error("[%s] Failed to set device time", self._host)
 
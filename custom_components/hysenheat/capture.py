@@ -0,0 +1,410 @@
+"""
+Frame capture and replay for Hysen Heating integration.
+
+With capture enabled, every packet exchanged with a device is appended to a
+rotating file in the config directory: when it was sent, how long the device took
+to answer, the packet type, any error, and the request and response payloads as
+they are before encryption. Session keys are never written, as authentication
+packets are recorded without their payloads.
+
+A capture is fed back into the coordinator by HysenReplayDevice, which answers the
+library's requests from the recorded responses at the recorded pace or faster, so
+odd values and slow polls reported from the field can be reproduced offline.
+"""
+
+import functools
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from broadlink.exceptions import BroadlinkException, NetworkTimeoutError, exception
+from hysen import HysenHeatingDevice
+from .const import (
+    DOMAIN,
+    DEFAULT_SYNC_HOUR,
+    CAPTURE_MAX_BYTES,
+    CAPTURE_BACKUPS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Capture file layout: a magic header, then one record per packet exchanged
+CAPTURE_MAGIC = b"HYSENCAP\x01"
+# Sent time, duration, packet type, error, MAC, request length, response length
+RECORD_HEADER = struct.Struct("<dfHh6sHH")
+PACKET_TYPE_AUTH = 0x65
+# Error recorded for failures that are not Broadlink errors, such as socket errors
+CAPTURE_ERROR_NETWORK = -4000
+
+class HysenFrameCapture:
+    """Append the packets exchanged with one device to a rotating capture file.
+
+    Records are written by a background thread, so capturing adds no file I/O
+    to the device calls or the event loop.
+    """
+
+    def __init__(self, path: str, max_bytes: int = CAPTURE_MAX_BYTES, backups: int = CAPTURE_BACKUPS):
+        """Initialize the capture and start its writer thread.
+
+        Args:
+            path: The capture file. Rotated files get the suffixes .1 (newest) to .<backups>.
+            max_bytes: The size at which the file is rotated.
+            backups: The number of rotated files kept.
+        """
+        self.path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._queue = queue.SimpleQueue()
+        self._failed = False
+        self._thread = threading.Thread(target=self._write_records, name=f"{DOMAIN}_capture", daemon=True)
+        self._thread.start()
+
+    def record(self, mac: bytes, packet_type: int, request: bytes, response: bytes,
+               sent: float, duration: float, error: int = 0):
+        """Queue a packet exchange to be written.
+
+        Args:
+            mac: The MAC address of the device.
+            packet_type: The Broadlink packet type.
+            request: The unencrypted request payload.
+            response: The decrypted response payload, empty if the exchange failed.
+            sent: The time the request was sent, in seconds since the epoch.
+            duration: The seconds the device took to answer or the request to fail.
+            error: The Broadlink error code, 0 on success.
+
+        Returns:
+            None
+        """
+        if self._failed:
+            return
+        header = RECORD_HEADER.pack(sent, duration, packet_type, error, mac, len(request), len(response))
+        self._queue.put(header + request + response)
+
+    def close(self):
+        """Stop the writer thread once the queued records are written.
+
+        Returns:
+            None
+        """
+        self._queue.put(None)
+
+    def _open(self):
+        """Open the capture file for appending, writing the header to a new file.
+
+        Returns:
+            file: The open capture file.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        file = open(self.path, "ab")
+        if file.tell() == 0:
+            file.write(CAPTURE_MAGIC)
+        return file
+
+    def _rotate(self):
+        """Shift the rotated files by one and move the current file to .1.
+
+        Returns:
+            None
+        """
+        if not self._backups:
+            os.remove(self.path)
+            return
+        for index in range(self._backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def _write_records(self):
+        """Write queued records until the capture is closed (writer thread).
+
+        Returns:
+            None
+        """
+        file = None
+        try:
+            file = self._open()
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    break
+                if file.tell() + len(record) > self._max_bytes and file.tell() > len(CAPTURE_MAGIC):
+                    file.close()
+                    self._rotate()
+                    file = self._open()
+                file.write(record)
+                if self._queue.empty():
+                    file.flush()
+        except OSError as exc:
+            self._failed = True
+            _LOGGER.error("Stopped capturing to %s: %s", self.path, exc)
+        finally:
+            if file is not None:
+                file.close()
+
+def capture_path(directory: str, mac: str):
+    """Return the capture file of a device.
+
+    Args:
+        directory: The directory holding the captures.
+        mac: The MAC address of the device, with or without colons.
+
+    Returns:
+        str: The path of the device's capture file.
+    """
+    return os.path.join(directory, f"{mac.replace(':', '').lower()}.cap")
+
+def record_exchange(device, packet_type: int, payload: bytes, reply: bytes,
+                    sent: float, duration: float, exc: Exception = None):
+    """Record a packet exchange if the device is being captured.
+
+    Args:
+        device: The HysenHeatingDevice instance.
+        packet_type: The Broadlink packet type.
+        payload: The unencrypted request payload.
+        reply: The reply frame, or None if the request failed.
+        sent: The time the request was sent, in seconds since the epoch.
+        duration: The seconds the device took to answer or the request to fail.
+        exc: The error raised instead of a reply, if any.
+
+    Returns:
+        None
+    """
+    capture = getattr(device, "_capture", None)
+    if capture is None:
+        return
+    response = b""
+    if reply is None:
+        errno = getattr(exc, "errno", None)
+        error = errno if isinstance(exc, BroadlinkException) and isinstance(errno, int) else CAPTURE_ERROR_NETWORK
+    else:
+        error = int.from_bytes(reply[0x22:0x24], "little", signed=True)
+        if not error and packet_type != PACKET_TYPE_AUTH:
+            response = device.decrypt(reply[0x38:])
+    if packet_type == PACKET_TYPE_AUTH:
+        payload = b""
+    capture.record(device.mac, packet_type, bytes(payload), bytes(response), sent, duration, error)
+
+def _send_captured_packet(device, send_packet, packet_type: int, payload: bytes):
+    """Send a packet through the library and record the exchange (blocking).
+
+    Args:
+        device: The HysenHeatingDevice instance.
+        send_packet: The library's send_packet method of the device.
+        packet_type: The Broadlink packet type.
+        payload: The unencrypted payload.
+
+    Returns:
+        bytes: The reply frame.
+    """
+    sent = time.time()
+    start = time.perf_counter()
+    try:
+        reply = send_packet(packet_type, payload)
+    except Exception as exc:
+        record_exchange(device, packet_type, payload, None, sent, time.perf_counter() - start, exc)
+        raise
+    record_exchange(device, packet_type, payload, reply, sent, time.perf_counter() - start)
+    return reply
+
+def attach_capture(device, capture: HysenFrameCapture):
+    """Start or stop capturing the packets a device exchanges.
+
+    Only the device's own send_packet is wrapped and, when capturing stops, put
+    back, so a send_packet set on the device by others is kept.
+
+    Args:
+        device: The HysenHeatingDevice instance.
+        capture: The HysenFrameCapture to record to, or None to stop capturing.
+
+    Returns:
+        None
+    """
+    wrapper = vars(device).get("send_packet")
+    captured = isinstance(wrapper, functools.partial) and wrapper.func is _send_captured_packet
+    if capture is None:
+        vars(device).pop("_capture", None)
+        if captured:
+            send_packet = wrapper.args[1]
+            if getattr(send_packet, "__func__", None) is getattr(type(device), "send_packet", None):
+                del device.send_packet
+            else:
+                device.send_packet = send_packet
+        return
+    device._capture = capture
+    if not captured:
+        device.send_packet = functools.partial(_send_captured_packet, device, device.send_packet)
+
+def read_capture(path: str, mac: bytes = None):
+    """Read the records of a capture and its rotated files, oldest first (blocking).
+
+    Args:
+        path: The capture file.
+        mac: Only return the records of this device, if given.
+
+    Returns:
+        list: (sent, duration, packet_type, error, mac, request, response) tuples.
+
+    Raises:
+        FileNotFoundError: If the capture file does not exist.
+        ValueError: If a file is not a capture or is truncated.
+    """
+    rotated = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        rotated.append(f"{path}.{index}")
+        index += 1
+    records = []
+    for file_path in list(reversed(rotated)) + [path]:
+        with open(file_path, "rb") as file:
+            data = file.read()
+        if not data.startswith(CAPTURE_MAGIC):
+            raise ValueError(f"{file_path} is not a Hysen capture")
+        offset = len(CAPTURE_MAGIC)
+        while offset < len(data):
+            if offset + RECORD_HEADER.size > len(data):
+                raise ValueError(f"{file_path} is truncated")
+            sent, duration, packet_type, error, record_mac, request_size, response_size = (
+                RECORD_HEADER.unpack_from(data, offset)
+            )
+            offset += RECORD_HEADER.size
+            request = data[offset:offset + request_size]
+            response = data[offset + request_size:offset + request_size + response_size]
+            offset += request_size + response_size
+            if offset > len(data):
+                raise ValueError(f"{file_path} is truncated")
+            if mac is None or record_mac == mac:
+                records.append((sent, duration, packet_type, error, record_mac, request, response))
+    return records
+
+class HysenReplayDevice(HysenHeatingDevice):
+    """A device answering the library's requests from a capture instead of the network.
+
+    Each request is answered by the next recorded exchange with the same packet type
+    and payload, after the delay recorded for it divided by the replay speed. Requests
+    are also held back until their recorded time on the capture's timeline, so a
+    replay reproduces the timing of the field. The capture starts over once it has
+    been played to the end.
+    """
+
+    def __init__(self, host: str, mac: bytes, timeout: int, records: list, speed: float):
+        """Initialize the replay device.
+
+        Args:
+            host: The host address the captured device had.
+            mac: The MAC address of the device.
+            timeout: The network timeout in seconds.
+            records: The device's records, as returned by read_capture.
+            speed: How many times faster than recorded to replay.
+        """
+        super().__init__(
+            host=(host, 80),
+            mac=mac,
+            timeout=timeout,
+            sync_clock=False,
+            sync_hour=DEFAULT_SYNC_HOUR,
+        )
+        self._records = [record for record in records if record[2] != PACKET_TYPE_AUTH]
+        self._speed = speed
+        self._position = 0
+        self._origin = None
+        self._response = b""
+
+    def auth(self):
+        """Pretend to authenticate; recorded responses need no session.
+
+        Returns:
+            bool: True.
+        """
+        return True
+
+    def _next_record(self, packet_type: int, payload: bytes):
+        """Return the next recorded exchange answering a request.
+
+        Args:
+            packet_type: The Broadlink packet type.
+            payload: The unencrypted request payload.
+
+        Returns:
+            tuple: The matching record.
+
+        Raises:
+            NetworkTimeoutError: If the rest of the capture holds no such request.
+                The replay position and timeline are left as they are.
+        """
+        if self._position >= len(self._records):
+            # Played to the end, start over with a fresh timeline
+            _LOGGER.debug("Replay of %s reached the end of the capture, starting over", self.host[0])
+            self._position = 0
+            self._origin = None
+        for index in range(self._position, len(self._records)):
+            record = self._records[index]
+            if record[2] == packet_type and record[5] == payload:
+                self._position = index + 1
+                return record
+        raise NetworkTimeoutError(-4000, "Network timeout", "Request not found in the capture")
+
+    def send_packet(self, packet_type: int, payload: bytes):
+        """Answer a packet from the capture at the recorded pace (blocking).
+
+        Args:
+            packet_type: The Broadlink packet type.
+            payload: The unencrypted payload.
+
+        Returns:
+            bytes: A reply frame, whose payload is returned by the next decrypt call.
+
+        Raises:
+            Exception: The error recorded for the exchange, if it failed.
+        """
+        sent, duration, _packet_type, error, _mac, _request, response = self._next_record(
+            packet_type, bytes(payload)
+        )
+        now = time.monotonic()
+        if self._origin is None:
+            self._origin = (now, sent)
+        due = self._origin[0] + (sent - self._origin[1]) / self._speed
+        time.sleep(max(0, due - now) + duration / self._speed)
+        if error:
+            raise exception(error)
+        self._response = response
+        reply = bytearray(0x38)
+        reply[0x26:0x28] = packet_type.to_bytes(2, "little")
+        return bytes(reply)
+
+    def decrypt(self, payload: bytes):
+        """Return the recorded response of the last packet answered.
+
+        Args:
+            payload: The encrypted payload of the reply frame, unused.
+
+        Returns:
+            bytes: The recorded response payload.
+        """
+        return self._response
+
+def create_replay_device(path: str, host: str, mac: str, timeout: int, speed: float):
+    """Create a device replaying a capture (blocking).
+
+    Args:
+        path: The capture file.
+        host: The host address of the device.
+        mac: The MAC address of the device, with or without colons.
+        timeout: The network timeout in seconds.
+        speed: How many times faster than recorded to replay.
+
+    Returns:
+        HysenReplayDevice: The replay device.
+
+    Raises:
+        FileNotFoundError: If the capture file does not exist.
+        ValueError: If the capture is damaged or holds no packets of the device.
+    """
+    mac_bytes = bytes.fromhex(mac.replace(":", ""))
+    records = read_capture(path, mac_bytes)
+    if not records:
+        raise ValueError(f"{path} holds no packets of {mac}")
+    _LOGGER.info("Replaying %d packets of %s from %s at %sx speed", len(records), mac, path, speed)
+    return HysenReplayDevice(host, mac_bytes, timeout, records, speed)
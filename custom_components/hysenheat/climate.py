@@ -128,6 +128,7 @@ from .const import (
     PRESET_HASS_TO_HYSEN,
 )
 from .entity import HysenEntity
+from .trace import traced
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -288,6 +289,8 @@ class HysenClimate(HysenEntity, ClimateEntity):
             float: The current target temperature.
         """
         if self._attr_power_state == STATE_ON:
+            if self._pending_value is not None:
+                return self._pending_value
             return self._attr_target_temperature
         return None
 
@@ -430,6 +433,7 @@ class HysenClimate(HysenEntity, ClimateEntity):
         }
         return {k: v for k, v in data.items() if v is not None}
 
+    @traced("climate.turn_on")
     async def async_turn_on(self):
         """Turn the entity on.
 
@@ -440,11 +444,12 @@ class HysenClimate(HysenEntity, ClimateEntity):
             "Error in set_power",
             self.coordinator.device.set_power,
             POWER_STATE_HASS_TO_HYSEN[STATE_ON],
+            unchanged_if={DATA_KEY_POWER_STATE: STATE_ON},
         )
         if success:
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command()
 
+    @traced("climate.turn_off")
     async def async_turn_off(self):
         """Turn the entity off.
 
@@ -455,11 +460,12 @@ class HysenClimate(HysenEntity, ClimateEntity):
             "Error in set_power",
             self.coordinator.device.set_power,
             POWER_STATE_HASS_TO_HYSEN[STATE_OFF],
+            unchanged_if={DATA_KEY_POWER_STATE: STATE_OFF},
         )
         if success:
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command()
 
+    @traced("climate.set_temperature")
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature.
 
@@ -473,20 +479,33 @@ class HysenClimate(HysenEntity, ClimateEntity):
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is None:
             return
+        await self._async_debounced_write(temperature, self._async_write_target_temperature)
+
+    async def _async_write_target_temperature(self, temperature):
+        """Write the target temperature to the device.
+
+        Args:
+            temperature: The target temperature to set.
+        """
         _LOGGER.debug("Hytemp: [%s] Setting target temperature to %s", self._host, temperature)
+        unchanged_if = {DATA_KEY_TARGET_TEMP: temperature}
+        if self._attr_hvac_mode == HVACMode.AUTO:
+            # In AUTO mode the write also switches to temporary manual mode
+            unchanged_if[DATA_KEY_TEMPORARY_MANUAL] = STATE_ON
         success = await self._async_try_command(
             "Error in set_target_temp",
             self.coordinator.device.set_target_temp,
             temperature,
+            unchanged_if=unchanged_if,
         )
         if success and self._attr_hvac_mode == HVACMode.AUTO:
             # In AUTO mode, setting temperature triggers temporary manual mode
             self._attr_preset_mode = PRESET_TEMPORARY
             self._attr_preset_modes = PRESET_MODES_TEMPORARY
         if success:
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command()
 
+    @traced("climate.set_hvac_mode")
     async def async_set_hvac_mode(self, hvac_mode):
         """Set the HVAC mode.
 
@@ -514,6 +533,7 @@ class HysenClimate(HysenEntity, ClimateEntity):
                 "Error in set_power",
                 self.coordinator.device.set_power,
                 POWER_STATE_HASS_TO_HYSEN[STATE_OFF],
+                unchanged_if={DATA_KEY_POWER_STATE: STATE_OFF},
             )
         else:
             if self._attr_power_state == STATE_OFF:
@@ -522,6 +542,7 @@ class HysenClimate(HysenEntity, ClimateEntity):
                     "Error in set_power",
                     self.coordinator.device.set_power,
                     POWER_STATE_HASS_TO_HYSEN[STATE_ON],
+                    unchanged_if={DATA_KEY_POWER_STATE: STATE_ON},
                 )
             if success:
                 # Set the selected HVAC mode
@@ -529,15 +550,17 @@ class HysenClimate(HysenEntity, ClimateEntity):
                     "Error in set_operation_mode",
                     self.coordinator.device.set_operation_mode,
                     MODE_HASS_TO_HYSEN[hvac_mode],
+                    # Selecting AUTO also ends temporary manual mode
+                    unchanged_if={DATA_KEY_OPERATION_MODE: hvac_mode, DATA_KEY_TEMPORARY_MANUAL: STATE_OFF},
                 )
             if success and hvac_mode == HVACMode.AUTO:# and self._attr_temporary_manual == STATE_ON:
                 # Setting AUTO when temporary_manual is ON resets to schedule-based preset
                 self._attr_preset_modes = PRESET_MODES
                 self._attr_preset_mode = self.coordinator.data.get(DATA_KEY_PRESET_MODE)
         if success:
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command()
 
+    @traced("climate.set_preset_mode")
     async def async_set_preset_mode(self, preset_mode):
         """Set the preset mode.
 
@@ -572,13 +595,13 @@ class HysenClimate(HysenEntity, ClimateEntity):
             "Error in set_weekly_schedule",
             self.coordinator.device.set_weekly_schedule,
             PRESET_HASS_TO_HYSEN[preset_mode],
+            unchanged_if={DATA_KEY_PRESET_MODE: preset_mode, DATA_KEY_TEMPORARY_MANUAL: STATE_OFF},
         )
         # Set preset attributes to reflect the new schedule
         if success:
             self._attr_preset_mode = preset_mode
             self._attr_preset_modes = PRESET_MODES
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command()
 
     async def async_added_to_hass(self):
         """Initialize the entity when added to Home Assistant.
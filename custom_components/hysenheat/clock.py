@@ -0,0 +1,85 @@
+"""
+Device clock drift helpers for Hysen Heating integration.
+
+The thermostats keep their own weekday and time of day, which run the weekly
+schedule. These helpers measure how far a device clock is off and spread the
+nightly corrections of a fleet over a window.
+"""
+
+from datetime import datetime, timedelta
+from .const import (
+    CLOCK_SYNC_STAGGER,
+    CLOCK_SYNC_WINDOW,
+)
+
+SECONDS_PER_WEEK = 7 * 24 * 3600
+
+def week_seconds(weekday: int, hour: int, minute: int, second: int):
+    """Return the position of a point in time within the week.
+
+    Args:
+        weekday: The ISO weekday (1 = Monday, 7 = Sunday).
+        hour: The hour of the day.
+        minute: The minute of the hour.
+        second: The second of the minute.
+
+    Returns:
+        int: Seconds since Monday 00:00:00.
+    """
+    return (((weekday - 1) * 24 + hour) * 60 + minute) * 60 + second
+
+def estimate_clock_drift(weekday: int, hour: int, minute: int, second: int, now: datetime):
+    """Return how far a device clock is ahead of local time.
+
+    The device only knows its weekday and time of day, so the difference is
+    taken modulo a week and folded into the shortest distance.
+
+    Args:
+        weekday: The ISO weekday reported by the device.
+        hour: The hour reported by the device.
+        minute: The minute reported by the device.
+        second: The second reported by the device.
+        now: The local time at which the device reported its clock.
+
+    Returns:
+        int: The drift in seconds, positive if the device clock is ahead.
+    """
+    device = week_seconds(weekday, hour, minute, second)
+    local = week_seconds(now.isoweekday(), now.hour, now.minute, now.second)
+    drift = (device - local) % SECONDS_PER_WEEK
+    if drift >= SECONDS_PER_WEEK // 2:
+        drift -= SECONDS_PER_WEEK
+    return drift
+
+def in_sync_window(mac: str, sync_hour: int, now: datetime):
+    """Return True if a device's clock may be synchronized at the given time.
+
+    The nightly window opens at the sync hour. Each device starts at its own offset
+    into the window, derived from its MAC address, so a fleet is not written at once.
+
+    Args:
+        mac: The MAC address of the device.
+        sync_hour: The hour at which the window opens.
+        now: The local time.
+
+    Returns:
+        bool: True if now lies between the device's start and the end of the window.
+    """
+    opens = now.replace(hour=sync_hour, minute=0, second=0, microsecond=0)
+    offset = int(mac.replace(":", ""), 16) % CLOCK_SYNC_STAGGER
+    return opens + timedelta(seconds=offset) <= now < opens + timedelta(seconds=CLOCK_SYNC_WINDOW)
+
+def set_device_clock(device):
+    """Set the device clock to the local time (blocking).
+
+    The time is taken when the request is sent, not when it was queued.
+
+    Args:
+        device: The HysenHeatingDevice instance.
+
+    Returns:
+        datetime: The time written to the device.
+    """
+    now = datetime.now()
+    device.set_time(now.hour, now.minute, now.second, now.isoweekday())
+    return now
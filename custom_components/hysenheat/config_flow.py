@@ -4,25 +4,66 @@ Configuration flow for Hysen Heating Controller.
 This module handles the setup and discovery of Hysen devices.
 """
 
+import asyncio
 import logging
 import binascii
+import os
+import re
 import voluptuous as vol
 from typing import Any, Dict, Optional
-from hysen import HysenHeatingDevice
 from homeassistant import config_entries
+from homeassistant.const import CONF_SCAN_INTERVAL
 from homeassistant.core import callback
+from homeassistant.helpers import discovery_flow
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.yaml import load_yaml
 from .const import (
     DOMAIN, 
     CONF_HOST, 
     CONF_MAC, 
     CONF_NAME, 
     CONF_TIMEOUT,
+    CONF_DEVICES,
+    CONF_FILE,
+    CONF_SYNC_CLOCK,
+    CONF_SYNC_HOUR,
+    CONF_DEBOUNCE_WINDOW,
+    CONF_WRITE_BURST,
+    CONF_WRITE_RATE,
+    CONF_PROCESS_GATEWAY,
+    CONF_SHARED_TRANSPORT,
+    CONF_HEDGE_READS,
+    CONF_SCHEDULE_REFRESH,
+    CONF_CAPTURE,
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
     DEFAULT_NAME, 
     DEFAULT_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
     DEFAULT_SYNC_CLOCK,
     DEFAULT_SYNC_HOUR,
+    DEFAULT_DEBOUNCE_WINDOW,
+    MAX_DEBOUNCE_WINDOW,
+    DEFAULT_WRITE_BURST,
+    DEFAULT_WRITE_RATE,
+    DEFAULT_PROCESS_GATEWAY,
+    DEFAULT_SHARED_TRANSPORT,
+    DEFAULT_HEDGE_READS,
+    DEFAULT_SCHEDULE_REFRESH,
+    DEFAULT_CAPTURE,
+    DEFAULT_REPLAY_FILE,
+    DEFAULT_REPLAY_SPEED,
+    MAX_REPLAY_SPEED,
+    MIN_SCAN_INTERVAL,
+    MAX_SCAN_INTERVAL,
+    BULK_IMPORT_CONCURRENCY,
+    BULK_IMPORT_TIMEOUT,
 )
+from .coordinator import get_entry_setting
+from .device import validate_device
+from .discovery import async_get_discovered_devices, format_mac
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,10 +74,78 @@ DATA_SCHEMA = vol.Schema({
     vol.Optional(CONF_TIMEOUT, default=DEFAULT_TIMEOUT): int,
 })
 
+BULK_SCHEMA = vol.Schema({
+    vol.Optional(CONF_DEVICES, default=""): TextSelector(TextSelectorConfig(multiline=True)),
+    vol.Optional(CONF_FILE, default=""): str,
+    vol.Optional(CONF_TIMEOUT, default=BULK_IMPORT_TIMEOUT): int,
+})
+
+def parse_device_rows(text: str):
+    """Parse pasted device rows.
+
+    Each non-empty line holds a host, a MAC address and an optional name,
+    separated by commas, semicolons or tabs. Lines starting with # are ignored.
+
+    Args:
+        text: The pasted rows.
+
+    Returns:
+        list: Dictionaries with the host, MAC and name of each row.
+
+    Raises:
+        ValueError: If a row does not hold at least a host and a MAC address.
+    """
+    rows = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = [field.strip() for field in re.split(r"[,;\t]", line, maxsplit=2)]
+        if len(fields) < 2 or not fields[0] or not fields[1]:
+            raise ValueError(f"Invalid device row: {line}")
+        rows.append({
+            CONF_HOST: fields[0],
+            CONF_MAC: fields[1],
+            CONF_NAME: fields[2] if len(fields) > 2 and fields[2] else DEFAULT_NAME,
+        })
+    return rows
+
+def load_device_file(path: str):
+    """Load device rows from a YAML file (blocking).
+
+    The file holds a list of mappings with host, mac and optional name keys,
+    either at the top level or under a devices key.
+
+    Args:
+        path: The path of the YAML file.
+
+    Returns:
+        list: Dictionaries with the host, MAC and name of each device.
+
+    Raises:
+        HomeAssistantError: If the file cannot be read or parsed.
+        ValueError: If an entry does not hold at least a host and a MAC address.
+    """
+    content = load_yaml(path)
+    if isinstance(content, dict):
+        content = content.get(CONF_DEVICES)
+    if not isinstance(content, list):
+        raise ValueError(f"{path} does not contain a list of devices")
+    rows = []
+    for item in content:
+        if not isinstance(item, dict) or not item.get(CONF_HOST) or not item.get(CONF_MAC):
+            raise ValueError(f"Invalid device entry in {path}: {item}")
+        rows.append({
+            CONF_HOST: str(item[CONF_HOST]),
+            CONF_MAC: str(item[CONF_MAC]),
+            CONF_NAME: str(item.get(CONF_NAME) or DEFAULT_NAME),
+        })
+    return rows
+
 class HysenHeatingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Hysen Heating Controller.
 
-    Manages user-initiated and zeroconf-based configuration of Hysen devices.
+    Manages user-initiated, LAN scan and zeroconf-based configuration of Hysen devices.
     """
 
     VERSION = 1
@@ -49,12 +158,114 @@ class HysenHeatingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         discovered device information.
         """
         self._discovered_device: Dict[str, Any] = {}
+        self._discovered_devices: Dict[str, Dict[str, Any]] = {}
+
+    def _configured_macs(self):
+        """Return the normalized MAC addresses of the existing config entries.
+
+        Returns:
+            set: The configured MAC addresses.
+        """
+        return {
+            format_mac(entry.data[CONF_MAC])
+            for entry in self._async_current_entries()
+            if entry.data.get(CONF_MAC)
+        }
 
     async def async_step_user(self, user_input: Optional[Dict[str, Any]] = None):
         """Handle the initial step of user-initiated configuration.
 
-        Validates user input, checks for existing configurations, and initializes
-        the Hysen device.
+        Lets the user choose between scanning the LAN, entering a device manually
+        and importing a list of devices.
+
+        Args:
+            user_input: Unused, the menu selection routes to the next step.
+
+        Returns:
+            Dict: The menu of configuration methods.
+        """
+        return self.async_show_menu(step_id="user", menu_options=["scan", "manual", "bulk"])
+
+    async def async_step_scan(self, user_input: Optional[Dict[str, Any]] = None):
+        """Scan the LAN for unconfigured Hysen devices.
+
+        Discovered devices other than the one picked by the user are offered as
+        discovered flows, so they can be added with a single confirmation.
+
+        Args:
+            user_input: Unused, the scan starts immediately.
+
+        Returns:
+            Dict: The device selection form, or an abort if no new device was found.
+        """
+        configured = self._configured_macs()
+        discovered = await async_get_discovered_devices(self.hass)
+        self._discovered_devices = {
+            mac: device for mac, device in discovered.items() if mac not in configured
+        }
+        if not self._discovered_devices:
+            return self.async_abort(reason="no_devices_found")
+        return await self.async_step_pick_device()
+
+    async def async_step_pick_device(self, user_input: Optional[Dict[str, Any]] = None):
+        """Handle the selection of a device found by the LAN scan.
+
+        Args:
+            user_input: Dictionary containing the selected MAC address and name.
+
+        Returns:
+            Dict: The result of the selection step (form or create entry).
+        """
+        errors: Dict[str, str] = {}
+        if user_input is not None:
+            device = self._discovered_devices[user_input[CONF_MAC]]
+            try:
+                await self.hass.async_add_executor_job(
+                    validate_device, device[CONF_HOST], device[CONF_MAC], DEFAULT_TIMEOUT
+                )
+            except Exception as e:
+                _LOGGER.error("Failed to initialize device at %s: %s", device[CONF_HOST], e)
+                errors["base"] = "cannot_connect"
+            else:
+                await self.async_set_unique_id(device[CONF_MAC])
+                self._abort_if_unique_id_configured()
+                # Offer the remaining devices as discovered flows
+                for mac, other in self._discovered_devices.items():
+                    if mac != device[CONF_MAC]:
+                        discovery_flow.async_create_flow(
+                            self.hass,
+                            DOMAIN,
+                            context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                            data=other,
+                        )
+                return self.async_create_entry(
+                    title=user_input[CONF_NAME],
+                    data={
+                        CONF_HOST: device[CONF_HOST],
+                        CONF_MAC: device[CONF_MAC],
+                        CONF_NAME: user_input[CONF_NAME],
+                        CONF_TIMEOUT: DEFAULT_TIMEOUT,
+                    },
+                )
+
+        first = next(iter(self._discovered_devices.values()))
+        return self.async_show_form(
+            step_id="pick_device",
+            data_schema=vol.Schema({
+                vol.Required(CONF_MAC, default=first[CONF_MAC]): vol.In({
+                    mac: f"{device[CONF_NAME]} ({device[CONF_HOST]}, {mac})"
+                    for mac, device in self._discovered_devices.items()
+                }),
+                vol.Optional(CONF_NAME, default=first[CONF_NAME]): str,
+            }),
+            errors=errors,
+        )
+
+    async def async_step_manual(self, user_input: Optional[Dict[str, Any]] = None):
+        """Handle manual configuration of a device.
+
+        Validates user input, checks for existing configurations, and reads the
+        Hysen device status to confirm it is reachable.
 
         Args:
             user_input: Dictionary containing user-provided configuration data.
@@ -67,12 +278,12 @@ class HysenHeatingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # Normalize MAC address
             mac = user_input[CONF_MAC].replace(":", "").lower()
             try:
-                mac_bytes = binascii.unhexlify(mac)
+                binascii.unhexlify(mac)
             except binascii.Error as e:
                 _LOGGER.error("Invalid MAC address %s: %s", user_input[CONF_MAC], e)
                 errors["base"] = "invalid_mac"
                 return self.async_show_form(
-                    step_id="user",
+                    step_id="manual",
                     data_schema=DATA_SCHEMA,
                     errors=errors,
                 )
@@ -83,15 +294,14 @@ class HysenHeatingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     return self.async_abort(reason="already_configured")
 
             try:
-                # Initialize device (connection is handled by constructor)
-                device = HysenHeatingDevice(
-                    host=(user_input[CONF_HOST], 80),
-                    mac=mac_bytes,
-                    timeout=user_input[CONF_TIMEOUT],
-                    sync_clock=DEFAULT_SYNC_CLOCK,
-                    sync_hour=DEFAULT_SYNC_HOUR,
+                # Connect and read the device status off the event loop
+                await self.hass.async_add_executor_job(
+                    validate_device,
+                    user_input[CONF_HOST],
+                    mac,
+                    user_input[CONF_TIMEOUT],
                 )
-                _LOGGER.debug("Initialized device at %s (MAC: %s)", user_input[CONF_HOST], user_input[CONF_MAC])
+                _LOGGER.debug("Validated device at %s (MAC: %s)", user_input[CONF_HOST], user_input[CONF_MAC])
             except Exception as e:
                 _LOGGER.error("Failed to initialize device at %s: %s", user_input[CONF_HOST], e)
                 errors["base"] = "cannot_connect"
@@ -110,11 +320,141 @@ class HysenHeatingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=DATA_SCHEMA,
             errors=errors,
         )
 
+    async def async_step_bulk(self, user_input: Optional[Dict[str, Any]] = None):
+        """Handle the import of a list of devices.
+
+        Rows are pasted as text or read from a YAML file in the config directory.
+        All devices are validated concurrently, entries are created for the
+        reachable ones and the rest are reported.
+
+        Args:
+            user_input: Dictionary containing the pasted rows, file name and validation timeout.
+
+        Returns:
+            Dict: The result of the import step (form or abort with a summary).
+        """
+        errors: Dict[str, str] = {}
+        if user_input is not None:
+            rows = []
+            try:
+                if user_input.get(CONF_DEVICES, "").strip():
+                    rows.extend(parse_device_rows(user_input[CONF_DEVICES]))
+                if user_input.get(CONF_FILE, "").strip():
+                    config_dir = os.path.realpath(self.hass.config.config_dir)
+                    path = os.path.realpath(self.hass.config.path(user_input[CONF_FILE].strip()))
+                    if os.path.commonpath([config_dir, path]) != config_dir:
+                        raise ValueError(f"{path} is outside the config directory")
+                    rows.extend(await self.hass.async_add_executor_job(load_device_file, path))
+            except (HomeAssistantError, ValueError) as e:
+                _LOGGER.error("Failed to read device list: %s", e)
+                errors["base"] = "invalid_device_list"
+            else:
+                if not rows:
+                    errors["base"] = "no_devices"
+                else:
+                    return await self._async_import_rows(rows, user_input[CONF_TIMEOUT])
+
+        return self.async_show_form(
+            step_id="bulk",
+            data_schema=BULK_SCHEMA,
+            errors=errors,
+        )
+
+    async def _async_import_rows(self, rows: list, timeout: int):
+        """Validate device rows concurrently and start an import flow for each reachable device.
+
+        Args:
+            rows: Dictionaries with the host, MAC and name of each device.
+            timeout: Per-device validation timeout in seconds.
+
+        Returns:
+            Dict: An abort carrying the import summary.
+        """
+        configured = self._configured_macs()
+        pending: Dict[str, Dict[str, Any]] = {}
+        failed = []
+        skipped = 0
+        for row in rows:
+            try:
+                binascii.unhexlify(row[CONF_MAC].replace(":", "").replace("-", ""))
+            except binascii.Error:
+                failed.append(f"{row[CONF_HOST]} ({row[CONF_MAC]}): invalid MAC address")
+                continue
+            mac = format_mac(row[CONF_MAC])
+            if mac in configured or mac in pending:
+                skipped += 1
+                continue
+            pending[mac] = {**row, CONF_MAC: mac}
+
+        semaphore = asyncio.Semaphore(BULK_IMPORT_CONCURRENCY)
+
+        async def _async_validate(row):
+            async with semaphore:
+                await asyncio.wait_for(
+                    self.hass.async_add_executor_job(validate_device, row[CONF_HOST], row[CONF_MAC], timeout),
+                    timeout + 1,
+                )
+
+        results = await asyncio.gather(
+            *(_async_validate(row) for row in pending.values()), return_exceptions=True
+        )
+        added = 0
+        for row, result in zip(pending.values(), results):
+            if isinstance(result, BaseException):
+                reason = "timed out" if isinstance(result, asyncio.TimeoutError) else str(result) or type(result).__name__
+                _LOGGER.warning("Skipping device at %s (MAC: %s): %s", row[CONF_HOST], row[CONF_MAC], reason)
+                failed.append(f"{row[CONF_HOST]} ({row[CONF_MAC]}): {reason}")
+                continue
+            added += 1
+            self.hass.async_create_task(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": config_entries.SOURCE_IMPORT},
+                    data={**row, CONF_TIMEOUT: DEFAULT_TIMEOUT},
+                )
+            )
+        _LOGGER.info(
+            "Bulk import: %d added, %d already configured, %d failed", added, skipped, len(failed)
+        )
+        return self.async_abort(
+            reason="bulk_import_finished",
+            description_placeholders={
+                "added": str(added),
+                "skipped": str(skipped),
+                "failed": str(len(failed)),
+                "failures": "\n".join(failed) or "-",
+            },
+        )
+
+    async def async_step_import(self, import_data: Dict[str, Any]):
+        """Create an entry for a device validated by the bulk import.
+
+        Args:
+            import_data: Dictionary containing the host, MAC, name and timeout of the device.
+
+        Returns:
+            Dict: The result of the import step (abort or create entry).
+        """
+        mac = format_mac(import_data[CONF_MAC])
+        await self.async_set_unique_id(mac)
+        self._abort_if_unique_id_configured(
+            updates={CONF_HOST: import_data[CONF_HOST]}, reload_on_update=False
+        )
+        return self.async_create_entry(
+            title=import_data[CONF_NAME],
+            data={
+                CONF_HOST: import_data[CONF_HOST],
+                CONF_MAC: mac,
+                CONF_NAME: import_data[CONF_NAME],
+                CONF_TIMEOUT: import_data.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+            },
+        )
+
     async def async_step_zeroconf(self, discovery_info: ZeroconfServiceInfo):
         """Handle zeroconf discovery of a Hysen device.
 
@@ -133,7 +473,7 @@ class HysenHeatingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         # Normalize MAC address
         try:
-            mac_bytes = binascii.unhexlify(mac)
+            binascii.unhexlify(mac)
         except binascii.Error as e:
             _LOGGER.error("Invalid MAC address from zeroconf %s: %s", mac, e)
             return self.async_abort(reason="invalid_mac")
@@ -157,9 +497,33 @@ class HysenHeatingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         await self.async_set_unique_id(mac_colon)
         self._abort_if_unique_id_configured()
 
-        return await self.async_step_zeroconf_confirm()
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_integration_discovery(self, discovery_info: Dict[str, Any]):
+        """Handle a Hysen device found by a LAN scan.
+
+        Args:
+            discovery_info: Dictionary containing the host, MAC and name of the device.
+
+        Returns:
+            Dict: The result of the discovery step (abort or proceed to confirmation).
+        """
+        mac = format_mac(discovery_info[CONF_MAC])
+        await self.async_set_unique_id(mac)
+        # The running coordinator follows the host change without a reload
+        self._abort_if_unique_id_configured(
+            updates={CONF_HOST: discovery_info[CONF_HOST]}, reload_on_update=False
+        )
+
+        self._discovered_device = {
+            CONF_HOST: discovery_info[CONF_HOST],
+            CONF_MAC: mac,
+            CONF_NAME: discovery_info.get(CONF_NAME) or DEFAULT_NAME,
+            CONF_TIMEOUT: DEFAULT_TIMEOUT,
+        }
+        return await self.async_step_discovery_confirm()
 
-    async def async_step_zeroconf_confirm(self, user_input: Optional[Dict[str, Any]] = None):
+    async def async_step_discovery_confirm(self, user_input: Optional[Dict[str, Any]] = None):
         """Handle confirmation step for user-confirmed devices.
 
         Allows the user to confirm or modify discovered device settings.
@@ -173,15 +537,14 @@ class HysenHeatingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: Dict[str, str] = {}
         if user_input is not None:
             try:
-                mac_bytes = binascii.unhexlify(self._discovered_device[CONF_MAC].replace(":", ""))
-                device = Hysen2PipeFanCoilDevice(
-                    host=(self._discovered_device[CONF_HOST], 80),
-                    mac=mac_bytes,
-                    timeout=self._discovered_device[CONF_TIMEOUT],
-                    sync_clock=DEFAULT_SYNC_CLOCK,
-                    sync_hour=DEFAULT_SYNC_HOUR,
+                # Connect and read the device status off the event loop
+                await self.hass.async_add_executor_job(
+                    validate_device,
+                    self._discovered_device[CONF_HOST],
+                    self._discovered_device[CONF_MAC],
+                    self._discovered_device[CONF_TIMEOUT],
                 )
-                _LOGGER.debug("Initialized device at %s (MAC: %s)", self._discovered_device[CONF_HOST], self._discovered_device[CONF_MAC])
+                _LOGGER.debug("Validated device at %s (MAC: %s)", self._discovered_device[CONF_HOST], self._discovered_device[CONF_MAC])
             except Exception as e:
                 _LOGGER.error("Failed to initialize device at %s: %s", self._discovered_device[CONF_HOST], e)
                 errors["base"] = "cannot_connect"
@@ -197,7 +560,7 @@ class HysenHeatingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         return self.async_show_form(
-            step_id="zeroconf_confirm",
+            step_id="discovery_confirm",
             data_schema=vol.Schema({
                 vol.Optional(CONF_NAME, default=self._discovered_device[CONF_NAME]): str,
             }),
@@ -238,7 +601,15 @@ class HysenHeatingOptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_init(self, user_input: Optional[Dict[str, Any]] = None):
         """Manage device options configuration.
 
-        Allows the user to modify options such as timeout.
+        The options cover:
+            - Polling: timeout, poll interval and schedule-aware polling.
+            - Clock: nightly clock sync and its hour.
+            - Writes: debounce window, burst size and per-minute rate.
+            - Transport: gateway process, shared socket and hedged reads.
+            - Capture: packet capture, and a capture to replay with its speed.
+
+        Changes are applied to the running device without reloading the entry,
+        except for the replay settings.
 
         Args:
             user_input: Dictionary containing user-provided option updates.
@@ -254,7 +625,59 @@ class HysenHeatingOptionsFlowHandler(config_entries.OptionsFlow):
             data_schema=vol.Schema({
                 vol.Optional(
                     CONF_TIMEOUT,
-                    default=self.config_entry.data.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
-                ): int,
+                    default=get_entry_setting(self.config_entry, CONF_TIMEOUT, DEFAULT_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_SCAN_INTERVAL,
+                    default=get_entry_setting(self.config_entry, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL)),
+                vol.Optional(
+                    CONF_SYNC_CLOCK,
+                    default=get_entry_setting(self.config_entry, CONF_SYNC_CLOCK, DEFAULT_SYNC_CLOCK),
+                ): bool,
+                vol.Optional(
+                    CONF_SYNC_HOUR,
+                    default=get_entry_setting(self.config_entry, CONF_SYNC_HOUR, DEFAULT_SYNC_HOUR),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=23)),
+                vol.Optional(
+                    CONF_DEBOUNCE_WINDOW,
+                    default=get_entry_setting(self.config_entry, CONF_DEBOUNCE_WINDOW, DEFAULT_DEBOUNCE_WINDOW),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_DEBOUNCE_WINDOW)),
+                vol.Optional(
+                    CONF_WRITE_BURST,
+                    default=get_entry_setting(self.config_entry, CONF_WRITE_BURST, DEFAULT_WRITE_BURST),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_WRITE_RATE,
+                    default=get_entry_setting(self.config_entry, CONF_WRITE_RATE, DEFAULT_WRITE_RATE),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+                vol.Optional(
+                    CONF_PROCESS_GATEWAY,
+                    default=get_entry_setting(self.config_entry, CONF_PROCESS_GATEWAY, DEFAULT_PROCESS_GATEWAY),
+                ): bool,
+                vol.Optional(
+                    CONF_SHARED_TRANSPORT,
+                    default=get_entry_setting(self.config_entry, CONF_SHARED_TRANSPORT, DEFAULT_SHARED_TRANSPORT),
+                ): bool,
+                vol.Optional(
+                    CONF_HEDGE_READS,
+                    default=get_entry_setting(self.config_entry, CONF_HEDGE_READS, DEFAULT_HEDGE_READS),
+                ): bool,
+                vol.Optional(
+                    CONF_SCHEDULE_REFRESH,
+                    default=get_entry_setting(self.config_entry, CONF_SCHEDULE_REFRESH, DEFAULT_SCHEDULE_REFRESH),
+                ): bool,
+                vol.Optional(
+                    CONF_CAPTURE,
+                    default=get_entry_setting(self.config_entry, CONF_CAPTURE, DEFAULT_CAPTURE),
+                ): bool,
+                vol.Optional(
+                    CONF_REPLAY_FILE,
+                    default=get_entry_setting(self.config_entry, CONF_REPLAY_FILE, DEFAULT_REPLAY_FILE),
+                ): str,
+                vol.Optional(
+                    CONF_REPLAY_SPEED,
+                    default=get_entry_setting(self.config_entry, CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=MAX_REPLAY_SPEED)),
             }),
         )
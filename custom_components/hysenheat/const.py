@@ -70,12 +70,40 @@ PLATFORMS = [
 # Configuration keys
 CONF_SYNC_CLOCK = "sync_clock"
 CONF_SYNC_HOUR = "sync_hour"
+CONF_DEVICES = "devices"
+CONF_FILE = "file"
+CONF_DEBOUNCE_WINDOW = "debounce_window"
+CONF_WRITE_BURST = "write_burst"
+CONF_WRITE_RATE = "write_rate"
+CONF_PROCESS_GATEWAY = "process_gateway"
+CONF_SHARED_TRANSPORT = "shared_transport"
+CONF_HEDGE_READS = "hedge_reads"
+CONF_SCHEDULE_REFRESH = "schedule_refresh"
+CONF_CAPTURE = "capture"
+CONF_REPLAY_FILE = "replay_file"
+CONF_REPLAY_SPEED = "replay_speed"
 
 # Default values
 DEFAULT_NAME = "Hysen Heating"
 DEFAULT_TIMEOUT = 10
-DEFAULT_SYNC_CLOCK = False
+DEFAULT_SYNC_CLOCK = True
 DEFAULT_SYNC_HOUR = 4
+DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_DEBOUNCE_WINDOW = 0.5
+MAX_DEBOUNCE_WINDOW = 5
+DEFAULT_WRITE_BURST = 6
+DEFAULT_WRITE_RATE = 12
+WRITE_LIMIT_MAX_WAIT = 2
+DEFAULT_PROCESS_GATEWAY = False
+DEFAULT_SHARED_TRANSPORT = False
+DEFAULT_HEDGE_READS = True
+DEFAULT_SCHEDULE_REFRESH = True
+DEFAULT_CAPTURE = False
+DEFAULT_REPLAY_FILE = ""
+DEFAULT_REPLAY_SPEED = 1
+MAX_REPLAY_SPEED = 1000
+MIN_SCAN_INTERVAL = 10
+MAX_SCAN_INTERVAL = 3600
 DEFAULT_CURRENT_TEMP = 22
 DEFAULT_TARGET_TEMP = 22
 DEFAULT_MIN_TEMP = 5
@@ -84,6 +112,89 @@ DEFAULT_EXTERNAL_MAX_TEMP = 99
 DEFAULT_CALIBRATION = 0
 HYSENHEAT_DEFAULT_MAX_TEMP = 35
 HYSENHEAT_DEFAULT_MIN_TEMP = 5
+DEFAULT_TRACE_BUFFER_SIZE = 1000
+DEFAULT_PROFILE_DURATION = 60
+MAX_PROFILE_DURATION = 3600
+DEFAULT_LOOP_BLOCK_THRESHOLD = 0.1
+DEFAULT_DISCOVERY_TIMEOUT = 2
+CIRCUIT_FAILURE_THRESHOLD = 3
+STATUS_LAYOUT_FAILURE_THRESHOLD = 3
+REDISCOVERY_INTERVAL = 300
+CLOCK_DRIFT_THRESHOLD = 60
+CLOCK_SYNC_WINDOW = 3600
+CLOCK_SYNC_STAGGER = 1800
+CLOCK_SYNC_CONCURRENCY = 2
+WRITE_GATE_MAX_AGE = 30
+BULK_IMPORT_CONCURRENCY = 8
+BULK_IMPORT_TIMEOUT = 5
+SCHEDULER_READBACK_GRACE = 1
+EXECUTOR_MIN_WORKERS = 2
+EXECUTOR_MAX_WORKERS = 16
+GATEWAY_WORKERS = 16
+GATEWAY_CALL_ATTEMPTS = 4
+GATEWAY_START_GRACE = 30
+TRANSPORT_RETRY_INTERVAL = 1
+
+# Hedged reads
+HEDGE_RTT_SAMPLES = 50
+HEDGE_MIN_SAMPLES = 10
+HEDGE_MIN_DELAY = 0.05
+HEDGE_BUDGET_RATIO = 0.1
+HEDGE_BUDGET_MAX = 3
+
+# Adaptive timeouts (RFC 6298)
+RTT_ALPHA = 0.125
+RTT_BETA = 0.25
+RTT_MIN_RTO = 0.5
+ADAPTIVE_TIMEOUT_ATTEMPTS = 3
+
+# Schedule-aware polling
+SCHEDULE_REFRESH_DELAY = 5
+SCHEDULE_RELAXED_INTERVAL = 120
+
+# Frame capture
+CAPTURE_DIRECTORY = f"{DOMAIN}_captures"
+CAPTURE_MAX_BYTES = 1048576
+CAPTURE_BACKUPS = 3
+
+# Fleet outage detection
+FLEET_OUTAGE_MIN_DEVICES = 2
+FLEET_OUTAGE_RATIO = 0.75
+FLEET_OUTAGE_WINDOW = 120
+FLEET_CANARY_INTERVAL = 15
+FLEET_RESUME_STAGGER = 2
+
+# Device request priorities, lowest value first
+PRIORITY_COMMAND = 0
+PRIORITY_VERIFY = 1
+PRIORITY_POLL = 2
+
+# Metrics
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Integration-wide keys in hass.data
+DATA_TRACER = f"{DOMAIN}_tracer"
+DATA_PROFILER = f"{DOMAIN}_profiler"
+DATA_WATCHDOG = f"{DOMAIN}_watchdog"
+DATA_DISCOVERY_CACHE = f"{DOMAIN}_discovery_cache"
+DATA_SESSIONS = f"{DOMAIN}_sessions"
+DATA_CLOCK_SYNC = f"{DOMAIN}_clock_sync"
+DATA_EXECUTOR = f"{DOMAIN}_executor"
+DATA_GATEWAY = f"{DOMAIN}_gateway"
+DATA_TRANSPORT = f"{DOMAIN}_transport"
+DATA_FLEET = f"{DOMAIN}_fleet"
+
+# Persisted sessions
+SESSION_STORAGE_KEY = f"{DOMAIN}.sessions"
+SESSION_STORAGE_VERSION = 1
+SESSION_SAVE_DELAY = 10
+
+# LAN discovery
+DISCOVERY_PORT = 80
+DISCOVERY_PROBES = 3
+DISCOVERY_CACHE_TTL = 60
+HYSEN_DEVICE_TYPES = (0x4EAD,)
 
 # Data keys for coordinator
 DATA_KEY_FWVERSION = "fwversion"
@@ -192,6 +303,10 @@ ATTR_SLOT2_WE_TEMP = "slot2_we_temp"
 ATTR_SLOT1_OFF = "slot1_off"
 ATTR_UNKNOWN2 = "unknown2"
 ATTR_UNKNOWN3 = "unknown3"
+ATTR_TRACE_ID = "trace_id"
+ATTR_LIMIT = "limit"
+ATTR_CLEAR = "clear"
+ATTR_DURATION = "duration"
 
 # Service names
 SERVICE_TURN_ON = "turn_on"
@@ -226,6 +341,9 @@ SERVICE_SET_SLOT6_TEMP = "set_slot6_temp"
 SERVICE_SET_SLOT1_WE_TEMP = "set_slot1_we_temp"
 SERVICE_SET_SLOT2_WE_TEMP = "set_slot2_we_temp"
 SERVICE_SET_SLOT1_OFF = "set_slot1_off"
+SERVICE_EXPORT_TRACES = "export_traces"
+SERVICE_PROFILE_START = "profile_start"
+SERVICE_PROFILE_STOP = "profile_stop"
 
 # Mappings
 KEY_LOCK_HYSEN_TO_HASS = {
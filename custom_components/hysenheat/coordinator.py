@@ -2,94 +2,589 @@
 DataUpdateCoordinator for Hysen Heating integration.
 """
 
+import asyncio
+import functools
 import logging
-from datetime import timedelta
+import time
+from datetime import datetime, timedelta
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from .const import (
     DOMAIN,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_TIMEOUT,
+    CONF_SYNC_CLOCK,
+    CONF_SYNC_HOUR,
+    CONF_WRITE_BURST,
+    CONF_WRITE_RATE,
+    CONF_PROCESS_GATEWAY,
+    CONF_SHARED_TRANSPORT,
+    CONF_HEDGE_READS,
+    CONF_SCHEDULE_REFRESH,
+    CONF_CAPTURE,
+    CONF_REPLAY_SPEED,
+    DEFAULT_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SYNC_CLOCK,
+    DEFAULT_SYNC_HOUR,
+    DEFAULT_WRITE_BURST,
+    DEFAULT_WRITE_RATE,
+    DEFAULT_PROCESS_GATEWAY,
+    DEFAULT_SHARED_TRANSPORT,
+    DEFAULT_HEDGE_READS,
+    DEFAULT_SCHEDULE_REFRESH,
+    DEFAULT_CAPTURE,
+    DEFAULT_REPLAY_SPEED,
+    WRITE_LIMIT_MAX_WAIT,
+    PRIORITY_COMMAND,
+    PRIORITY_VERIFY,
+    PRIORITY_POLL,
+    CIRCUIT_FAILURE_THRESHOLD,
+    STATUS_LAYOUT_FAILURE_THRESHOLD,
+    CLOCK_DRIFT_THRESHOLD,
+    CLOCK_SYNC_CONCURRENCY,
+    WRITE_GATE_MAX_AGE,
+    DATA_CLOCK_SYNC,
+    REDISCOVERY_INTERVAL,
+    CAPTURE_DIRECTORY,
+    SCHEDULE_REFRESH_DELAY,
+    SCHEDULE_RELAXED_INTERVAL,
     DATA_KEY_FWVERSION,
-    DATA_KEY_KEY_LOCK,
-    DATA_KEY_TEMPORARY_MANUAL,
-    DATA_KEY_VALVE_STATE,
-    DATA_KEY_POWER_STATE,
-    DATA_KEY_ROOM_TEMP,
-    DATA_KEY_TARGET_TEMP,
-    DATA_KEY_OPERATION_MODE,
-    DATA_KEY_PRESET_MODE,
-    DATA_KEY_SENSOR_TYPE,
-    DATA_KEY_EXTERNAL_MAX_TEMP,
-    DATA_KEY_HYSTERESIS,
-    DATA_KEY_MAX_TEMP,
-    DATA_KEY_MIN_TEMP,
-    DATA_KEY_CALIBRATION,
-    DATA_KEY_FROST_PROTECTION,
-    DATA_KEY_POWERON,
-    DATA_KEY_UNKNOWN1,
-    DATA_KEY_EXTERNAL_TEMP,
     DATA_KEY_CLOCK_HOUR,
     DATA_KEY_CLOCK_MINUTE,
     DATA_KEY_CLOCK_SECOND,
     DATA_KEY_CLOCK_WEEKDAY,
-    DATA_KEY_SLOT1_TIME,
-    DATA_KEY_SLOT2_TIME,
-    DATA_KEY_SLOT3_TIME,
-    DATA_KEY_SLOT4_TIME,
-    DATA_KEY_SLOT5_TIME,
-    DATA_KEY_SLOT6_TIME,
-    DATA_KEY_SLOT1_WE_TIME,
-    DATA_KEY_SLOT2_WE_TIME,
-    DATA_KEY_SLOT1_TEMP,
-    DATA_KEY_SLOT2_TEMP,
-    DATA_KEY_SLOT3_TEMP,
-    DATA_KEY_SLOT4_TEMP,
-    DATA_KEY_SLOT5_TEMP,
-    DATA_KEY_SLOT6_TEMP,
-    DATA_KEY_SLOT1_WE_TEMP,
-    DATA_KEY_SLOT2_WE_TEMP,
-#    DATA_KEY_SLOT1_OFF,
-    DATA_KEY_UNKNOWN2,
-    DATA_KEY_UNKNOWN3,
-    STATE_ON,
-    STATE_OFF,
-    KEY_LOCK_HYSEN_TO_HASS,
-    TEMPORARY_MANUAL_HYSEN_TO_HASS,
-    VALVE_STATE_HYSEN_TO_HASS,
-    POWER_STATE_HYSEN_TO_HASS,
-    MODE_HYSEN_TO_HASS,
-    PRESET_HYSEN_TO_HASS,
-    SENSOR_TYPE_HYSEN_TO_HASS,
-    FROST_PROTECTION_HYSEN_TO_HASS,
-    POWERON_HYSEN_TO_HASS,
 )
+from .metrics import HysenDeviceStats
+from .device import create_device, configure_device, call_with_reauth, export_session, is_auth_error
+from .discovery import async_find_device
+from .clock import estimate_clock_drift, in_sync_window, set_device_clock
+from .ratelimit import HysenTokenBucket
+from .scheduler import HysenScheduler
+from .status import STATUS_REQUEST, StatusLayoutError, fetch_snapshot, decode_status, read_status
+from .gateway import get_gateway
+from .transport import async_get_transport
+from .capture import HysenFrameCapture, HysenReplayDevice, attach_capture, capture_path
+from .fleet import get_fleet_monitor
+from .hedging import HysenHedger, HysenRttEstimator
+from .schedule import HysenScheduleTracker, compile_schedule, device_week_position, follows_schedule, schedule_signature
 
 _LOGGER = logging.getLogger(__name__)
 
+def get_entry_setting(entry: ConfigEntry, key: str, default):
+    """Return a setting of a config entry.
+
+    Options set through the options flow take precedence over the data
+    entered when the entry was created.
+
+    Args:
+        entry: The configuration entry of the device.
+        key: The setting to look up.
+        default: The value used if the setting is set nowhere.
+
+    Returns:
+        Any: The value of the setting.
+    """
+    if key in entry.options:
+        return entry.options[key]
+    return entry.data.get(key, default)
+
 class HysenCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Hysen device data.
 
     Periodically updates device status and maps it to Home Assistant-compatible formats.
     """
 
-    def __init__(self, hass: HomeAssistant, device, host):
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, device, host, tracer, profiler, sessions, executor):
         """Initialize the Hysen coordinator.
 
         Args:
             hass: The Home Assistant instance.
+            entry: The configuration entry of the device.
             device: The HysenHeatingDevice instance to communicate with.
             host: The host address of the device.
+            tracer: The HysenTracer recording command and poll spans.
+            profiler: The HysenProfiler timing the integration's hot paths.
+            sessions: The HysenSessionStore persisting the device session.
+            executor: The HysenExecutor running the blocking device calls.
         """
+        self.entry = entry
+        self.device = device
+        self.polling_relaxed = False
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_{host}",
-            update_interval=timedelta(seconds=30),
+            update_interval=self._poll_interval(),
         )
-        self.device = device
         self.host = host
+        self.tracer = tracer
+        self.profiler = profiler
+        self.sessions = sessions
+        self.executor = executor
+        self.stats = HysenDeviceStats()
+        self.write_limiter = HysenTokenBucket(
+            get_entry_setting(entry, CONF_WRITE_BURST, DEFAULT_WRITE_BURST),
+            get_entry_setting(entry, CONF_WRITE_RATE, DEFAULT_WRITE_RATE),
+        )
+        self.scheduler = HysenScheduler(hass, host, self.stats)
+        self.rtt = HysenRttEstimator()
+        self.hedger = HysenHedger(self.stats, self.rtt)
+        self.hedger.enabled = get_entry_setting(entry, CONF_HEDGE_READS, DEFAULT_HEDGE_READS)
+        self._verify_pending = False
+        self._decode_status = True
+        self._layout_failures = 0
+        self._rediscovery_task = None
+        self._last_rediscovery = None
+        self._closed = False
+        self.clock_drift = None
+        self._last_poll = None
+        self._last_clock_sync = None
+        self.capture = None
+        self.schedule = None
+        self._schedule_signature = None
+        self._unsub_transition = None
+        self.schedule_tracker = HysenScheduleTracker(hass, self.async_update_listeners)
+        self._apply_capture()
+        self.fleet = get_fleet_monitor(hass)
+        # A replayed capture says nothing about the network
+        if not self.replaying:
+            self.fleet.register(self)
+
+    @property
+    def replaying(self):
+        """Return True if the device answers from a capture instead of the network.
+
+        Returns:
+            bool: True if the device is a HysenReplayDevice.
+        """
+        return isinstance(self.device, HysenReplayDevice)
+
+    @property
+    def following_schedule(self):
+        """Return True if the device runs its weekly schedule.
+
+        Returns:
+            bool: True if the device is on and in auto mode.
+        """
+        return bool(self.data) and follows_schedule(self.data)
+
+    @property
+    def effective_timeout(self):
+        """Return the timeout applied to the device's calls.
+
+        Returns:
+            float: The timeout derived from the device's measured round-trip time,
+                at most the configured timeout.
+        """
+        return self.rtt.timeout(get_entry_setting(self.entry, CONF_TIMEOUT, DEFAULT_TIMEOUT))
+
+    @property
+    def circuit_open(self):
+        """Return True if the device is considered offline after repeated poll failures.
+
+        Returns:
+            bool: True once CIRCUIT_FAILURE_THRESHOLD consecutive polls have failed.
+        """
+        return self.stats.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD
+
+    async def async_apply_entry_update(self):
+        """Apply changed entry options and data to the running coordinator and device.
+
+        The timeout, poll interval, write rate limits, hedging, schedule-aware
+        polling and capture are applied in place (clock sync settings are read on every poll) and
+        a host change moves the device transport to the new address, keeping the
+        session, so entities are neither reloaded nor re-authenticated.
+
+        Returns:
+            None
+        """
+        timeout = get_entry_setting(self.entry, CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        self.update_interval = self._poll_interval()
+        self.write_limiter.configure(
+            get_entry_setting(self.entry, CONF_WRITE_BURST, DEFAULT_WRITE_BURST),
+            get_entry_setting(self.entry, CONF_WRITE_RATE, DEFAULT_WRITE_RATE),
+        )
+        self.hedger.enabled = get_entry_setting(self.entry, CONF_HEDGE_READS, DEFAULT_HEDGE_READS)
+        if self.data:
+            self._plan_transition_refresh(self.data)
+        if self.entry.data[CONF_HOST] != self.host and not self.replaying:
+            await self._async_move_to(self.entry.data[CONF_HOST])
+        else:
+            configure_device(self.device, self.effective_timeout)
+        self._apply_capture()
+        device_data = self.hass.data[DOMAIN].get(self.entry.entry_id)
+        if device_data is not None:
+            device_data["timeout"] = timeout
+        _LOGGER.debug(
+            "Applied settings to %s: timeout %s s, poll interval %s",
+            self.host, timeout, self.update_interval,
+        )
+
+    async def _async_move_to(self, host: str):
+        """Rebuild the device transport for a new address, keeping the session.
+
+        Args:
+            host: The new host address of the device.
+
+        Returns:
+            None
+        """
+        mac = self.entry.data[CONF_MAC]
+        self.device = await self.executor.async_run(
+            create_device, host, mac, self.effective_timeout, self.sessions.get(mac)
+        )
+        self.host = host
+        self._apply_capture()
+        device_data = self.hass.data[DOMAIN].get(self.entry.entry_id)
+        if device_data is not None:
+            device_data["host"] = host
+
+    def _poll_interval(self):
+        """Return the poll interval set for the device.
+
+        A replayed capture is polled as many times faster as it is replayed.
+        Between the transitions of a followed schedule, the device is polled at
+        least SCHEDULE_RELAXED_INTERVAL seconds apart.
+
+        Returns:
+            timedelta: The interval between status reads.
+        """
+        seconds = get_entry_setting(self.entry, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        if self.replaying:
+            seconds /= get_entry_setting(self.entry, CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED)
+        elif self.polling_relaxed:
+            seconds = max(seconds, SCHEDULE_RELAXED_INTERVAL)
+        return timedelta(seconds=seconds)
+
+    def _apply_capture(self):
+        """Start or stop capturing the device's packets as set in the options.
+
+        Packets exchanged in the gateway process are not captured, and neither
+        are those of a replayed capture.
+
+        Returns:
+            None
+        """
+        enabled = get_entry_setting(self.entry, CONF_CAPTURE, DEFAULT_CAPTURE) and not self.replaying
+        if enabled and self.capture is None:
+            path = capture_path(self.hass.config.path(CAPTURE_DIRECTORY), self.entry.data[CONF_MAC])
+            self.capture = HysenFrameCapture(path)
+            _LOGGER.info("Capturing the packets of %s to %s", self.host, path)
+        elif not enabled and self.capture is not None:
+            self.capture.close()
+            self.capture = None
+            _LOGGER.info("Stopped capturing the packets of %s", self.host)
+        attach_capture(self.device, self.capture)
+
+    def _plan_transition_refresh(self, data: dict):
+        """Schedule a refresh right after the next slot of the weekly schedule starts.
+
+        The timeline is compiled again only when the schedule changed, and handed
+        to the schedule tracker. While the device runs its schedule, the target
+        temperature only changes at a slot start, so the background poll interval
+        is relaxed until then.
+
+        Args:
+            data: The coordinator data just read from the device.
+
+        Returns:
+            None
+        """
+        signature = schedule_signature(data)
+        if signature != self._schedule_signature:
+            self._schedule_signature = signature
+            self.schedule = compile_schedule(data)
+        self.schedule_tracker.update(self.schedule, self.clock_drift)
+        self._cancel_transition_refresh()
+        upcoming = None
+        if (
+            get_entry_setting(self.entry, CONF_SCHEDULE_REFRESH, DEFAULT_SCHEDULE_REFRESH)
+            and not self.replaying
+            and self.schedule is not None
+            and follows_schedule(data)
+        ):
+            upcoming = self.schedule.next_transition(device_week_position(datetime.now(), self.clock_drift))
+        self._relax_polling(upcoming is not None)
+        if upcoming is None:
+            return
+        delay, (_position, slot, temp) = upcoming
+        self._unsub_transition = async_call_later(
+            self.hass, delay + SCHEDULE_REFRESH_DELAY, self._async_transition_refresh
+        )
+        _LOGGER.debug("Next schedule transition of %s in %s s, %s to %s", self.host, delay, slot, temp)
+
+    def _relax_polling(self, relaxed: bool):
+        """Relax the background poll interval or restore the configured one.
+
+        Args:
+            relaxed: True while the device is read right after each schedule transition.
+
+        Returns:
+            None
+        """
+        if relaxed != self.polling_relaxed:
+            self.polling_relaxed = relaxed
+            self.update_interval = self._poll_interval()
+
+    def _cancel_transition_refresh(self):
+        """Cancel the refresh scheduled for the next schedule transition.
+
+        Returns:
+            None
+        """
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    async def _async_transition_refresh(self, _now):
+        """Read the device after a schedule slot started.
+
+        Args:
+            _now: The time the refresh was scheduled for.
+
+        Returns:
+            None
+        """
+        self._unsub_transition = None
+        self.stats.transition_refreshes += 1
+        await self.async_refresh()
+
+    async def async_send_command(self, func, *args):
+        """Execute a blocking device command in the executor, ahead of queued reads.
+
+        The next status read is scheduled as the command's verification.
+
+        Args:
+            func: The device method to execute.
+            *args: Variable arguments to pass to the method.
+
+        Returns:
+            Any: The value returned by the device method.
+
+        Raises:
+            ServiceValidationError: If the device replays a capture, or its write
+                rate limit is exceeded.
+            Exception: Any error raised by the device method.
+        """
+        command = getattr(func, "__name__", repr(func))
+        if self.replaying:
+            raise ServiceValidationError(
+                f"Hysen: {self.host} replays a capture, {command} was not sent",
+                translation_domain=DOMAIN,
+                translation_key="replaying",
+            )
+        await self._async_acquire_write(command)
+        self.stats.commands_in_flight += 1
+        start = time.perf_counter()
+        success = False
+        try:
+            with self.tracer.span("executor", host=self.host, job=command):
+                result = await self._async_run_job(func, *args, priority=PRIORITY_COMMAND)
+            success = True
+            self._verify_pending = True
+            return result
+        finally:
+            self.stats.commands_in_flight -= 1
+            self.stats.record_command(time.perf_counter() - start, success)
+
+    async def _async_acquire_write(self, command: str):
+        """Take a write token, waiting briefly for the next one if needed.
+
+        Args:
+            command: The name of the command, for logging.
+
+        Returns:
+            None
+
+        Raises:
+            ServiceValidationError: If no token is available within WRITE_LIMIT_MAX_WAIT seconds.
+        """
+        wait = self.write_limiter.reserve(WRITE_LIMIT_MAX_WAIT)
+        if wait is None:
+            self.stats.writes_throttled += 1
+            _LOGGER.warning("Refusing %s for %s, too many writes to the device", command, self.host)
+            raise ServiceValidationError(
+                f"Hysen: Too many writes to {self.host}, {command} was not sent",
+                translation_domain=DOMAIN,
+                translation_key="rate_limited",
+            )
+        if wait:
+            self.stats.writes_delayed += 1
+            with self.tracer.span("rate_limit", host=self.host, wait=wait):
+                await asyncio.sleep(wait)
+
+    async def _async_run_job(self, func, *args, priority: int = PRIORITY_POLL, status_read: bool = False):
+        """Run a blocking device call through the scheduler and persist the session it used.
+
+        The call runs in the integration's thread pool, or in the gateway process if
+        enabled. The scheduler runs one call per device at a time, so a device never
+        occupies more than one worker.
+
+        A session dropped by the device is renegotiated and the call retried once,
+        so that it does not surface as a failed poll or command.
+
+        Args:
+            func: The device method to execute.
+            *args: Variable arguments to pass to the method.
+            priority: The scheduling priority of the call.
+            status_read: True if the call reads the device status.
+
+        Returns:
+            Any: The value returned by the device method.
+        """
+        if self._closed:
+            raise HomeAssistantError(f"Device {self.host} is unloaded")
+        device = self.device
+
+        async def _async_job():
+            return await self._async_call(device, func, *args)
+
+        return await self.scheduler.async_submit(priority, _async_job, status_read)
+
+    async def _async_call(self, device, func, *args):
+        """Run a blocking device call right away, in the thread pool or gateway process.
+
+        Args:
+            device: The HysenHeatingDevice instance the call belongs to.
+            func: The device method to execute.
+            *args: Variable arguments to pass to the method.
+
+        Returns:
+            Any: The value returned by the device method.
+        """
+        if get_entry_setting(self.entry, CONF_PROCESS_GATEWAY, DEFAULT_PROCESS_GATEWAY) and not self.replaying:
+            return await self._async_run_in_gateway(func, *args)
+        try:
+            return await self.executor.async_run(
+                self.profiler.wrap_job(call_with_reauth), device, func, *args, stats=self.stats
+            )
+        finally:
+            # A replayed capture has no session worth keeping
+            if not self.replaying:
+                self.sessions.async_set(self.entry.data[CONF_MAC], export_session(device))
+
+    async def _async_fetch_snapshot(self, priority: int):
+        """Read the device status through the scheduler.
+
+        The first poll goes through the library, which also reads the firmware
+        version. Later polls decode the raw status response in tree, read over the
+        shared datagram endpoint if enabled and the device is authenticated, or by
+        the library's transport otherwise. These reads measure the device's
+        round-trip time and, unless disabled, are hedged when the device is slower
+        than usual to answer. A reply with an unknown status layout is read again
+        through the library's attributes. After STATUS_LAYOUT_FAILURE_THRESHOLD
+        such replies in a row, the firmware is read through the library from then on.
+
+        Args:
+            priority: The scheduling priority of the read.
+
+        Returns:
+            dict: The coordinator data.
+        """
+        device = self.device
+        if not self.data or not self._decode_status:
+            return await self._async_run_job(
+                functools.partial(fetch_snapshot, device), priority=priority, status_read=True
+            )
+        if self._closed:
+            raise HomeAssistantError(f"Device {self.host} is unloaded")
+        fwversion = self.data[DATA_KEY_FWVERSION]
+        local = not get_entry_setting(self.entry, CONF_PROCESS_GATEWAY, DEFAULT_PROCESS_GATEWAY) and not self.replaying
+        shared = local and get_entry_setting(self.entry, CONF_SHARED_TRANSPORT, DEFAULT_SHARED_TRANSPORT)
+        # The gateway process and a replayed capture send their own packets
+        hedger = self.hedger if local else None
+
+        async def _async_decode():
+            if shared and device.id and device._authenticated:
+                try:
+                    transport = await async_get_transport(self.hass)
+                    payload = await transport.async_request_payload(device, STATUS_REQUEST, hedger)
+                    return decode_status(payload, fwversion)
+                except StatusLayoutError:
+                    raise
+                except Exception as exc:
+                    if not is_auth_error(exc):
+                        raise
+                    _LOGGER.debug("Session of %s rejected (%s), reading through the library", self.host, exc)
+                    device._authenticated = False
+            return await self._async_call(device, functools.partial(read_status, device, fwversion, hedger))
+
+        async def _async_job():
+            try:
+                data = await _async_decode()
+            except StatusLayoutError as exc:
+                # A single odd reply, such as an error frame, does not disable the decoder
+                self._layout_failures += 1
+                if self._layout_failures >= STATUS_LAYOUT_FAILURE_THRESHOLD:
+                    _LOGGER.warning(
+                        "Unknown status layout from %s in %d replies in a row (%s), reading through the library from now on",
+                        self.host, self._layout_failures, exc,
+                    )
+                    self._decode_status = False
+                else:
+                    _LOGGER.debug("Unknown status layout from %s (%s), reading through the library", self.host, exc)
+                return await self._async_call(device, functools.partial(fetch_snapshot, device))
+            self._layout_failures = 0
+            return data
+
+        return await self.scheduler.async_submit(priority, _async_job, True)
+
+    async def _async_run_in_gateway(self, func, *args):
+        """Run a device call in the gateway process and persist the session it used.
+
+        The local device object only describes the call; the gateway process keeps
+        its own device object and session.
+
+        Args:
+            func: The device method to execute.
+            *args: Variable arguments to pass to the method.
+
+        Returns:
+            Any: The value returned by the device method.
+        """
+        mac = self.entry.data[CONF_MAC]
+        result, session = await get_gateway(self.hass).async_call(
+            self.host,
+            mac,
+            self.effective_timeout,
+            self.sessions.get(mac),
+            func,
+            *args,
+        )
+        self.sessions.async_set(mac, session)
+        return result
+
+    async def async_shutdown(self):
+        """Shut down the coordinator when its config entry is unloaded.
+
+        Stops scheduled polls and a running rediscovery, and makes commands still
+        queued by entities or the scheduler fail instead of reaching the device.
+
+        Returns:
+            None
+        """
+        self._closed = True
+        self.fleet.unregister(self)
+        self._cancel_transition_refresh()
+        self.schedule_tracker.stop()
+        if self._rediscovery_task is not None:
+            self._rediscovery_task.cancel()
+            self._rediscovery_task = None
+        await self.scheduler.async_stop()
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
+        await super().async_shutdown()
+        _LOGGER.debug("Shut down coordinator for %s", self.host)
 
     async def _async_update_data(self):
         """Fetch data from the Hysen device.
@@ -103,55 +598,161 @@ class HysenCoordinator(DataUpdateCoordinator):
             UpdateFailed: If communication with the device fails.
         """
         _LOGGER.debug("Fetching data for device at %s", self.host)
+        with self.tracer.span("poll", host=self.host), self.profiler.section("coordinator.update_data"):
+            return await self._async_fetch_data()
+
+    async def _async_fetch_data(self):
+        """Read the device status and map it to Home Assistant-compatible formats.
+
+        Returns:
+            dict: A dictionary containing the updated device data.
+
+        Raises:
+            UpdateFailed: If communication with the device fails, or polling is
+                paused during a network outage.
+        """
+        if self.fleet.paused(self):
+            self.stats.polls_paused += 1
+            _LOGGER.debug("Skipping the poll of %s, polling is paused during a network outage", self.host)
+            raise UpdateFailed("Polling paused during a network outage")
+        start = time.perf_counter()
+        priority = PRIORITY_VERIFY if self._verify_pending else PRIORITY_POLL
+        self._verify_pending = False
         try:
-            await self.hass.async_add_executor_job(self.device.get_device_status)
-            data = {
-                DATA_KEY_FWVERSION: self.device.fwversion,
-                DATA_KEY_KEY_LOCK: KEY_LOCK_HYSEN_TO_HASS.get(self.device.key_lock),
-                DATA_KEY_TEMPORARY_MANUAL: TEMPORARY_MANUAL_HYSEN_TO_HASS.get(self.device.manual_in_auto),
-                DATA_KEY_VALVE_STATE: VALVE_STATE_HYSEN_TO_HASS.get(self.device.valve_state),
-                DATA_KEY_POWER_STATE: POWER_STATE_HYSEN_TO_HASS.get(self.device.power_state),
-                DATA_KEY_ROOM_TEMP: self.device.room_temp,
-                DATA_KEY_TARGET_TEMP: self.device.target_temp,
-                DATA_KEY_OPERATION_MODE: MODE_HYSEN_TO_HASS.get(self.device.operation_mode),
-                DATA_KEY_PRESET_MODE: PRESET_HYSEN_TO_HASS.get(self.device.schedule),
-                DATA_KEY_SENSOR_TYPE: SENSOR_TYPE_HYSEN_TO_HASS.get(self.device.sensor),
-                DATA_KEY_EXTERNAL_MAX_TEMP: self.device.external_max_temp,
-                DATA_KEY_HYSTERESIS: self.device.hysteresis,
-                DATA_KEY_MAX_TEMP: self.device.max_temp,
-                DATA_KEY_MIN_TEMP: self.device.min_temp,
-                DATA_KEY_CALIBRATION: self.device.calibration,
-                DATA_KEY_FROST_PROTECTION: FROST_PROTECTION_HYSEN_TO_HASS.get(self.device.frost_protection),
-                DATA_KEY_POWERON: POWERON_HYSEN_TO_HASS.get(self.device.poweron),
-                DATA_KEY_UNKNOWN1: self.device.unknown1,
-                DATA_KEY_EXTERNAL_TEMP: self.device.external_temp,
-                DATA_KEY_CLOCK_HOUR: self.device.clock_hour,
-                DATA_KEY_CLOCK_MINUTE: self.device.clock_minute,
-                DATA_KEY_CLOCK_SECOND: self.device.clock_second,
-                DATA_KEY_CLOCK_WEEKDAY: self.device.clock_weekday,
-                DATA_KEY_SLOT1_TIME: f"{self.device.period1_hour}:{self.device.period1_min:02d}",
-                DATA_KEY_SLOT2_TIME: f"{self.device.period2_hour}:{self.device.period2_min:02d}",
-                DATA_KEY_SLOT3_TIME: f"{self.device.period3_hour}:{self.device.period3_min:02d}",
-                DATA_KEY_SLOT4_TIME: f"{self.device.period4_hour}:{self.device.period4_min:02d}",
-                DATA_KEY_SLOT5_TIME: f"{self.device.period5_hour}:{self.device.period5_min:02d}",
-                DATA_KEY_SLOT6_TIME: f"{self.device.period6_hour}:{self.device.period6_min:02d}",
-                DATA_KEY_SLOT1_WE_TIME:  f"{self.device.we_period1_hour}:{self.device.we_period1_min:02d}",
-                DATA_KEY_SLOT2_WE_TIME:  f"{self.device.we_period2_hour}:{self.device.we_period2_min:02d}",
-                DATA_KEY_SLOT1_TEMP: self.device.period1_temp,
-                DATA_KEY_SLOT2_TEMP: self.device.period2_temp,
-                DATA_KEY_SLOT3_TEMP: self.device.period3_temp,
-                DATA_KEY_SLOT4_TEMP: self.device.period4_temp,
-                DATA_KEY_SLOT5_TEMP: self.device.period5_temp,
-                DATA_KEY_SLOT6_TEMP: self.device.period6_temp,
-                DATA_KEY_SLOT1_WE_TEMP: self.device.we_period1_temp,
-                DATA_KEY_SLOT2_WE_TEMP: self.device.we_period2_temp,
-#                DATA_KEY_SLOT1_OFF: STATE_ON if self.device.period1_temp == 0.0 else STATE_OFF,
-#                DATA_KEY_SLOT1_OFF: STATE_ON,
-                DATA_KEY_UNKNOWN2: self.device.unknown2,
-                DATA_KEY_UNKNOWN3: self.device.unknown3,
-            }
+            if self._clock_sync_due(datetime.now()):
+                await self._async_sync_clock()
+            with self.tracer.span("executor", host=self.host, job="get_device_status"):
+                data = await self._async_fetch_snapshot(priority)
+            self.clock_drift = estimate_clock_drift(
+                data[DATA_KEY_CLOCK_WEEKDAY],
+                data[DATA_KEY_CLOCK_HOUR],
+                data[DATA_KEY_CLOCK_MINUTE],
+                data[DATA_KEY_CLOCK_SECOND],
+                datetime.now(),
+            )
+            self.stats.record_poll(time.perf_counter() - start, True, data == self.data)
+            self._last_poll = time.monotonic()
+            # Later calls use the timeout derived from the round-trip times measured so far
+            configure_device(self.device, self.effective_timeout)
+            self._plan_transition_refresh(data)
+            self.fleet.report(self, True)
             _LOGGER.debug("Updated coordinator data for %s: %s", self.host, data)
             return data
         except Exception as exc:
-            _LOGGER.error("Failed to update device data for %s: %s", self.host, exc)
-            raise UpdateFailed(f"Error communicating with device: {exc}") from exc
\ No newline at end of file
+            self.stats.record_poll(time.perf_counter() - start, False)
+            self.fleet.report(self, False)
+            # A failing device is not trusted to follow its schedule
+            self._relax_polling(False)
+            self._async_schedule_rediscovery()
+            # The fleet monitor reports an outage once instead of every device on every poll
+            log = _LOGGER.debug if self.fleet.outage else _LOGGER.error
+            log("Failed to update device data for %s: %s", self.host, exc)
+            raise UpdateFailed(f"Error communicating with device: {exc}") from exc
+
+    def matches_snapshot(self, expected: dict):
+        """Return True if the latest device data already holds the expected values.
+
+        Only a fresh snapshot is trusted: the last poll must have succeeded within
+        WRITE_GATE_MAX_AGE seconds and no command may be running that could change it.
+
+        Args:
+            expected: Data keys mapped to the values a write would set.
+
+        Returns:
+            bool: True if the write would not change the device.
+        """
+        if not self.data or not self.last_update_success or self._last_poll is None:
+            return False
+        if self.stats.commands_in_flight or time.monotonic() - self._last_poll > WRITE_GATE_MAX_AGE:
+            return False
+        return all(self.data.get(key) == value for key, value in expected.items())
+
+    def _clock_sync_due(self, now: datetime):
+        """Return True if the device clock should be corrected during this poll.
+
+        Only devices drifted past CLOCK_DRIFT_THRESHOLD are corrected, once a night,
+        within the device's slot of the nightly window. A replayed capture keeps
+        its recorded clock.
+
+        Args:
+            now: The local time.
+
+        Returns:
+            bool: True if the clock should be set before reading the status.
+        """
+        if not get_entry_setting(self.entry, CONF_SYNC_CLOCK, DEFAULT_SYNC_CLOCK) or self.replaying:
+            return False
+        if self.clock_drift is None or abs(self.clock_drift) < CLOCK_DRIFT_THRESHOLD:
+            return False
+        if self._last_clock_sync == now.date():
+            return False
+        sync_hour = get_entry_setting(self.entry, CONF_SYNC_HOUR, DEFAULT_SYNC_HOUR)
+        return in_sync_window(self.entry.data[CONF_MAC], sync_hour, now)
+
+    async def _async_sync_clock(self):
+        """Set the device clock as part of the current poll.
+
+        The status read that follows picks up the corrected clock, so no extra
+        refresh is needed. A failure is logged and retried on the next poll.
+
+        Returns:
+            None
+        """
+        semaphore = self.hass.data.setdefault(DATA_CLOCK_SYNC, asyncio.Semaphore(CLOCK_SYNC_CONCURRENCY))
+        async with semaphore:
+            try:
+                with self.tracer.span("executor", host=self.host, job="set_time"):
+                    synced_at = await self._async_run_job(functools.partial(set_device_clock, self.device))
+            except Exception as exc:
+                _LOGGER.warning("Failed to synchronize the clock of %s: %s", self.host, exc)
+                return
+        self._last_clock_sync = synced_at.date()
+        _LOGGER.info("Synchronized the clock of %s, which was %s s off", self.host, self.clock_drift)
+
+    def _async_schedule_rediscovery(self):
+        """Start a search for the device's current address after persistent failures.
+
+        Runs at most once every REDISCOVERY_INTERVAL seconds while the circuit is open.
+
+        Returns:
+            None
+        """
+        if not self.circuit_open or self._rediscovery_task is not None or self.replaying:
+            return
+        # During a network outage the device has not moved
+        if self.fleet.outage:
+            return
+        now = time.monotonic()
+        if self._last_rediscovery is not None and now - self._last_rediscovery < REDISCOVERY_INTERVAL:
+            return
+        self._last_rediscovery = now
+        self._rediscovery_task = self.hass.async_create_background_task(
+            self._async_rediscover(), f"{DOMAIN}_rediscover_{self.host}"
+        )
+
+    async def _async_rediscover(self):
+        """Look up the device by MAC and move to its new address if it changed.
+
+        The entry's host is updated and the device transport is rebuilt in place,
+        so the platforms do not need to be reloaded.
+
+        Returns:
+            None
+        """
+        mac = self.entry.data[CONF_MAC]
+        try:
+            found = await async_find_device(self.hass, mac)
+            if found is None or found[CONF_HOST] == self.host:
+                _LOGGER.debug("Device %s not found at a new address", mac)
+                return
+            new_host = found[CONF_HOST]
+            _LOGGER.warning("Device %s moved from %s to %s, reconnecting", mac, self.host, new_host)
+            await self._async_move_to(new_host)
+            self.hass.config_entries.async_update_entry(
+                self.entry, data={**self.entry.data, CONF_HOST: new_host}
+            )
+            await self.async_request_refresh()
+        except Exception as exc:
+            _LOGGER.error("Failed to look up device %s: %s", mac, exc)
+        finally:
+            self._rediscovery_task = None
@@ -0,0 +1,157 @@
+"""
+Device construction helpers for Hysen Heating integration.
+
+The HysenHeatingDevice constructor and status reads perform blocking network I/O,
+so these helpers must be run in an executor, never on the event loop.
+"""
+
+import binascii
+import logging
+from broadlink.exceptions import (
+    AuthenticationError,
+    AuthorizationError,
+    ConnectionClosedError,
+)
+from hysen import HysenHeatingDevice
+from .const import (
+    DEFAULT_SYNC_HOUR,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors meaning the device no longer accepts the session key or ID
+AUTH_ERRORS = (AuthenticationError, AuthorizationError, ConnectionClosedError)
+
+def create_device(host: str, mac: str, timeout: int, session: dict = None):
+    """Create a Hysen device (blocking).
+
+    The library's own clock sync is disabled; the coordinator corrects drifted
+    device clocks itself.
+
+    Args:
+        host: The host address of the device.
+        mac: The MAC address of the device, with or without colons.
+        timeout: The network timeout in seconds.
+        session: A session exported by export_session to reuse instead of authenticating.
+
+    Returns:
+        HysenHeatingDevice: The device instance.
+
+    Raises:
+        binascii.Error: If the MAC address is not valid hexadecimal.
+        Exception: Any error raised while connecting to the device.
+    """
+    mac_bytes = binascii.unhexlify(mac.replace(":", ""))
+    device = HysenHeatingDevice(
+        host=(host, 80),
+        mac=mac_bytes,
+        timeout=timeout,
+        sync_clock=False,
+        sync_hour=DEFAULT_SYNC_HOUR,
+    )
+    if session:
+        restore_session(device, session)
+    return device
+
+def validate_device(host: str, mac: str, timeout: int):
+    """Create a Hysen device and read its status to prove it is reachable (blocking).
+
+    Args:
+        host: The host address of the device.
+        mac: The MAC address of the device, with or without colons.
+        timeout: The network timeout in seconds.
+
+    Returns:
+        HysenHeatingDevice: The device instance, with its status read.
+
+    Raises:
+        Exception: Any error raised while connecting to or reading from the device.
+    """
+    device = create_device(host, mac, timeout)
+    device.get_device_status()
+    return device
+
+def configure_device(device, timeout: int):
+    """Apply new settings to an existing device without reconnecting.
+
+    The settings are read by the library on every call, so they take effect on
+    the next request while the session is kept.
+
+    Args:
+        device: The HysenHeatingDevice instance.
+        timeout: The network timeout in seconds.
+
+    Returns:
+        None
+    """
+    device.timeout = timeout
+
+def export_session(device):
+    """Return the negotiated session of a device.
+
+    Args:
+        device: The HysenHeatingDevice instance.
+
+    Returns:
+        dict: The session ID and AES key, or None if the device is not authenticated.
+    """
+    if not device.id:
+        return None
+    return {
+        "id": device.id,
+        "key": bytes(device.aes.algorithm.key).hex(),
+    }
+
+def restore_session(device, session: dict):
+    """Reuse a previously negotiated session instead of authenticating again.
+
+    Args:
+        device: The HysenHeatingDevice instance.
+        session: The session ID and AES key returned by export_session.
+
+    Returns:
+        None
+    """
+    device.id = session["id"]
+    device.update_aes(bytes.fromhex(session["key"]))
+    # The library authenticates on the first status read unless told it already did
+    device._authenticated = True
+
+def is_auth_error(exc: Exception):
+    """Return True if an error means the session is no longer valid.
+
+    Besides explicit error codes, a reply the library fails to CRC-check after
+    decryption is what a device answering under a different key looks like.
+
+    Args:
+        exc: The error raised by the device call.
+
+    Returns:
+        bool: True if re-authenticating may fix the error.
+    """
+    if isinstance(exc, AUTH_ERRORS):
+        return True
+    return isinstance(exc, ValueError) and exc.args[:1] == ("hysen_response_error",)
+
+def call_with_reauth(device, func, *args):
+    """Call a device method, re-authenticating and retrying once if the session was dropped (blocking).
+
+    Args:
+        device: The HysenHeatingDevice instance the method belongs to.
+        func: The device method to call.
+        *args: Variable arguments to pass to the method.
+
+    Returns:
+        Any: The value returned by the device method.
+
+    Raises:
+        Exception: Any error raised by the device method or the authentication.
+    """
+    try:
+        return func(*args)
+    except Exception as exc:
+        if not is_auth_error(exc):
+            raise
+        _LOGGER.debug("Session of %s rejected (%s), authenticating again", device.host[0], exc)
+    device._authenticated = device.auth()
+    return func(*args)
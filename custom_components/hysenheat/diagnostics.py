@@ -0,0 +1,73 @@
+"""
+Diagnostics support for Hysen Heating Controller.
+
+Reports how the integration currently talks to a device: the timeout derived
+from its measured round-trip time, hedging, request scheduling, schedule-aware
+polling and fleet state, and the I/O counters, next to the latest status snapshot.
+"""
+
+import logging
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from .const import (
+    DOMAIN,
+    CONF_MAC,
+    CONF_TIMEOUT,
+    DEFAULT_TIMEOUT,
+)
+from .coordinator import get_entry_setting
+
+_LOGGER = logging.getLogger(__name__)
+
+# The MAC address identifies the device and keys its persisted session
+TO_REDACT = {CONF_MAC}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    """Return diagnostics for a config entry.
+
+    Args:
+        hass: The Home Assistant instance.
+        entry: The configuration entry of the device.
+
+    Returns:
+        dict: The entry settings, connection state and latest device data.
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    stats = coordinator.stats
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "connection": {
+            "host": coordinator.host,
+            "configured_timeout": get_entry_setting(entry, CONF_TIMEOUT, DEFAULT_TIMEOUT),
+            "effective_timeout": coordinator.effective_timeout,
+            "smoothed_rtt": coordinator.rtt.srtt,
+            "rtt_variation": coordinator.rtt.rttvar,
+            "hedge_delay": coordinator.hedger.p95,
+            "hedging_enabled": coordinator.hedger.enabled,
+            "circuit_open": coordinator.circuit_open,
+            "polling_paused": coordinator.fleet.paused(coordinator),
+            "fleet_outage": coordinator.fleet.outage,
+            "replaying": coordinator.replaying,
+            "capturing": coordinator.capture is not None,
+            "clock_drift": coordinator.clock_drift,
+            "polling_relaxed": coordinator.polling_relaxed,
+            "schedule_transitions": len(coordinator.schedule.transitions) if coordinator.schedule else 0,
+            "scheduler_queue_depth": coordinator.scheduler.depth,
+        },
+        "stats": {
+            "polls": stats.polls,
+            "poll_failures": stats.poll_failures,
+            "consecutive_failures": stats.consecutive_failures,
+            "polls_paused": stats.polls_paused,
+            "reads_hedged": stats.reads_hedged,
+            "transition_refreshes": stats.transition_refreshes,
+            "commands": stats.commands,
+            "command_failures": stats.command_failures,
+            "writes_throttled": stats.writes_throttled,
+        },
+        "data": coordinator.data,
+    }
@@ -0,0 +1,219 @@
+"""
+LAN discovery of Hysen thermostats for Hysen Heating integration.
+
+This module broadcasts the Broadlink discovery probe on every local IPv4 subnet
+in parallel and collects the Hysen controllers that answer before a short deadline.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from datetime import datetime
+from homeassistant.components import network
+from homeassistant.core import HomeAssistant
+from .const import (
+    CONF_HOST,
+    CONF_MAC,
+    CONF_NAME,
+    DEFAULT_NAME,
+    DEFAULT_DISCOVERY_TIMEOUT,
+    DISCOVERY_CACHE_TTL,
+    DISCOVERY_PROBES,
+    DISCOVERY_PORT,
+    HYSEN_DEVICE_TYPES,
+    DATA_DISCOVERY_CACHE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+def format_mac(mac: str):
+    """Normalize a MAC address to lowercase colon-separated form.
+
+    Args:
+        mac: The MAC address, with or without separators.
+
+    Returns:
+        str: The normalized MAC address.
+    """
+    mac = mac.replace(":", "").replace("-", "").lower()
+    return ":".join(mac[i:i + 2] for i in range(0, len(mac), 2))
+
+def build_probe(local_ip: str, port: int):
+    """Build a Broadlink discovery probe.
+
+    Args:
+        local_ip: The local IPv4 address the replies should be sent to.
+        port: The local UDP port the replies should be sent to.
+
+    Returns:
+        bytes: The probe packet.
+    """
+    now = datetime.now().astimezone()
+    packet = bytearray(0x30)
+    packet[0x08:0x0C] = int(now.utcoffset().total_seconds() // 3600).to_bytes(4, "little", signed=True)
+    packet[0x0C:0x0E] = now.year.to_bytes(2, "little")
+    packet[0x0E] = now.minute
+    packet[0x0F] = now.hour
+    packet[0x10] = now.year % 100
+    packet[0x11] = now.isoweekday()
+    packet[0x12] = now.day
+    packet[0x13] = now.month
+    packet[0x18:0x1C] = socket.inet_aton(local_ip)[::-1]
+    packet[0x1C:0x1E] = port.to_bytes(2, "little")
+    packet[0x26] = 0x06
+    checksum = sum(packet, 0xBEAF) & 0xFFFF
+    packet[0x20:0x22] = checksum.to_bytes(2, "little")
+    return bytes(packet)
+
+def parse_response(data: bytes, host: str):
+    """Parse a Broadlink discovery reply.
+
+    Args:
+        data: The reply payload.
+        host: The address the reply came from.
+
+    Returns:
+        dict: The host, MAC and name of the device, or None if it is not a Hysen controller.
+    """
+    if len(data) < 0x40:
+        return None
+    devtype = int.from_bytes(data[0x34:0x36], "little")
+    if devtype not in HYSEN_DEVICE_TYPES:
+        return None
+    name = data[0x40:].split(b"\x00")[0].decode("utf-8", errors="ignore").strip()
+    return {
+        CONF_HOST: host,
+        CONF_MAC: format_mac(data[0x3A:0x40][::-1].hex()),
+        CONF_NAME: name or DEFAULT_NAME,
+    }
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Collect discovery replies into a shared dictionary keyed by MAC."""
+
+    def __init__(self, found: dict, wanted: str = None, found_wanted: asyncio.Event = None):
+        """Initialize the protocol.
+
+        Args:
+            found: Dictionary the discovered devices are added to.
+            wanted: Normalized MAC address of a device being searched for, if any.
+            found_wanted: Event set once the wanted device has replied.
+        """
+        self._found = found
+        self._wanted = wanted
+        self._found_wanted = found_wanted
+
+    def datagram_received(self, data, addr):
+        """Handle a discovery reply.
+
+        Args:
+            data: The reply payload.
+            addr: The (host, port) the reply came from.
+
+        Returns:
+            None
+        """
+        device = parse_response(data, addr[0])
+        if device is not None:
+            self._found[device[CONF_MAC]] = device
+            if device[CONF_MAC] == self._wanted:
+                self._found_wanted.set()
+
+async def _async_get_targets(hass: HomeAssistant):
+    """Return the local addresses and broadcast addresses of the enabled IPv4 subnets.
+
+    Args:
+        hass: The Home Assistant instance.
+
+    Returns:
+        list: (local address, broadcast address) tuples.
+    """
+    targets = []
+    for adapter in await network.async_get_adapters(hass):
+        if not adapter["enabled"]:
+            continue
+        for ip_info in adapter["ipv4"]:
+            interface = ipaddress.IPv4Interface(f"{ip_info['address']}/{ip_info['network_prefix']}")
+            if interface.ip.is_loopback:
+                continue
+            targets.append((str(interface.ip), str(interface.network.broadcast_address)))
+    return targets or [("0.0.0.0", "255.255.255.255")]
+
+async def async_discover_devices(hass: HomeAssistant, timeout: float = DEFAULT_DISCOVERY_TIMEOUT, mac: str = None):
+    """Discover Hysen controllers on all local subnets in parallel.
+
+    Args:
+        hass: The Home Assistant instance.
+        timeout: Seconds to wait for replies.
+        mac: MAC address of a device being searched for. The scan stops as soon as it replies.
+
+    Returns:
+        dict: Discovered devices keyed by normalized MAC address.
+    """
+    found = {}
+    wanted = format_mac(mac) if mac else None
+    found_wanted = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    async def _async_scan(local_ip, broadcast):
+        transport, _protocol = await loop.create_datagram_endpoint(
+            lambda: _DiscoveryProtocol(found, wanted, found_wanted),
+            local_addr=(local_ip, 0),
+            allow_broadcast=True,
+        )
+        try:
+            probe = build_probe(local_ip, transport.get_extra_info("sockname")[1])
+            for _ in range(DISCOVERY_PROBES):
+                # Repeat the probe, as broadcasts on Wi-Fi are easily lost
+                transport.sendto(probe, (broadcast, DISCOVERY_PORT))
+                try:
+                    await asyncio.wait_for(found_wanted.wait(), timeout / DISCOVERY_PROBES)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            transport.close()
+
+    targets = await _async_get_targets(hass)
+    results = await asyncio.gather(*(_async_scan(*target) for target in targets), return_exceptions=True)
+    for target, result in zip(targets, results):
+        if isinstance(result, Exception):
+            _LOGGER.debug("Discovery on %s failed: %s", target[0], result)
+    _LOGGER.debug("Discovered %d Hysen devices on %d subnets", len(found), len(targets))
+    return found
+
+async def async_find_device(hass: HomeAssistant, mac: str):
+    """Search the LAN for the current address of a single Hysen controller.
+
+    A fresh cached scan is used first; otherwise a targeted scan runs until the device replies.
+
+    Args:
+        hass: The Home Assistant instance.
+        mac: The MAC address of the device.
+
+    Returns:
+        dict: The host, MAC and name of the device, or None if it did not reply.
+    """
+    mac = format_mac(mac)
+    cached = hass.data.get(DATA_DISCOVERY_CACHE)
+    if cached is not None and time.monotonic() - cached[0] < DISCOVERY_CACHE_TTL and mac in cached[1]:
+        return cached[1][mac]
+    found = await async_discover_devices(hass, mac=mac)
+    return found.get(mac)
+
+async def async_get_discovered_devices(hass: HomeAssistant):
+    """Return the discovered Hysen controllers, scanning only if the cache is stale.
+
+    Args:
+        hass: The Home Assistant instance.
+
+    Returns:
+        dict: Discovered devices keyed by normalized MAC address.
+    """
+    cached = hass.data.get(DATA_DISCOVERY_CACHE)
+    if cached is not None and time.monotonic() - cached[0] < DISCOVERY_CACHE_TTL:
+        return cached[1]
+    found = await async_discover_devices(hass)
+    hass.data[DATA_DISCOVERY_CACHE] = (time.monotonic(), found)
+    return found
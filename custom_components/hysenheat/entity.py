@@ -2,8 +2,16 @@
 Base entity for Hysen Heating integration.
 """
 
+import asyncio
+from homeassistant.core import callback
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.entity import Entity
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_DEBOUNCE_WINDOW,
+    DEFAULT_DEBOUNCE_WINDOW,
+)
+from .coordinator import get_entry_setting
 
 class HysenEntity(Entity):
     """Base class for Hysen entities.
@@ -21,6 +29,9 @@ class HysenEntity(Entity):
         """
         super().__init__()
         self.coordinator = coordinator
+        self._command_sent = False
+        self._pending_value = None
+        self._debounce_seq = 0
         self._host = device_data["host"]
         self._mac = device_data["mac"]
         fwversion = coordinator.data.get("fwversion")
@@ -44,27 +55,108 @@ class HysenEntity(Entity):
         await super().async_added_to_hass()
         # Subscribe to coordinator updates
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self._async_write_coordinator_state)
         )
 
-    async def _async_try_command(self, error_msg, func, *args):
+    @callback
+    def _async_write_coordinator_state(self):
+        """Write the entity state after a coordinator update.
+
+        Returns:
+            None
+        """
+        with self.coordinator.profiler.section("entity.write_state"):
+            self.async_write_ha_state()
+
+    async def _async_try_command(self, error_msg, func, *args, unchanged_if=None):
         """Try to execute a command on the Hysen device.
 
+        Writes that would not change the device are skipped, together with the
+        refresh that follows them.
+
         Args:
             error_msg: The error message to log if the command fails.
             func: The function to execute.
             *args: Variable arguments to pass to the function.
+            unchanged_if: Data keys mapped to the values the command sets. If the fresh
+                coordinator data already holds them, the command is not sent.
 
         Returns:
-            bool: True if the command was successful, False otherwise.
+            bool: True if the command was successful or not needed, False otherwise.
         """
-        try:
-            await self.hass.async_add_executor_job(func, *args)
-            await self.coordinator.async_request_refresh()
+        tracer = self.coordinator.tracer
+        command = getattr(func, "__name__", repr(func))
+        if unchanged_if is not None and self.coordinator.matches_snapshot(unchanged_if):
+            self.coordinator.stats.writes_suppressed += 1
+            self.coordinator.logger.debug("[%s] Skipping %s, device already holds %s", self._host, command, unchanged_if)
             return True
-        except Exception as exc:
-            self.coordinator.logger.error("[%s] %s: %s", self._host, error_msg, exc)
-            return False
+        with tracer.span("command", host=self._host, command=command):
+            try:
+                await self.coordinator.async_send_command(func, *args)
+                self._command_sent = True
+                with tracer.span("request_refresh", host=self._host):
+                    await self.coordinator.async_request_refresh()
+                return True
+            except ServiceValidationError:
+                raise
+            except Exception as exc:
+                self.coordinator.logger.error("[%s] %s: %s", self._host, error_msg, exc)
+                return False
+
+    async def _async_debounced_write(self, value, write):
+        """Write a value once no newer value has been requested for the debounce window.
+
+        Values superseded within the window, as sent while dragging a slider, are
+        dropped. The requested value is shown until it has been written.
+
+        Args:
+            value: The requested value.
+            write: Coroutine function writing the value to the device.
+
+        Returns:
+            None
+        """
+        self._debounce_seq += 1
+        seq = self._debounce_seq
+        self._pending_value = value
+        self.async_write_ha_state()
+        window = get_entry_setting(self.coordinator.entry, CONF_DEBOUNCE_WINDOW, DEFAULT_DEBOUNCE_WINDOW)
+        if window:
+            with self.coordinator.tracer.span("debounce", host=self._host, window=window):
+                await asyncio.sleep(window)
+        if seq != self._debounce_seq:
+            self.coordinator.stats.writes_debounced += 1
+            return
+        try:
+            await write(value)
+        finally:
+            if seq == self._debounce_seq:
+                self._pending_value = None
+                self.async_write_ha_state()
+
+    async def _async_refresh_after_command(self, delay: float = 0):
+        """Refresh the coordinator and write the entity state after a successful command.
+
+        Nothing is done if every command since the last refresh was skipped as a no-op.
+
+        Args:
+            delay: Seconds to wait before refreshing, to allow the device to stabilize.
+
+        Returns:
+            None
+        """
+        if not self._command_sent:
+            return
+        self._command_sent = False
+        tracer = self.coordinator.tracer
+        if delay:
+            with tracer.span("settle", host=self._host, delay=delay):
+                await asyncio.sleep(delay)
+        with tracer.span("refresh", host=self._host):
+            # Force an immediate update to fetch the latest device state
+            await self.coordinator.async_refresh()
+        with tracer.span("state_write", host=self._host), self.coordinator.profiler.section("entity.write_state"):
+            self.async_write_ha_state()
 
     @property
     def available(self):
@@ -0,0 +1,106 @@
+"""
+Dedicated thread pool for Hysen Heating integration.
+
+Device calls block for up to the configured timeout when a thermostat is offline.
+Running them in a pool owned by the integration keeps a fleet of unreachable
+devices from exhausting Home Assistant's shared executor, and keeps busy
+recorder or file I/O from delaying the thermostats.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .const import (
+    DOMAIN,
+    EXECUTOR_MIN_WORKERS,
+    EXECUTOR_MAX_WORKERS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+def executor_size(devices: int):
+    """Return the number of worker threads for a fleet.
+
+    Each device runs at most one call at a time, so one worker per device is
+    enough, plus one spare for rebuilding a device transport.
+
+    Args:
+        devices: The number of configured devices.
+
+    Returns:
+        int: The number of workers, between EXECUTOR_MIN_WORKERS and EXECUTOR_MAX_WORKERS.
+    """
+    return max(EXECUTOR_MIN_WORKERS, min(EXECUTOR_MAX_WORKERS, devices + 1))
+
+class HysenExecutor:
+    """Bounded thread pool running the blocking calls of all Hysen devices."""
+
+    def __init__(self, devices: int):
+        """Initialize the pool.
+
+        Args:
+            devices: The number of configured devices the pool is sized for.
+        """
+        self.workers = executor_size(devices)
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix=f"{DOMAIN}_io")
+
+    def resize(self, devices: int):
+        """Grow the pool when devices are added.
+
+        A thread pool cannot be resized in place, so a larger one replaces it. Calls
+        already queued on the old pool still run before its threads exit.
+
+        Args:
+            devices: The number of configured devices.
+
+        Returns:
+            None
+        """
+        workers = executor_size(devices)
+        if workers <= self.workers:
+            return
+        old_pool = self._pool
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix=f"{DOMAIN}_io")
+        self.workers = workers
+        old_pool.shutdown(wait=False)
+        _LOGGER.debug("Resized the device thread pool to %d workers", workers)
+
+    async def async_run(self, func, *args, stats=None):
+        """Run a blocking call in the pool.
+
+        Args:
+            func: The blocking function to call.
+            *args: Variable arguments to pass to the function.
+            stats: The HysenDeviceStats recording the time the call waited for a worker.
+
+        Returns:
+            Any: The value returned by the function.
+        """
+        submitted = time.perf_counter()
+        started = []
+
+        def _run():
+            started.append(time.perf_counter())
+            return func(*args)
+
+        if stats is not None:
+            stats.executor_in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, _run)
+        finally:
+            if stats is not None:
+                stats.executor_in_flight -= 1
+                if started:
+                    stats.executor_wait.observe(started[0] - submitted)
+
+    def shutdown(self):
+        """Shut the pool down without waiting for running calls.
+
+        Calls that have not started yet are cancelled.
+
+        Returns:
+            None
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        _LOGGER.debug("Shut down the device thread pool")
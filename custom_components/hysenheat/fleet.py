@@ -0,0 +1,242 @@
+"""
+Fleet health monitor for Hysen Heating integration.
+
+When the Home Assistant host loses its network or the access point reboots,
+every device fails at once. Instead of each coordinator waiting out its full
+timeout on every poll, the monitor recognizes failures correlated across the
+fleet, pauses polling and probes a single canary device until one answers.
+Polling then resumes device by device, so the recovered network is not hit by
+the whole fleet at once.
+"""
+
+import asyncio
+import logging
+import time
+from homeassistant.core import HomeAssistant
+from .const import (
+    DOMAIN,
+    DATA_FLEET,
+    FLEET_OUTAGE_MIN_DEVICES,
+    FLEET_OUTAGE_RATIO,
+    FLEET_OUTAGE_WINDOW,
+    FLEET_CANARY_INTERVAL,
+    FLEET_RESUME_STAGGER,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+class HysenFleetMonitor:
+    """Pause the polling of all devices while the network is down.
+
+    An outage is declared when at least FLEET_OUTAGE_RATIO of the devices are
+    failing, and at least FLEET_OUTAGE_MIN_DEVICES of them started failing within
+    the last FLEET_OUTAGE_WINDOW seconds, so a few devices that are simply
+    unplugged never pause the others.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the monitor.
+
+        Args:
+            hass: The Home Assistant instance.
+        """
+        self._hass = hass
+        self._coordinators = []
+        self._failing = {}
+        self._resuming = set()
+        self._canary_index = 0
+        self._probing = False
+        self._tasks = set()
+        self.canary = None
+        self.outage = False
+        self.outages = 0
+
+    def register(self, coordinator):
+        """Start watching a device.
+
+        Args:
+            coordinator: The HysenCoordinator of the device.
+
+        Returns:
+            None
+        """
+        self._coordinators.append(coordinator)
+
+    def unregister(self, coordinator):
+        """Stop watching an unloaded device.
+
+        Args:
+            coordinator: The HysenCoordinator of the device.
+
+        Returns:
+            None
+        """
+        if coordinator in self._coordinators:
+            self._coordinators.remove(coordinator)
+        self._failing.pop(coordinator, None)
+        self._resuming.discard(coordinator)
+        if self.canary is coordinator:
+            self.canary = None
+        if not self._coordinators:
+            self.stop()
+
+    def paused(self, coordinator):
+        """Return True if a device must not be polled now.
+
+        Args:
+            coordinator: The HysenCoordinator of the device.
+
+        Returns:
+            bool: True during an outage, except for the canary, and while the
+                device waits for its turn to resume.
+        """
+        if self.outage:
+            return coordinator is not self.canary
+        return coordinator in self._resuming
+
+    def report(self, coordinator, success: bool):
+        """Record the outcome of a poll that reached the device.
+
+        Args:
+            coordinator: The HysenCoordinator of the device.
+            success: True if the poll returned data.
+
+        Returns:
+            None
+        """
+        if success:
+            self._failing.pop(coordinator, None)
+            if self.outage:
+                _LOGGER.warning("%s answered again, resuming polling", coordinator.host)
+                self._end_outage(coordinator)
+            return
+        self._failing.setdefault(coordinator, time.monotonic())
+        if not self.outage and self._correlated():
+            self._start_outage()
+
+    def _correlated(self):
+        """Return True if the failing devices point at a network outage.
+
+        Returns:
+            bool: True if enough devices are failing and enough of them started
+                failing recently.
+        """
+        total = len(self._coordinators)
+        if total < FLEET_OUTAGE_MIN_DEVICES or len(self._failing) < total * FLEET_OUTAGE_RATIO:
+            return False
+        now = time.monotonic()
+        recent = sum(1 for started in self._failing.values() if now - started <= FLEET_OUTAGE_WINDOW)
+        return recent >= FLEET_OUTAGE_MIN_DEVICES
+
+    def _start_outage(self):
+        """Pause polling and start probing the canary.
+
+        Returns:
+            None
+        """
+        self.outage = True
+        self.outages += 1
+        # A resume in progress skips the devices it has not reached yet
+        self._resuming = set()
+        _LOGGER.warning(
+            "%d of %d devices are failing, pausing polling and probing one device every %s s until the network is back",
+            len(self._failing), len(self._coordinators), FLEET_CANARY_INTERVAL,
+        )
+        if not self._probing:
+            self._probing = True
+            self._start_task(self._async_probe(), f"{DOMAIN}_fleet_canary")
+
+    def _end_outage(self, recovered=None):
+        """End an outage and resume the paused devices one after the other.
+
+        Args:
+            recovered: The HysenCoordinator of the device that answered, already polled.
+
+        Returns:
+            None
+        """
+        self.outage = False
+        self.canary = None
+        self._failing = {}
+        order = [coordinator for coordinator in self._coordinators if coordinator is not recovered]
+        self._resuming = set(order)
+        if order:
+            self._start_task(self._async_resume(order), f"{DOMAIN}_fleet_resume")
+
+    def _start_task(self, coro, name: str):
+        """Run a coroutine in the background until it ends or the monitor stops.
+
+        Args:
+            coro: The coroutine to run.
+            name: The name of the task.
+
+        Returns:
+            None
+        """
+        task = self._hass.async_create_background_task(coro, name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_probe(self):
+        """Poll one device at a time, rotating through the fleet, until one answers.
+
+        The probe stops on its own once the outage is over, so a poll in progress
+        is never cancelled.
+
+        Returns:
+            None
+        """
+        try:
+            while self.outage and self._coordinators:
+                await asyncio.sleep(FLEET_CANARY_INTERVAL)
+                if not self.outage or not self._coordinators:
+                    return
+                self._canary_index = (self._canary_index + 1) % len(self._coordinators)
+                self.canary = self._coordinators[self._canary_index]
+                _LOGGER.debug("Probing %s to detect the end of the outage", self.canary.host)
+                await self.canary.async_refresh()
+        finally:
+            self._probing = False
+
+    async def _async_resume(self, order: list):
+        """Poll the paused devices one after the other.
+
+        Args:
+            order: The HysenCoordinators to resume, in order.
+
+        Returns:
+            None
+        """
+        for coordinator in order:
+            await asyncio.sleep(FLEET_RESUME_STAGGER)
+            if coordinator not in self._resuming:
+                continue
+            self._resuming.discard(coordinator)
+            await coordinator.async_refresh()
+
+    def stop(self):
+        """Stop probing and resuming.
+
+        Returns:
+            None
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks = set()
+        self._probing = False
+        self.outage = False
+        self._resuming = set()
+
+def get_fleet_monitor(hass: HomeAssistant):
+    """Return the integration's fleet monitor, creating it if needed.
+
+    Args:
+        hass: The Home Assistant instance.
+
+    Returns:
+        HysenFleetMonitor: The monitor shared by all devices.
+    """
+    monitor = hass.data.get(DATA_FLEET)
+    if monitor is None:
+        monitor = hass.data[DATA_FLEET] = HysenFleetMonitor(hass)
+    return monitor
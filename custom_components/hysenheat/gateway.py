@@ -0,0 +1,277 @@
+"""
+Out-of-process device gateway for Hysen Heating integration.
+
+When enabled, the device objects live in a separate worker process that does all
+network I/O, authentication, encryption and status decoding. Home Assistant
+sends it calls over a pipe and receives results and decoded snapshots back, so a
+crash or hang in the vendor library cannot stall the event loop process.
+"""
+
+import asyncio
+import functools
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from .const import (
+    DOMAIN,
+    DATA_GATEWAY,
+    GATEWAY_WORKERS,
+    GATEWAY_CALL_ATTEMPTS,
+    GATEWAY_START_GRACE,
+)
+from .device import create_device, configure_device, call_with_reauth, export_session
+
+_LOGGER = logging.getLogger(__name__)
+
+def describe_call(func):
+    """Describe a device call so that it can be replayed in the worker process.
+
+    Args:
+        func: A bound method of a device, or a functools.partial of a module-level
+            function taking the device as its first argument.
+
+    Returns:
+        tuple: The method name or function, and the arguments bound to the call.
+    """
+    if isinstance(func, functools.partial):
+        return func.func, func.args[1:]
+    return func.__name__, ()
+
+def _run_call(devices: dict, host: str, mac: str, timeout: int, session: dict, target, args: tuple):
+    """Run a device call in the worker process (blocking).
+
+    Device objects are kept between calls, so the session negotiated by the worker
+    is reused. The device is rebuilt if the host changed.
+
+    Args:
+        devices: The worker's device objects keyed by MAC address.
+        host: The host address of the device.
+        mac: The MAC address of the device.
+        timeout: The network timeout in seconds.
+        session: The last known session, used when the device object is created.
+        target: The name of a device method, or a function taking the device first.
+        args: Variable arguments to pass to the call.
+
+    Returns:
+        tuple: The value returned by the call and the device's current session.
+    """
+    device = devices.get(mac)
+    if device is None or device.host[0] != host:
+        device = devices[mac] = create_device(host, mac, timeout, session)
+    configure_device(device, timeout)
+    if isinstance(target, str):
+        func = getattr(device, target)
+    else:
+        func = functools.partial(target, device)
+    return call_with_reauth(device, func, *args), export_session(device)
+
+def _gateway_main(conn, workers: int):
+    """Serve device calls received over the pipe until it is closed.
+
+    Runs in the worker process. Calls for different devices run in parallel; the
+    scheduler on the Home Assistant side sends one call per device at a time.
+
+    Args:
+        conn: The worker's end of the pipe.
+        workers: The number of threads serving calls.
+
+    Returns:
+        None
+    """
+    devices = {}
+    send_lock = threading.Lock()
+
+    def _serve(request_id, call):
+        try:
+            response = (request_id, True, _run_call(devices, *call))
+        except Exception as exc:
+            response = (request_id, False, exc)
+        with send_lock:
+            try:
+                conn.send(response)
+            except Exception:
+                # The error could not be pickled, so send its description instead
+                conn.send((request_id, False, RuntimeError(repr(response[2]))))
+
+    with ThreadPoolExecutor(workers) as pool:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+            pool.submit(_serve, *request)
+
+class HysenGateway:
+    """Run device calls in a worker process and wait for their results."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the gateway. The worker process is started on the first call.
+
+        Args:
+            hass: The Home Assistant instance.
+        """
+        self._hass = hass
+        self._process = None
+        self._conn = None
+        self._pending = {}
+        self._request_ids = itertools.count()
+        self._last_reply = None
+        self.restarts = 0
+
+    def _start(self):
+        """Start the worker process and listen for its responses.
+
+        Returns:
+            None
+        """
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_gateway_main, args=(child_conn, GATEWAY_WORKERS), name=f"{DOMAIN}_gateway", daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._last_reply = time.monotonic()
+        self._hass.loop.add_reader(self._conn.fileno(), self._read_responses)
+        _LOGGER.debug("Started device gateway process %s", self._process.pid)
+
+    def _read_responses(self):
+        """Resolve the calls answered by the worker process.
+
+        Returns:
+            None
+        """
+        try:
+            while self._conn.poll():
+                request_id, success, result = self._conn.recv()
+                self._last_reply = time.monotonic()
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if success:
+                    future.set_result(result)
+                else:
+                    future.set_exception(result)
+        except (EOFError, OSError) as exc:
+            self._restart(f"worker process exited: {exc!r}")
+
+    def _restart(self, reason: str):
+        """Stop a crashed or hung worker process and fail its pending calls.
+
+        A new process is started by the next call.
+
+        Args:
+            reason: Why the worker is restarted, for logging and the errors.
+
+        Returns:
+            None
+        """
+        if self._process is None:
+            return
+        _LOGGER.warning("Restarting the device gateway, %s", reason)
+        self.restarts += 1
+        self._stop_process().terminate()
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(HomeAssistantError(f"Device gateway failed: {reason}"))
+
+    def _stop_process(self):
+        """Stop listening to the worker process and ask it to exit.
+
+        Returns:
+            multiprocessing.Process: The worker process, which may still be running.
+        """
+        process = self._process
+        self._hass.loop.remove_reader(self._conn.fileno())
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._conn.close()
+        self._process = None
+        self._conn = None
+        return process
+
+    async def async_call(self, host: str, mac: str, timeout: int, session: dict, func, *args):
+        """Run a device call in the worker process.
+
+        Only a call that times out fails, unless the worker process died or sent
+        no reply at all since the call was sent. The worker is then restarted and
+        the calls of every device waiting on it fail.
+
+        Args:
+            host: The host address of the device.
+            mac: The MAC address of the device.
+            timeout: The network timeout in seconds.
+            session: The last known session of the device.
+            func: A bound method of the local device object, or a functools.partial
+                of a module-level function taking the device first.
+            *args: Variable arguments to pass to the call.
+
+        Returns:
+            tuple: The value returned by the call and the device's current session.
+
+        Raises:
+            HomeAssistantError: If the worker crashes or does not answer in time.
+            Exception: Any error raised by the call in the worker.
+        """
+        target, bound_args = describe_call(func)
+        if self._process is None:
+            self._start()
+        request_id = next(self._request_ids)
+        future = self._hass.loop.create_future()
+        self._pending[request_id] = future
+        sent = time.monotonic()
+        self._conn.send((request_id, (host, mac, timeout, session, target, bound_args + args)))
+        # A call may re-authenticate and retry, each step bounded by the timeout
+        deadline = timeout * GATEWAY_CALL_ATTEMPTS + GATEWAY_START_GRACE
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), deadline)
+        except asyncio.TimeoutError as exc:
+            if self._process is not None and (not self._process.is_alive() or self._last_reply < sent):
+                self._restart(f"no answer from the worker process within {deadline} s")
+            else:
+                _LOGGER.warning("No answer from %s through the device gateway within %s s", host, deadline)
+            raise HomeAssistantError(f"Device gateway did not answer for {host}") from exc
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def async_stop(self):
+        """Stop the worker process.
+
+        Returns:
+            None
+        """
+        if self._process is None:
+            return
+        process = self._stop_process()
+        await self._hass.async_add_executor_job(process.join, GATEWAY_START_GRACE)
+        if process.is_alive():
+            process.terminate()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(HomeAssistantError("Device gateway stopped"))
+        self._pending = {}
+        _LOGGER.debug("Stopped device gateway process")
+
+def get_gateway(hass: HomeAssistant):
+    """Return the integration's device gateway, creating it if needed.
+
+    Args:
+        hass: The Home Assistant instance.
+
+    Returns:
+        HysenGateway: The gateway shared by all devices using it.
+    """
+    gateway = hass.data.get(DATA_GATEWAY)
+    if gateway is None:
+        gateway = hass.data[DATA_GATEWAY] = HysenGateway(hass)
+    return gateway
@@ -0,0 +1,141 @@
+"""
+Round-trip time tracking and hedged status reads for Hysen Heating integration.
+
+A lost UDP packet is only resent after TRANSPORT_RETRY_INTERVAL, even though
+the thermostats normally answer within tens of milliseconds. Status reads are
+idempotent, so when no reply arrives within the device's recent 95th percentile
+round-trip time, the request is sent again right away and the first valid reply
+wins. A retry budget earned by ordinary requests bounds how often this happens,
+so hedging cannot multiply the load on a struggling device.
+
+The same round-trip times feed a smoothed estimate from which the device's
+timeout is derived, so a well-connected device fails fast and a poorly connected
+one keeps up to the configured timeout.
+"""
+
+import collections
+from .const import (
+    TRANSPORT_RETRY_INTERVAL,
+    RTT_ALPHA,
+    RTT_BETA,
+    RTT_MIN_RTO,
+    ADAPTIVE_TIMEOUT_ATTEMPTS,
+    HEDGE_RTT_SAMPLES,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_MIN_DELAY,
+    HEDGE_BUDGET_RATIO,
+    HEDGE_BUDGET_MAX,
+)
+
+class HysenRttEstimator:
+    """Smoothed round-trip time and variation of one device, computed as TCP does (RFC 6298)."""
+
+    def __init__(self):
+        """Initialize the estimator without samples."""
+        self.srtt = None
+        self.rttvar = None
+
+    def observe(self, rtt: float):
+        """Fold a round-trip time into the estimate.
+
+        Args:
+            rtt: The seconds between sending a request and receiving its reply.
+
+        Returns:
+            None
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - RTT_BETA) * self.rttvar + RTT_BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - RTT_ALPHA) * self.srtt + RTT_ALPHA * rtt
+
+    def timeout(self, configured: float):
+        """Return the timeout of a device call.
+
+        The device gets ADAPTIVE_TIMEOUT_ATTEMPTS sends, TRANSPORT_RETRY_INTERVAL
+        apart, and the last one is given the retransmission timeout to be answered.
+
+        Args:
+            configured: The timeout set for the device, used as the upper bound.
+
+        Returns:
+            float: The timeout in seconds, the configured one until a round-trip
+                time has been measured.
+        """
+        if self.srtt is None:
+            return configured
+        rto = max(RTT_MIN_RTO, self.srtt + 4 * self.rttvar)
+        return min(configured, (ADAPTIVE_TIMEOUT_ATTEMPTS - 1) * TRANSPORT_RETRY_INTERVAL + rto)
+
+class HysenHedger:
+    """Track a device's round-trip times and decide when a read is hedged.
+
+    Each request earns HEDGE_BUDGET_RATIO of a hedge, up to HEDGE_BUDGET_MAX, and
+    each hedge spends one, so at most about one read in ten is sent twice.
+    """
+
+    def __init__(self, stats, estimator: HysenRttEstimator):
+        """Initialize the hedger.
+
+        Args:
+            stats: The HysenDeviceStats counting hedged reads.
+            estimator: The HysenRttEstimator of the device, fed the measured round-trip times.
+        """
+        self._stats = stats
+        self._estimator = estimator
+        self._samples = collections.deque(maxlen=HEDGE_RTT_SAMPLES)
+        self._budget = HEDGE_BUDGET_MAX
+        self.enabled = True
+
+    @property
+    def p95(self):
+        """Return the 95th percentile of the recent round-trip times.
+
+        Returns:
+            float: The round-trip time in seconds, or None without enough samples.
+        """
+        if len(self._samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def observe(self, rtt: float):
+        """Record the round-trip time of a request that was answered at its first send.
+
+        Args:
+            rtt: The seconds between sending the request and receiving its reply.
+
+        Returns:
+            None
+        """
+        self._samples.append(rtt)
+        self._estimator.observe(rtt)
+
+    def begin(self):
+        """Start a read, earning its share of the budget.
+
+        Returns:
+            float: The seconds after which the read is hedged, or None if it is not
+                hedged because hedging is disabled, the round-trip time is unknown
+                or no budget is left.
+        """
+        self._budget = min(HEDGE_BUDGET_MAX, self._budget + HEDGE_BUDGET_RATIO)
+        p95 = self.p95
+        if not self.enabled or p95 is None or self._budget < 1:
+            return None
+        delay = max(HEDGE_MIN_DELAY, p95)
+        return delay if delay < TRANSPORT_RETRY_INTERVAL else None
+
+    def try_hedge(self):
+        """Spend one hedge from the budget.
+
+        Returns:
+            bool: True if the read may be sent again now.
+        """
+        if self._budget < 1:
+            return False
+        self._budget -= 1
+        self._stats.reads_hedged += 1
+        return True
@@ -0,0 +1,224 @@
+"""
+Device I/O statistics for Hysen Heating integration.
+
+This module keeps per-device counters and latency histograms in memory and
+renders them in the Prometheus text exposition format through an HTTP view.
+"""
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.helpers.http import KEY_HASS
+from .const import (
+    DOMAIN,
+    METRICS_URL,
+    METRICS_LATENCY_BUCKETS,
+)
+
+class HysenHistogram:
+    """Cumulative latency histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS):
+        """Initialize the histogram.
+
+        Args:
+            buckets: Sorted upper bounds of the buckets, in seconds.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record a single observation.
+
+        Args:
+            value: The observed latency in seconds.
+
+        Returns:
+            None
+        """
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+class HysenDeviceStats:
+    """In-memory I/O statistics of a single Hysen device.
+
+    Updated by the coordinator on every poll and command, and read by the
+    metrics view without touching the device.
+    """
+
+    def __init__(self):
+        """Initialize the statistics with zeroed counters."""
+        self.polls = 0
+        self.poll_failures = 0
+        self.polls_unchanged = 0
+        self.commands = 0
+        self.command_failures = 0
+        self.commands_in_flight = 0
+        self.consecutive_failures = 0
+        self.writes_suppressed = 0
+        self.writes_debounced = 0
+        self.writes_delayed = 0
+        self.writes_throttled = 0
+        self.polls_superseded = 0
+        self.polls_paused = 0
+        self.reads_hedged = 0
+        self.transition_refreshes = 0
+        self.executor_in_flight = 0
+        self.poll_latency = HysenHistogram()
+        self.command_latency = HysenHistogram()
+        self.executor_wait = HysenHistogram()
+
+    def record_poll(self, duration: float, success: bool, unchanged: bool = False):
+        """Record the outcome of a status poll.
+
+        Args:
+            duration: Time spent polling the device, in seconds.
+            success: True if the poll returned data.
+            unchanged: True if the returned data equals the previous snapshot.
+
+        Returns:
+            None
+        """
+        self.polls += 1
+        self.poll_latency.observe(duration)
+        if success:
+            self.consecutive_failures = 0
+            if unchanged:
+                self.polls_unchanged += 1
+        else:
+            self.poll_failures += 1
+            self.consecutive_failures += 1
+
+    def record_command(self, duration: float, success: bool):
+        """Record the outcome of a device command.
+
+        Args:
+            duration: Time spent executing the command, in seconds.
+            success: True if the command completed without error.
+
+        Returns:
+            None
+        """
+        self.commands += 1
+        self.command_latency.observe(duration)
+        if not success:
+            self.command_failures += 1
+
+    @property
+    def unchanged_ratio(self):
+        """Return the share of successful polls that returned unchanged data.
+
+        Returns:
+            float: The ratio between 0 and 1.
+        """
+        successful = self.polls - self.poll_failures
+        return self.polls_unchanged / successful if successful else 0.0
+
+def _format_labels(labels: dict):
+    """Format a label set in exposition format.
+
+    Args:
+        labels: Label names mapped to their values.
+
+    Returns:
+        str: The labels enclosed in braces.
+    """
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+def render_metrics(devices):
+    """Render the statistics of all devices in Prometheus text exposition format.
+
+    Args:
+        devices: Iterable of device data dictionaries (mac, name, host, coordinator).
+
+    Returns:
+        str: The metrics document.
+    """
+    scalars = {
+        "polls_total": ("counter", "Number of status polls.", lambda c: c.stats.polls),
+        "poll_failures_total": ("counter", "Number of failed status polls.", lambda c: c.stats.poll_failures),
+        "polls_unchanged_total": ("counter", "Number of polls that returned unchanged data.", lambda c: c.stats.polls_unchanged),
+        "poll_unchanged_ratio": ("gauge", "Share of successful polls that returned unchanged data.", lambda c: c.stats.unchanged_ratio),
+        "commands_total": ("counter", "Number of commands sent to the device.", lambda c: c.stats.commands),
+        "command_failures_total": ("counter", "Number of failed commands.", lambda c: c.stats.command_failures),
+        "writes_suppressed_total": ("counter", "Number of writes skipped because the device already held the value.", lambda c: c.stats.writes_suppressed),
+        "writes_debounced_total": ("counter", "Number of writes dropped because a newer value followed within the debounce window.", lambda c: c.stats.writes_debounced),
+        "writes_delayed_total": ("counter", "Number of writes delayed by the rate limiter.", lambda c: c.stats.writes_delayed),
+        "writes_throttled_total": ("counter", "Number of writes refused by the rate limiter.", lambda c: c.stats.writes_throttled),
+        "polls_superseded_total": ("counter", "Number of queued polls answered by a command's read-back.", lambda c: c.stats.polls_superseded),
+        "polls_paused_total": ("counter", "Number of polls skipped during a network outage.", lambda c: c.stats.polls_paused),
+        "polling_paused": ("gauge", "1 if polling is paused by a network outage, 0 otherwise.", lambda c: int(c.fleet.paused(c))),
+        "reads_hedged_total": ("counter", "Number of status reads sent again before their first copy was answered.", lambda c: c.stats.reads_hedged),
+        "transition_refreshes_total": ("counter", "Number of status reads made right after a schedule slot started.", lambda c: c.stats.transition_refreshes),
+        "polling_relaxed": ("gauge", "1 if the poll interval is relaxed between schedule transitions, 0 otherwise.", lambda c: int(c.polling_relaxed)),
+        "hedge_delay_seconds": ("gauge", "Recent 95th percentile round-trip time after which status reads are hedged.", lambda c: c.hedger.p95 or 0),
+        "rtt_smoothed_seconds": ("gauge", "Smoothed round-trip time of status reads.", lambda c: c.rtt.srtt or 0),
+        "effective_timeout_seconds": ("gauge", "Timeout applied to device calls, derived from the round-trip time.", lambda c: c.effective_timeout),
+        "scheduler_queue_depth": ("gauge", "Number of requests waiting for the device.", lambda c: c.scheduler.depth),
+        "executor_in_flight": ("gauge", "Number of device calls queued on or running in the integration's thread pool.", lambda c: c.stats.executor_in_flight),
+        "commands_in_flight": ("gauge", "Number of commands waiting for or using the device.", lambda c: c.stats.commands_in_flight),
+        "consecutive_failures": ("gauge", "Number of consecutive failed polls.", lambda c: c.stats.consecutive_failures),
+        "circuit_open": ("gauge", "1 if the device is considered offline after repeated failures, 0 otherwise.", lambda c: int(c.circuit_open)),
+        "available": ("gauge", "1 if the last poll succeeded, 0 otherwise.", lambda c: int(c.last_update_success)),
+        "clock_drift_seconds": ("gauge", "Seconds the device clock is ahead of local time.", lambda c: c.clock_drift or 0),
+    }
+    histograms = {
+        "poll_latency_seconds": ("Status poll latency.", lambda c: c.stats.poll_latency),
+        "command_latency_seconds": ("Command latency.", lambda c: c.stats.command_latency),
+        "executor_queue_wait_seconds": ("Time device calls waited for a thread pool worker.", lambda c: c.stats.executor_wait),
+    }
+    devices = [
+        ({"mac": data["mac"], "name": data["name"], "host": data["coordinator"].host}, data["coordinator"])
+        for data in devices
+    ]
+    lines = []
+    for metric, (metric_type, description, getter) in scalars.items():
+        lines.append(f"# HELP {DOMAIN}_{metric} {description}")
+        lines.append(f"# TYPE {DOMAIN}_{metric} {metric_type}")
+        for labels, coordinator in devices:
+            lines.append(f"{DOMAIN}_{metric}{_format_labels(labels)} {getter(coordinator)}")
+    for metric, (description, getter) in histograms.items():
+        lines.append(f"# HELP {DOMAIN}_{metric} {description}")
+        lines.append(f"# TYPE {DOMAIN}_{metric} histogram")
+        for labels, coordinator in devices:
+            histogram = getter(coordinator)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{DOMAIN}_{metric}_bucket{_format_labels({**labels, 'le': bound})} {cumulative}")
+            lines.append(f"{DOMAIN}_{metric}_bucket{_format_labels({**labels, 'le': '+Inf'})} {histogram.count}")
+            lines.append(f"{DOMAIN}_{metric}_sum{_format_labels(labels)} {histogram.sum}")
+            lines.append(f"{DOMAIN}_{metric}_count{_format_labels(labels)} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+class HysenMetricsView(HomeAssistantView):
+    """Expose Hysen device statistics to Prometheus.
+
+    Reads the in-memory counters only, so the scrape cost does not depend on device I/O.
+    """
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    async def get(self, request):
+        """Handle a metrics scrape.
+
+        Args:
+            request: The aiohttp request.
+
+        Returns:
+            web.Response: The metrics document in text exposition format.
+        """
+        hass = request.app[KEY_HASS]
+        body = render_metrics(hass.data.get(DOMAIN, {}).values())
+        return web.Response(text=body, content_type="text/plain", charset="utf-8")
@@ -5,7 +5,6 @@ This module provides number entities for setting calibration, dynamic max/min te
 """
 
 import logging
-import asyncio
 import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ServiceValidationError
@@ -69,6 +68,7 @@ from .const import (
     MODE_HASS_TO_HYSEN,
 )
 from .entity import HysenEntity
+from .trace import traced
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -188,9 +188,23 @@ class HysenHysteresisNumber(HysenEntity, NumberEntity):
         Returns:
             float: The current hysteresis.
         """
+        if self._pending_value is not None:
+            return self._pending_value
         return self.coordinator.data.get(DATA_KEY_HYSTERESIS)
 
+    @traced("number.set_native_value")
     async def async_set_native_value(self, value: float):
+        """Set the value, writing only the last of several quick changes.
+
+        Args:
+            value: The value to set.
+
+        Returns:
+            None
+        """
+        await self._async_debounced_write(value, self._async_write_native_value)
+
+    async def _async_write_native_value(self, value: float):
         """Set the hysteresis value.
 
         Args:
@@ -204,11 +218,10 @@ class HysenHysteresisNumber(HysenEntity, NumberEntity):
             "Error in set_hysteresis",
             self.coordinator.device.set_hysteresis,
             value,
+            unchanged_if={DATA_KEY_HYSTERESIS: value},
         )
         if success:
-            await asyncio.sleep(0.2)
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
     async def async_set_hysteresis(self, hysteresis):
         """Set the hysteresis value (for service calls).
@@ -264,9 +277,23 @@ class HysenMaxTempNumber(HysenEntity, NumberEntity):
         Returns:
             int: The current max temperature.
         """
+        if self._pending_value is not None:
+            return self._pending_value
         return self.coordinator.data.get(DATA_KEY_MAX_TEMP)
 
+    @traced("number.set_native_value")
     async def async_set_native_value(self, value: float):
+        """Set the value, writing only the last of several quick changes.
+
+        Args:
+            value: The value to set.
+
+        Returns:
+            None
+        """
+        await self._async_debounced_write(value, self._async_write_native_value)
+
+    async def _async_write_native_value(self, value: float):
         """Set the max temperature value.
 
         Args:
@@ -309,11 +336,10 @@ class HysenMaxTempNumber(HysenEntity, NumberEntity):
             "Error in set_max_temp",
             self.coordinator.device.set_max_temp,
             int(value),
+            unchanged_if={DATA_KEY_MAX_TEMP: int(value)},
         )
         if success:
-            await asyncio.sleep(0.2)
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
     async def async_set_max_temp(self, max_temp):
         """Set the max temperature value (for service calls).
@@ -378,9 +404,23 @@ class HysenMinTempNumber(HysenEntity, NumberEntity):
         Returns:
             int: The current min temperature.
         """
+        if self._pending_value is not None:
+            return self._pending_value
         return self.coordinator.data.get(DATA_KEY_MIN_TEMP)
 
+    @traced("number.set_native_value")
     async def async_set_native_value(self, value: float):
+        """Set the value, writing only the last of several quick changes.
+
+        Args:
+            value: The value to set.
+
+        Returns:
+            None
+        """
+        await self._async_debounced_write(value, self._async_write_native_value)
+
+    async def _async_write_native_value(self, value: float):
         """Set the min temperature value.
 
         Args:
@@ -423,11 +463,10 @@ class HysenMinTempNumber(HysenEntity, NumberEntity):
             "Error in set_min_temp",
             self.coordinator.device.set_min_temp,
             int(value),
+            unchanged_if={DATA_KEY_MIN_TEMP: int(value)},
         )
         if success:
-            await asyncio.sleep(0.2)
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
     async def async_set_min_temp(self, min_temp):
         """Set the min temperature value (for service calls).
@@ -474,9 +513,23 @@ class HysenCalibrationNumber(HysenEntity, NumberEntity):
         Returns:
             float: The current calibration.
         """
+        if self._pending_value is not None:
+            return self._pending_value
         return self.coordinator.data.get(DATA_KEY_CALIBRATION)
 
+    @traced("number.set_native_value")
     async def async_set_native_value(self, value: float):
+        """Set the value, writing only the last of several quick changes.
+
+        Args:
+            value: The value to set.
+
+        Returns:
+            None
+        """
+        await self._async_debounced_write(value, self._async_write_native_value)
+
+    async def _async_write_native_value(self, value: float):
         """Set the calibration value.
 
         Args:
@@ -490,11 +543,10 @@ class HysenCalibrationNumber(HysenEntity, NumberEntity):
             "Error in set_calibration",
             self.coordinator.device.set_calibration,
             value,
+            unchanged_if={DATA_KEY_CALIBRATION: value},
         )
         if success:
-            await asyncio.sleep(0.2)
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
     async def async_set_calibration(self, calibration):
         """Set the calibration value (for service calls).
@@ -545,13 +597,27 @@ class HysenSlotTempNumber(HysenEntity, NumberEntity):
         Returns:
             float: The current slot temperature, or None if unavailable.
         """
+        if self._pending_value is not None:
+            return self._pending_value
         value = self.coordinator.data.get(self._data_key)
         if value is None:
             _LOGGER.debug("[%s] No temperature value for %s", self._host, self._data_key)
             return None
         return float(value)
 
+    @traced("number.set_native_value")
     async def async_set_native_value(self, value: float):
+        """Set the value, writing only the last of several quick changes.
+
+        Args:
+            value: The value to set.
+
+        Returns:
+            None
+        """
+        await self._async_debounced_write(value, self._async_write_native_value)
+
+    async def _async_write_native_value(self, value: float):
         """Set the slot temperature value.
 
         Args:
@@ -570,18 +636,18 @@ class HysenSlotTempNumber(HysenEntity, NumberEntity):
             None,
             None,
             value,
+            unchanged_if={self._data_key: value},
         )
         if success:
             self.coordinator.data[self._data_key] = value
-            if operation_mode == HVACMode.AUTO and temporary_manual == STATE_OFF:
+            # Re-apply the schedule only if the slot was actually written
+            if operation_mode == HVACMode.AUTO and temporary_manual == STATE_OFF and self._command_sent:
                 await self._async_try_command(
                     "Error in set_operation_mode",
                     self.coordinator.device.set_operation_mode,
                     MODE_HASS_TO_HYSEN[operation_mode],
                 )
-            await asyncio.sleep(0.2)
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
     async def async_set_slot1_temp(self, slot1_temp: float):
         """Set the slot 1 temperature value (for service calls).
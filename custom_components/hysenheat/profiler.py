@@ -0,0 +1,223 @@
+"""
+Built-in profiler for Hysen Heating integration hot paths.
+
+This module profiles the integration's executor jobs with cProfile and times its
+coroutine hot paths for a bounded window, then writes the results to the config directory.
+"""
+
+import cProfile
+import functools
+import io
+import logging
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+class HysenProfiler:
+    """Profile the integration's hot paths for a bounded window.
+
+    Executor jobs (device I/O and decoding) run under a deterministic cProfile
+    profiler each, merged into one set of statistics. Since Python 3.12 only one
+    profiler can be active in the process, so a job that starts while another is
+    profiled, or while another profiling tool is running, runs unprofiled and is
+    counted instead. Coroutine sections on the
+    event loop (polls, entity state writes, service handlers) are timed by name,
+    so that other integrations sharing the loop do not pollute the results.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the profiler.
+
+        Args:
+            hass: The Home Assistant instance.
+        """
+        self._hass = hass
+        self._lock = threading.Lock()
+        self._profile_lock = threading.Lock()
+        self._stats = None
+        self._unprofiled = 0
+        self._sections = {}
+        self._started = None
+        self._unsub_stop = None
+
+    @property
+    def active(self):
+        """Return True if a profiling window is running.
+
+        Returns:
+            bool: True while profiling.
+        """
+        return self._started is not None
+
+    @callback
+    def async_start(self, duration: float):
+        """Start a profiling window.
+
+        Args:
+            duration: Seconds after which profiling stops and the results are written.
+
+        Returns:
+            bool: True if profiling started, False if a window is already running.
+        """
+        if self.active:
+            return False
+        self._stats = None
+        self._unprofiled = 0
+        self._sections = {}
+        self._started = datetime.now()
+
+        async def _async_stop_later(_now):
+            self._unsub_stop = None
+            await self.async_stop()
+
+        self._unsub_stop = async_call_later(self._hass, duration, _async_stop_later)
+        _LOGGER.info("Started profiling for %s seconds", duration)
+        return True
+
+    async def async_stop(self):
+        """Stop the running profiling window and write the results.
+
+        Returns:
+            str: The path of the written statistics file, or of the summary if no
+                executor job was profiled, or None if profiling was not running.
+        """
+        if not self.active:
+            return None
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        started = self._started
+        self._started = None
+        with self._lock:
+            stats, self._stats = self._stats, None
+            unprofiled, self._unprofiled = self._unprofiled, 0
+        sections, self._sections = self._sections, {}
+        path = self._hass.config.path(f"{DOMAIN}_profile_{started:%Y%m%d_%H%M%S}.prof")
+        path = await self._hass.async_add_executor_job(self._write_results, path, stats, sections, unprofiled)
+        _LOGGER.info("Stopped profiling, results written to %s", path)
+        return path
+
+    @staticmethod
+    def _write_results(path, stats, sections, unprofiled):
+        """Write the profiling results to disk.
+
+        Writes the raw cProfile statistics to path and a readable summary next to it.
+
+        Args:
+            path: The path of the statistics file.
+            stats: The merged pstats.Stats of the executor jobs, or None.
+            sections: Timings of the coroutine sections.
+            unprofiled: The number of executor jobs that ran unprofiled.
+
+        Returns:
+            str: The path of the statistics file, or of the summary if no
+                executor job was profiled.
+        """
+        summary = io.StringIO()
+        summary.write("Coroutine sections (calls, total s, max s)\n")
+        for name, (calls, total, maximum) in sorted(sections.items(), key=lambda item: -item[1][1]):
+            summary.write(f"{name:40} {calls:8d} {total:12.4f} {maximum:10.4f}\n")
+        summary.write("\nExecutor jobs\n")
+        if unprofiled:
+            summary.write(f"{unprofiled} executor jobs ran unprofiled while another profiler was active.\n")
+        summary_path = f"{path[:-len('.prof')]}.txt"
+        if stats is None:
+            summary.write("No executor jobs were profiled during the profiling window.\n")
+        else:
+            stats.dump_stats(path)
+            stats.stream = summary
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+        with open(summary_path, "w", encoding="utf-8") as file:
+            file.write(summary.getvalue())
+        return summary_path if stats is None else path
+
+    def wrap_job(self, func):
+        """Wrap an executor job so that it runs under cProfile while profiling.
+
+        Args:
+            func: The blocking callable to run in the executor.
+
+        Returns:
+            Callable: The wrapped callable, or func itself when profiling is not running.
+        """
+        if not self.active:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            # Only one job is profiled at a time, concurrent jobs run unprofiled
+            if not self._profile_lock.acquire(blocking=False):
+                self._count_unprofiled()
+                return func(*args)
+            try:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Another profiling tool, such as Home Assistant's profiler, is active
+                    self._count_unprofiled()
+                    return func(*args)
+                try:
+                    return func(*args)
+                finally:
+                    profile.disable()
+                    self._add_profile(profile)
+            finally:
+                self._profile_lock.release()
+        return wrapper
+
+    def _count_unprofiled(self):
+        """Count an executor job that ran unprofiled.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._unprofiled += 1
+
+    def _add_profile(self, profile):
+        """Merge the profile of an executor job into the window's statistics.
+
+        Args:
+            profile: The disabled cProfile.Profile of the job.
+
+        Returns:
+            None
+        """
+        profile.create_stats()
+        if not profile.stats:
+            return
+        with self._lock:
+            if self.active:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+
+    @contextmanager
+    def section(self, name: str):
+        """Time a coroutine section while profiling.
+
+        Args:
+            name: The name of the hot path being timed.
+
+        Yields:
+            None
+        """
+        if not self.active:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            calls, total, maximum = self._sections.get(name, (0, 0.0, 0.0))
+            self._sections[name] = (calls + 1, total + duration, max(maximum, duration))
@@ -0,0 +1,76 @@
+"""
+Write rate limiting for Hysen Heating integration.
+
+The Wi-Fi modules of the thermostats stop answering for minutes when flooded
+with writes, so each device's writes pass through a token bucket.
+"""
+
+import time
+
+class HysenTokenBucket:
+    """Token bucket allowing short bursts of writes at a bounded sustained rate.
+
+    Every write takes one token. Tokens are refilled continuously up to the burst
+    size. A write arriving shortly before the next token is due may reserve it and
+    wait; writes beyond that are refused.
+    """
+
+    def __init__(self, burst: int, rate: float):
+        """Initialize the bucket full.
+
+        Args:
+            burst: The maximum number of tokens, i.e. writes sent back to back.
+            rate: The number of tokens refilled per minute.
+        """
+        self._burst = burst
+        self._rate = rate / 60
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def configure(self, burst: int, rate: float):
+        """Change the burst size and refill rate, keeping the current tokens.
+
+        Args:
+            burst: The maximum number of tokens.
+            rate: The number of tokens refilled per minute.
+
+        Returns:
+            None
+        """
+        self._refill()
+        self._burst = burst
+        self._rate = rate / 60
+        self._tokens = min(self._tokens, float(burst))
+
+    def _refill(self):
+        """Add the tokens accrued since the last update.
+
+        Returns:
+            None
+        """
+        now = time.monotonic()
+        self._tokens = min(float(self._burst), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self, max_wait: float):
+        """Take a token, reserving the next one if none is available yet.
+
+        Args:
+            max_wait: The longest time in seconds a caller may wait for a token.
+
+        Returns:
+            float: Seconds to wait before writing (0 if a token was available),
+                or None if no token can be had within max_wait.
+        """
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        if self._rate <= 0:
+            return None
+        wait = (1 - self._tokens) / self._rate
+        if wait > max_wait:
+            return None
+        # The reserved token is owed, so later writes queue behind this one
+        self._tokens -= 1
+        return wait
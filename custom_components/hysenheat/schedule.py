@@ -0,0 +1,270 @@
+"""
+Weekly schedule timeline for Hysen Heating integration.
+
+In auto mode the target temperature only changes at the start of a schedule
+slot. The slots cached in the coordinator data are compiled into a sorted
+timeline of the week's transitions on the device clock, so the coordinator can
+read the device right after a slot starts instead of waiting for the next poll.
+
+The timeline is bisected to find the active slot and the next transition, which
+a tracker keeps at hand for the schedule sensors and only works out again when
+a slot starts or the schedule changes.
+"""
+
+import bisect
+from datetime import datetime, timedelta
+from homeassistant.components.climate import HVACMode
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from .const import (
+    DATA_KEY_PRESET_MODE,
+    DATA_KEY_OPERATION_MODE,
+    DATA_KEY_POWER_STATE,
+    STATE_ON,
+    CLOCK_DRIFT_THRESHOLD,
+    PRESET_WORKDAYS,
+    PRESET_SIXDAYS,
+    PRESET_FULLWEEK,
+)
+from .clock import SECONDS_PER_WEEK, week_seconds
+from .status import SLOT_TIME_KEYS, SLOT_TEMP_KEYS
+
+# Number of weekdays running the six workday slots, the others run the two weekend slots
+WORKDAYS_PER_PRESET = {
+    PRESET_WORKDAYS: 5,
+    PRESET_SIXDAYS: 6,
+    PRESET_FULLWEEK: 7,
+}
+WORKDAY_SLOTS = 6
+
+# Names of the slots, in the order of SLOT_TIME_KEYS, as in the climate slot attributes
+SLOT_NAMES = ("slot1", "slot2", "slot3", "slot4", "slot5", "slot6", "slot1_we", "slot2_we")
+
+class HysenScheduleTimeline:
+    """The transitions of a device's weekly schedule, sorted by their position in the week."""
+
+    def __init__(self, transitions: list):
+        """Initialize the timeline.
+
+        Args:
+            transitions: Tuples of the position in the week in seconds, the slot
+                name and the target temperature of each slot start.
+        """
+        self.transitions = sorted(transitions)
+        self._positions = [transition[0] for transition in self.transitions]
+
+    def next_transition(self, position: int):
+        """Return the first transition after a point in the week.
+
+        Args:
+            position: Seconds since Monday 00:00:00 on the device clock.
+
+        Returns:
+            tuple: The seconds until the transition and the transition, or None
+                without transitions.
+        """
+        if not self.transitions:
+            return None
+        index = bisect.bisect_right(self._positions, position)
+        transition = self.transitions[index % len(self.transitions)]
+        delay = (transition[0] - position) % SECONDS_PER_WEEK
+        return delay or SECONDS_PER_WEEK, transition
+
+    def active_transition(self, position: int):
+        """Return the last transition at or before a point in the week.
+
+        Before the week's first transition, the last one of the previous week is active.
+
+        Args:
+            position: Seconds since Monday 00:00:00 on the device clock.
+
+        Returns:
+            tuple: The transition that started the active slot, or None without transitions.
+        """
+        if not self.transitions:
+            return None
+        return self.transitions[bisect.bisect_right(self._positions, position) - 1]
+
+class HysenScheduleTracker:
+    """Follow a device through its weekly schedule.
+
+    The active slot, the next transition and the local time it happens at are
+    worked out when the timeline changes and by a single timer at each
+    transition, not on every poll.
+    """
+
+    def __init__(self, hass: HomeAssistant, on_transition):
+        """Initialize the tracker without a timeline.
+
+        Args:
+            hass: The Home Assistant instance.
+            on_transition: Callback run after a slot started.
+        """
+        self._hass = hass
+        self._on_transition = on_transition
+        self._timeline = None
+        self._clock_drift = None
+        self._unsub_transition = None
+        self.active = None
+        self.upcoming = None
+        self.next_change = None
+
+    def update(self, timeline: HysenScheduleTimeline, clock_drift: int):
+        """Follow a timeline on a device clock.
+
+        Args:
+            timeline: The HysenScheduleTimeline of the device, or None.
+            clock_drift: Seconds the device clock is ahead of local time.
+
+        Returns:
+            bool: True if the active slot and next transition were worked out
+                again, False if neither the timeline nor the clock drift changed
+                by CLOCK_DRIFT_THRESHOLD seconds or more.
+        """
+        clock_drift = clock_drift or 0
+        if (
+            timeline is self._timeline
+            and self._clock_drift is not None
+            and abs(clock_drift - self._clock_drift) < CLOCK_DRIFT_THRESHOLD
+        ):
+            return False
+        self._timeline = timeline
+        self._clock_drift = clock_drift
+        self._track()
+        return True
+
+    def _track(self):
+        """Work out the active slot and the next transition, and wait for it.
+
+        Returns:
+            None
+        """
+        self._cancel()
+        if self._timeline is None or not self._timeline.transitions:
+            self.active = self.upcoming = self.next_change = None
+            return
+        now = datetime.now().astimezone().replace(microsecond=0)
+        position = device_week_position(now, self._clock_drift)
+        self.active = self._timeline.active_transition(position)
+        delay, self.upcoming = self._timeline.next_transition(position)
+        self.next_change = now + timedelta(seconds=delay)
+        self._unsub_transition = async_call_later(self._hass, delay, self._async_transition)
+
+    @callback
+    def _async_transition(self, _now):
+        """Move on to the slot that just started.
+
+        Args:
+            _now: The time the transition was scheduled for.
+
+        Returns:
+            None
+        """
+        self._unsub_transition = None
+        self._track()
+        self._on_transition()
+
+    def _cancel(self):
+        """Cancel the timer of the next transition.
+
+        Returns:
+            None
+        """
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    def stop(self):
+        """Stop following the schedule.
+
+        Returns:
+            None
+        """
+        self._cancel()
+        self._timeline = None
+        self._clock_drift = None
+
+def schedule_signature(data: dict):
+    """Return the parts of the coordinator data that define the weekly schedule.
+
+    Args:
+        data: The coordinator data.
+
+    Returns:
+        tuple: The schedule preset, slot times and slot temperatures.
+    """
+    return (
+        data.get(DATA_KEY_PRESET_MODE),
+        *(data.get(key) for key in SLOT_TIME_KEYS),
+        *(data.get(key) for key in SLOT_TEMP_KEYS),
+    )
+
+def follows_schedule(data: dict):
+    """Return True if a device runs its weekly schedule.
+
+    Args:
+        data: The coordinator data.
+
+    Returns:
+        bool: True if the device is on and in auto mode.
+    """
+    return data.get(DATA_KEY_OPERATION_MODE) == HVACMode.AUTO and data.get(DATA_KEY_POWER_STATE) == STATE_ON
+
+def _parse_slot_time(value):
+    """Return the second of the day at which a slot starts.
+
+    Args:
+        value: The slot time as "H:MM".
+
+    Returns:
+        int: Seconds since midnight, or None if the time is not valid.
+    """
+    try:
+        hour, minute = (int(part) for part in str(value).split(":"))
+    except ValueError:
+        return None
+    if not 0 <= hour < 24 or not 0 <= minute < 60:
+        return None
+    return (hour * 60 + minute) * 60
+
+def compile_schedule(data: dict):
+    """Compile the weekly schedule in the coordinator data into a timeline.
+
+    Slots with an invalid time are left out.
+
+    Args:
+        data: The coordinator data.
+
+    Returns:
+        HysenScheduleTimeline: The timeline, or None if the schedule preset is unknown.
+    """
+    workdays = WORKDAYS_PER_PRESET.get(data.get(DATA_KEY_PRESET_MODE))
+    if workdays is None:
+        return None
+    workday_slots = []
+    weekend_slots = []
+    for index, (time_key, temp_key) in enumerate(zip(SLOT_TIME_KEYS, SLOT_TEMP_KEYS)):
+        start = _parse_slot_time(data.get(time_key))
+        if start is None:
+            continue
+        slots = workday_slots if index < WORKDAY_SLOTS else weekend_slots
+        slots.append((start, SLOT_NAMES[index], data.get(temp_key)))
+    transitions = []
+    for weekday in range(1, 8):
+        day_slots = workday_slots if weekday <= workdays else weekend_slots
+        day = week_seconds(weekday, 0, 0, 0)
+        transitions.extend((day + start, slot, temp) for start, slot, temp in day_slots)
+    return HysenScheduleTimeline(transitions)
+
+def device_week_position(now: datetime, clock_drift: int):
+    """Return the current point in the week on a device clock.
+
+    Args:
+        now: The local time.
+        clock_drift: Seconds the device clock is ahead of local time.
+
+    Returns:
+        int: Seconds since Monday 00:00:00 on the device clock.
+    """
+    local = week_seconds(now.isoweekday(), now.hour, now.minute, now.second)
+    return (local + (clock_drift or 0)) % SECONDS_PER_WEEK
@@ -0,0 +1,158 @@
+"""
+Prioritized device access for Hysen Heating integration.
+
+Each device is accessed by a single worker, one request at a time. Interactive
+commands go first, then the reads verifying them, then background polls, so a
+button press never waits behind a poll queued before it.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from .const import (
+    DOMAIN,
+    PRIORITY_POLL,
+    PRIORITY_COMMAND,
+    SCHEDULER_READBACK_GRACE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+class HysenScheduler:
+    """Serialize the requests to one device in priority order.
+
+    Queued background status reads are superseded when a command arrives. They
+    are answered by the next status read that runs, normally the one verifying
+    the command, or read on their own if none follows within a short grace period.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str, stats):
+        """Initialize the scheduler.
+
+        Args:
+            hass: The Home Assistant instance.
+            name: The name of the device, for logging and the worker task.
+            stats: The HysenDeviceStats counting superseded polls.
+        """
+        self._hass = hass
+        self._name = name
+        self._stats = stats
+        self._queue = []
+        self._superseded = []
+        self._running = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._worker = None
+
+    @property
+    def depth(self):
+        """Return the number of queued requests.
+
+        Returns:
+            int: The requests waiting for the device, including superseded polls.
+        """
+        return len(self._queue) + len(self._superseded)
+
+    async def async_submit(self, priority: int, job, status_read: bool = False):
+        """Queue a request and wait for its result.
+
+        Args:
+            priority: PRIORITY_COMMAND, PRIORITY_VERIFY or PRIORITY_POLL.
+            job: Coroutine function performing the request.
+            status_read: True if the request reads the device status.
+
+        Returns:
+            Any: The value returned by the job.
+
+        Raises:
+            HomeAssistantError: If the scheduler is stopped before the job runs.
+            Exception: Any error raised by the job.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if priority == PRIORITY_COMMAND:
+            self._supersede_polls()
+        heapq.heappush(self._queue, (priority, next(self._sequence), job, status_read, future))
+        if self._worker is None:
+            self._worker = self._hass.async_create_background_task(
+                self._async_work(), f"{DOMAIN}_scheduler_{self._name}"
+            )
+        self._wakeup.set()
+        return await future
+
+    def _supersede_polls(self):
+        """Set aside the queued background status reads in favor of a command's read-back.
+
+        Returns:
+            None
+        """
+        kept = []
+        for request in self._queue:
+            if request[0] == PRIORITY_POLL and request[3]:
+                self._superseded.append(request)
+                self._stats.polls_superseded += 1
+            else:
+                kept.append(request)
+        if len(kept) != len(self._queue):
+            heapq.heapify(kept)
+            self._queue = kept
+            _LOGGER.debug("Superseded queued polls of %s by a command", self._name)
+
+    async def _async_work(self):
+        """Run the queued requests one at a time, highest priority first.
+
+        Returns:
+            None
+        """
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                if not self._superseded:
+                    await self._wakeup.wait()
+                    continue
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), SCHEDULER_READBACK_GRACE)
+                except asyncio.TimeoutError:
+                    # No read-back followed the command, so the superseded polls read on their own
+                    heapq.heappush(self._queue, self._superseded.pop(0))
+                continue
+            _priority, _sequence, job, status_read, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self._running = [future]
+            if status_read:
+                self._running.extend(request[4] for request in self._superseded)
+                self._superseded = []
+            try:
+                result = await job()
+            except Exception as exc:
+                for waiter in self._running:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+            else:
+                for waiter in self._running:
+                    if not waiter.done():
+                        waiter.set_result(result)
+            self._running = []
+
+    async def async_stop(self):
+        """Stop the worker and fail the requests still queued or running.
+
+        Returns:
+            None
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for waiter in self._running + [request[4] for request in self._queue + self._superseded]:
+            if not waiter.done():
+                waiter.set_exception(HomeAssistantError(f"Device {self._name} is unloaded"))
+        self._running = []
+        self._queue = []
+        self._superseded = []
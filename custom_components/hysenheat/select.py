@@ -5,7 +5,6 @@ This module provides select entities for setting the key lock and sensor type va
 """
 
 import logging
-import asyncio
 import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_platform
@@ -27,6 +26,7 @@ from .const import (
     SENSOR_TYPE_HASS_TO_HYSEN,
 )
 from .entity import HysenEntity
+from .trace import traced
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -101,6 +101,7 @@ class HysenKeyLockSelect(HysenEntity, SelectEntity):
         """
         return self.coordinator.data.get(DATA_KEY_KEY_LOCK)
 
+    @traced("select.select_option")
     async def async_select_option(self, option: str):
         """Set the key lock option.
 
@@ -115,13 +116,11 @@ class HysenKeyLockSelect(HysenEntity, SelectEntity):
             "Error in set_key_lock",
             self.coordinator.device.set_key_lock,
             KEY_LOCK_HASS_TO_HYSEN[option],
+            unchanged_if={DATA_KEY_KEY_LOCK: option},
         )
         if success:
             # Delay to allow device to stabilize
-            await asyncio.sleep(0.2)
-            # Force an immediate update to fetch the latest device state
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
     async def async_set_key_lock(self, key_lock):
         """Set the key lock state (for service calls).
@@ -161,6 +160,7 @@ class HysenSensorTypeSelect(HysenEntity, SelectEntity):
         """
         return self.coordinator.data.get(DATA_KEY_SENSOR_TYPE)
 
+    @traced("select.select_option")
     async def async_select_option(self, option: str):
         """Set the sensor type option.
 
@@ -175,13 +175,11 @@ class HysenSensorTypeSelect(HysenEntity, SelectEntity):
             "Error in set_sensor",
             self.coordinator.device.set_sensor,
             SENSOR_TYPE_HASS_TO_HYSEN[option],
+            unchanged_if={DATA_KEY_SENSOR_TYPE: option},
         )
         if success:
             # Delay to allow device to stabilize
-            await asyncio.sleep(0.2)
-            # Force an immediate update to fetch the latest device state
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
     async def async_set_sensor_type(self, sensor_type):
         """Set the sensor type state (for service calls).
@@ -1,10 +1,12 @@
 """
 Support for Hysen Heating Controller sensors.
 
-This module provides sensors for device time.
+This module provides sensors for device time and for the weekly schedule: the
+active slot, and the setpoint and time of the next change.
 """
 
 import logging
+from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 from .const import (
@@ -47,6 +49,9 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
     device_data = hass.data[DOMAIN][config_entry.entry_id]
     async_add_entities([
         HysenDeviceTimeSensor(device_data),
+        HysenActiveSlotSensor(device_data),
+        HysenNextSetpointSensor(device_data),
+        HysenNextChangeSensor(device_data),
     ])
 
 class HysenDeviceTimeSensor(HysenEntity, SensorEntity):
@@ -87,4 +92,112 @@ class HysenDeviceTimeSensor(HysenEntity, SensorEntity):
         time_str = f"{hour:02d}:{minute:02d}"
         # Get weekday name
         weekday_str = WEEKDAY_MAP.get(weekday, "Unknown")
-        return f"{weekday_str} {time_str}"
\ No newline at end of file
+        return f"{weekday_str} {time_str}"
+
+class HysenScheduleSensor(HysenEntity, SensorEntity):
+    """Base class of the sensors reporting the device's place in its weekly schedule.
+
+    The values are read from the coordinator's schedule tracker, which works them
+    out at each transition, so nothing is computed when the state is written.
+    """
+
+    def _transition(self, name: str):
+        """Return a transition kept by the schedule tracker.
+
+        Args:
+            name: The tracker attribute, "active" or "upcoming".
+
+        Returns:
+            tuple: The position in the week, slot name and target temperature of
+                the transition, or None if the device does not run its schedule.
+        """
+        if not self.coordinator.following_schedule:
+            return None
+        return getattr(self.coordinator.schedule_tracker, name)
+
+class HysenActiveSlotSensor(HysenScheduleSensor):
+    """Representation of a Hysen Active Slot sensor.
+
+    Displays the schedule slot that set the current target temperature.
+    """
+
+    def __init__(self, device_data):
+        """Initialize the sensor.
+
+        Args:
+            device_data: Dictionary containing device-specific data (e.g., mac, name, coordinator).
+        """
+        super().__init__(device_data["coordinator"], device_data)
+        self._attr_unique_id = f"{device_data['mac']}_active_slot"
+        self._attr_name = f"{device_data['name']} Active Slot"
+        self._attr_icon = "mdi:timeline-clock"
+
+    @property
+    def native_value(self):
+        """Return the name of the active schedule slot.
+
+        Returns:
+            str: The slot name, e.g. "slot3" or "slot1_we", or None outside auto mode.
+        """
+        transition = self._transition("active")
+        return transition[1] if transition else None
+
+class HysenNextSetpointSensor(HysenScheduleSensor):
+    """Representation of a Hysen Next Setpoint sensor.
+
+    Displays the target temperature set by the next schedule slot.
+    """
+
+    def __init__(self, device_data):
+        """Initialize the sensor.
+
+        Args:
+            device_data: Dictionary containing device-specific data (e.g., mac, name, coordinator).
+        """
+        super().__init__(device_data["coordinator"], device_data)
+        self._attr_unique_id = f"{device_data['mac']}_next_setpoint"
+        self._attr_name = f"{device_data['name']} Next Setpoint"
+        self._attr_icon = "mdi:thermometer-chevron-up"
+        self._attr_device_class = SensorDeviceClass.TEMPERATURE
+        self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+
+    @property
+    def native_value(self):
+        """Return the target temperature of the next schedule slot.
+
+        Returns:
+            float: The temperature, or None outside auto mode.
+        """
+        transition = self._transition("upcoming")
+        return transition[2] if transition else None
+
+class HysenNextChangeSensor(HysenScheduleSensor):
+    """Representation of a Hysen Next Change sensor.
+
+    Displays when the next schedule slot starts, in local time.
+    """
+
+    def __init__(self, device_data):
+        """Initialize the sensor.
+
+        Args:
+            device_data: Dictionary containing device-specific data (e.g., mac, name, coordinator).
+        """
+        super().__init__(device_data["coordinator"], device_data)
+        self._attr_unique_id = f"{device_data['mac']}_next_change"
+        self._attr_name = f"{device_data['name']} Next Change"
+        self._attr_icon = "mdi:calendar-clock"
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    @property
+    def native_value(self):
+        """Return the time the next schedule slot starts.
+
+        The device clock drift is taken into account.
+
+        Returns:
+            datetime: The local time of the change, or None outside auto mode.
+        """
+        if self._transition("upcoming") is None:
+            return None
+        return self.coordinator.schedule_tracker.next_change
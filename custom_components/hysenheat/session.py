@@ -0,0 +1,70 @@
+"""
+Persisted Broadlink sessions for Hysen Heating integration.
+
+This module keeps the session key and ID negotiated with each device in Home
+Assistant storage, so reloads and restarts reuse them instead of authenticating again.
+"""
+
+import logging
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from .const import (
+    SESSION_STORAGE_KEY,
+    SESSION_STORAGE_VERSION,
+    SESSION_SAVE_DELAY,
+)
+from .discovery import format_mac
+
+_LOGGER = logging.getLogger(__name__)
+
+class HysenSessionStore:
+    """Cache the negotiated session of each device, keyed by MAC address."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the session store.
+
+        Args:
+            hass: The Home Assistant instance.
+        """
+        self._store = Store(hass, SESSION_STORAGE_VERSION, SESSION_STORAGE_KEY, private=True)
+        self._sessions = {}
+
+    async def async_load(self):
+        """Load the persisted sessions.
+
+        Returns:
+            None
+        """
+        self._sessions = await self._store.async_load() or {}
+        _LOGGER.debug("Loaded %d persisted sessions", len(self._sessions))
+
+    def get(self, mac: str):
+        """Return the persisted session of a device.
+
+        Args:
+            mac: The MAC address of the device.
+
+        Returns:
+            dict: The session ID and AES key, or None if no session is known.
+        """
+        return self._sessions.get(format_mac(mac))
+
+    @callback
+    def async_set(self, mac: str, session: dict):
+        """Remember the session of a device and schedule it to be saved.
+
+        Args:
+            mac: The MAC address of the device.
+            session: The session ID and AES key, or None to forget the session.
+
+        Returns:
+            None
+        """
+        mac = format_mac(mac)
+        if self._sessions.get(mac) == session:
+            return
+        if session is None:
+            self._sessions.pop(mac, None)
+        else:
+            self._sessions[mac] = session
+        self._store.async_delay_save(lambda: self._sessions, SESSION_SAVE_DELAY)
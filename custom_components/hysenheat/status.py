@@ -0,0 +1,262 @@
+"""
+Status snapshots for Hysen Heating integration.
+
+The coordinator data is a plain dictionary built from a device's status, so it
+can be produced wherever the device I/O runs and passed around as is. Once the
+firmware version is known, the raw status response is decoded straight into the
+snapshot; the library's attributes are only read for the first poll and for
+firmware with an unknown status layout.
+"""
+
+import struct
+from broadlink.exceptions import check_error
+from broadlink.helpers import CRC16
+from .const import (
+    DATA_KEY_FWVERSION,
+    DATA_KEY_KEY_LOCK,
+    DATA_KEY_TEMPORARY_MANUAL,
+    DATA_KEY_VALVE_STATE,
+    DATA_KEY_POWER_STATE,
+    DATA_KEY_ROOM_TEMP,
+    DATA_KEY_TARGET_TEMP,
+    DATA_KEY_OPERATION_MODE,
+    DATA_KEY_PRESET_MODE,
+    DATA_KEY_SENSOR_TYPE,
+    DATA_KEY_EXTERNAL_MAX_TEMP,
+    DATA_KEY_HYSTERESIS,
+    DATA_KEY_MAX_TEMP,
+    DATA_KEY_MIN_TEMP,
+    DATA_KEY_CALIBRATION,
+    DATA_KEY_FROST_PROTECTION,
+    DATA_KEY_POWERON,
+    DATA_KEY_UNKNOWN1,
+    DATA_KEY_EXTERNAL_TEMP,
+    DATA_KEY_CLOCK_HOUR,
+    DATA_KEY_CLOCK_MINUTE,
+    DATA_KEY_CLOCK_SECOND,
+    DATA_KEY_CLOCK_WEEKDAY,
+    DATA_KEY_SLOT1_TIME,
+    DATA_KEY_SLOT2_TIME,
+    DATA_KEY_SLOT3_TIME,
+    DATA_KEY_SLOT4_TIME,
+    DATA_KEY_SLOT5_TIME,
+    DATA_KEY_SLOT6_TIME,
+    DATA_KEY_SLOT1_WE_TIME,
+    DATA_KEY_SLOT2_WE_TIME,
+    DATA_KEY_SLOT1_TEMP,
+    DATA_KEY_SLOT2_TEMP,
+    DATA_KEY_SLOT3_TEMP,
+    DATA_KEY_SLOT4_TEMP,
+    DATA_KEY_SLOT5_TEMP,
+    DATA_KEY_SLOT6_TEMP,
+    DATA_KEY_SLOT1_WE_TEMP,
+    DATA_KEY_SLOT2_WE_TEMP,
+#    DATA_KEY_SLOT1_OFF,
+    DATA_KEY_UNKNOWN2,
+    DATA_KEY_UNKNOWN3,
+    KEY_LOCK_HYSEN_TO_HASS,
+    TEMPORARY_MANUAL_HYSEN_TO_HASS,
+    VALVE_STATE_HYSEN_TO_HASS,
+    POWER_STATE_HYSEN_TO_HASS,
+    MODE_HYSEN_TO_HASS,
+    PRESET_HYSEN_TO_HASS,
+    SENSOR_TYPE_HYSEN_TO_HASS,
+    FROST_PROTECTION_HYSEN_TO_HASS,
+    POWERON_HYSEN_TO_HASS,
+)
+from .transport import FRAME_HEADER_SIZE, PACKET_TYPE_COMMAND, frame_hysen_request, send_packet_hedged
+
+# Hysen request reading the 0x17 status words
+STATUS_REQUEST = bytes([0x01, 0x03, 0x00, 0x00, 0x00, 0x17])
+
+# Known status response: header, command, byte count, then the 0x17 words
+STATUS_HEADER = bytes([0x01, 0x03, 0x2E])
+STATUS_SIZE = len(STATUS_HEADER) + 0x2E
+
+# Fields from the key lock byte to the last unknown byte, calibration being a signed word
+STATUS_STRUCT = struct.Struct(">3x10Bh8B16B8B2B")
+
+SLOT_TIME_KEYS = (
+    DATA_KEY_SLOT1_TIME,
+    DATA_KEY_SLOT2_TIME,
+    DATA_KEY_SLOT3_TIME,
+    DATA_KEY_SLOT4_TIME,
+    DATA_KEY_SLOT5_TIME,
+    DATA_KEY_SLOT6_TIME,
+    DATA_KEY_SLOT1_WE_TIME,
+    DATA_KEY_SLOT2_WE_TIME,
+)
+SLOT_TEMP_KEYS = (
+    DATA_KEY_SLOT1_TEMP,
+    DATA_KEY_SLOT2_TEMP,
+    DATA_KEY_SLOT3_TEMP,
+    DATA_KEY_SLOT4_TEMP,
+    DATA_KEY_SLOT5_TEMP,
+    DATA_KEY_SLOT6_TEMP,
+    DATA_KEY_SLOT1_WE_TEMP,
+    DATA_KEY_SLOT2_WE_TEMP,
+)
+
+# Texts of every byte value, so slot times are joined instead of formatted
+HOUR_TEXTS = tuple(str(value) for value in range(256))
+MINUTE_TEXTS = tuple(f"{value:02d}" for value in range(256))
+
+class StatusLayoutError(Exception):
+    """The status response does not have the layout the decoder knows."""
+
+def read_snapshot(device):
+    """Map the status last read by a device to Home Assistant-compatible formats.
+
+    Args:
+        device: The HysenHeatingDevice instance, with its status read.
+
+    Returns:
+        dict: The coordinator data.
+    """
+    return {
+        DATA_KEY_FWVERSION: device.fwversion,
+        DATA_KEY_KEY_LOCK: KEY_LOCK_HYSEN_TO_HASS.get(device.key_lock),
+        DATA_KEY_TEMPORARY_MANUAL: TEMPORARY_MANUAL_HYSEN_TO_HASS.get(device.manual_in_auto),
+        DATA_KEY_VALVE_STATE: VALVE_STATE_HYSEN_TO_HASS.get(device.valve_state),
+        DATA_KEY_POWER_STATE: POWER_STATE_HYSEN_TO_HASS.get(device.power_state),
+        DATA_KEY_ROOM_TEMP: device.room_temp,
+        DATA_KEY_TARGET_TEMP: device.target_temp,
+        DATA_KEY_OPERATION_MODE: MODE_HYSEN_TO_HASS.get(device.operation_mode),
+        DATA_KEY_PRESET_MODE: PRESET_HYSEN_TO_HASS.get(device.schedule),
+        DATA_KEY_SENSOR_TYPE: SENSOR_TYPE_HYSEN_TO_HASS.get(device.sensor),
+        DATA_KEY_EXTERNAL_MAX_TEMP: device.external_max_temp,
+        DATA_KEY_HYSTERESIS: device.hysteresis,
+        DATA_KEY_MAX_TEMP: device.max_temp,
+        DATA_KEY_MIN_TEMP: device.min_temp,
+        DATA_KEY_CALIBRATION: device.calibration,
+        DATA_KEY_FROST_PROTECTION: FROST_PROTECTION_HYSEN_TO_HASS.get(device.frost_protection),
+        DATA_KEY_POWERON: POWERON_HYSEN_TO_HASS.get(device.poweron),
+        DATA_KEY_UNKNOWN1: device.unknown1,
+        DATA_KEY_EXTERNAL_TEMP: device.external_temp,
+        DATA_KEY_CLOCK_HOUR: device.clock_hour,
+        DATA_KEY_CLOCK_MINUTE: device.clock_minute,
+        DATA_KEY_CLOCK_SECOND: device.clock_second,
+        DATA_KEY_CLOCK_WEEKDAY: device.clock_weekday,
+        DATA_KEY_SLOT1_TIME: f"{device.period1_hour}:{device.period1_min:02d}",
+        DATA_KEY_SLOT2_TIME: f"{device.period2_hour}:{device.period2_min:02d}",
+        DATA_KEY_SLOT3_TIME: f"{device.period3_hour}:{device.period3_min:02d}",
+        DATA_KEY_SLOT4_TIME: f"{device.period4_hour}:{device.period4_min:02d}",
+        DATA_KEY_SLOT5_TIME: f"{device.period5_hour}:{device.period5_min:02d}",
+        DATA_KEY_SLOT6_TIME: f"{device.period6_hour}:{device.period6_min:02d}",
+        DATA_KEY_SLOT1_WE_TIME:  f"{device.we_period1_hour}:{device.we_period1_min:02d}",
+        DATA_KEY_SLOT2_WE_TIME:  f"{device.we_period2_hour}:{device.we_period2_min:02d}",
+        DATA_KEY_SLOT1_TEMP: device.period1_temp,
+        DATA_KEY_SLOT2_TEMP: device.period2_temp,
+        DATA_KEY_SLOT3_TEMP: device.period3_temp,
+        DATA_KEY_SLOT4_TEMP: device.period4_temp,
+        DATA_KEY_SLOT5_TEMP: device.period5_temp,
+        DATA_KEY_SLOT6_TEMP: device.period6_temp,
+        DATA_KEY_SLOT1_WE_TEMP: device.we_period1_temp,
+        DATA_KEY_SLOT2_WE_TEMP: device.we_period2_temp,
+#                DATA_KEY_SLOT1_OFF: STATE_ON if device.period1_temp == 0.0 else STATE_OFF,
+#                DATA_KEY_SLOT1_OFF: STATE_ON,
+        DATA_KEY_UNKNOWN2: device.unknown2,
+        DATA_KEY_UNKNOWN3: device.unknown3,
+    }
+
+def fetch_snapshot(device):
+    """Read the status of a device and map it to Home Assistant-compatible formats (blocking).
+
+    Args:
+        device: The HysenHeatingDevice instance.
+
+    Returns:
+        dict: The coordinator data.
+
+    Raises:
+        Exception: Any error raised while reading from the device.
+    """
+    device.get_device_status()
+    return read_snapshot(device)
+
+def decode_status(payload: bytes, fwversion):
+    """Decode a decrypted status response straight into the coordinator data.
+
+    Produces the same data as reading the library's attributes with read_snapshot,
+    in a single unpack over the payload.
+
+    Args:
+        payload: The decrypted payload of the reply, with length prefix and CRC.
+        fwversion: The firmware version of the device.
+
+    Returns:
+        dict: The coordinator data.
+
+    Raises:
+        ValueError: If the length or CRC is wrong, as raised by the library.
+        StatusLayoutError: If the response is intact but has an unknown layout.
+    """
+    view = memoryview(payload)
+    length = view[0]
+    if length + 2 > len(view):
+        raise ValueError("hysen_response_error", "first byte of response is not length")
+    if view[length] | view[length + 1] << 8 != CRC16.calculate(view[2:length]):
+        raise ValueError("hysen_response_error", "CRC check on response failed")
+    if length - 2 != STATUS_SIZE or view[2:5] != STATUS_HEADER:
+        raise StatusLayoutError(f"status response of {length - 2} bytes starting with {bytes(view[2:5]).hex()}")
+    fields = STATUS_STRUCT.unpack_from(view, 2)
+    flags = fields[1]
+    mode = fields[4]
+    data = {
+        DATA_KEY_FWVERSION: fwversion,
+        DATA_KEY_KEY_LOCK: KEY_LOCK_HYSEN_TO_HASS.get(fields[0] & 0x01),
+        DATA_KEY_TEMPORARY_MANUAL: TEMPORARY_MANUAL_HYSEN_TO_HASS.get((flags >> 6) & 0x01),
+        DATA_KEY_VALVE_STATE: VALVE_STATE_HYSEN_TO_HASS.get((flags >> 4) & 0x01),
+        DATA_KEY_POWER_STATE: POWER_STATE_HYSEN_TO_HASS.get(flags & 0x01),
+        DATA_KEY_ROOM_TEMP: fields[2] / 2.0,
+        DATA_KEY_TARGET_TEMP: fields[3] / 2.0,
+        DATA_KEY_OPERATION_MODE: MODE_HYSEN_TO_HASS.get(mode & 0x01),
+        DATA_KEY_PRESET_MODE: PRESET_HYSEN_TO_HASS.get((mode >> 4) & 0x0F),
+        DATA_KEY_SENSOR_TYPE: SENSOR_TYPE_HYSEN_TO_HASS.get(fields[5]),
+        DATA_KEY_EXTERNAL_MAX_TEMP: float(fields[6]),
+        DATA_KEY_HYSTERESIS: fields[7],
+        DATA_KEY_MAX_TEMP: fields[8],
+        DATA_KEY_MIN_TEMP: fields[9],
+        DATA_KEY_CALIBRATION: fields[10] / 2.0,
+        DATA_KEY_FROST_PROTECTION: FROST_PROTECTION_HYSEN_TO_HASS.get(fields[11]),
+        DATA_KEY_POWERON: POWERON_HYSEN_TO_HASS.get(fields[12]),
+        DATA_KEY_UNKNOWN1: fields[13],
+        DATA_KEY_EXTERNAL_TEMP: fields[14] / 2.0,
+        DATA_KEY_CLOCK_HOUR: fields[15],
+        DATA_KEY_CLOCK_MINUTE: fields[16],
+        DATA_KEY_CLOCK_SECOND: fields[17],
+        DATA_KEY_CLOCK_WEEKDAY: fields[18],
+        DATA_KEY_UNKNOWN2: fields[43],
+        DATA_KEY_UNKNOWN3: fields[44],
+    }
+    for key, hour, minute in zip(SLOT_TIME_KEYS, fields[19:35:2], fields[20:35:2]):
+        data[key] = HOUR_TEXTS[hour] + ":" + MINUTE_TEXTS[minute]
+    for key, temp in zip(SLOT_TEMP_KEYS, fields[35:43]):
+        data[key] = temp / 2.0
+    return data
+
+def read_status(device, fwversion, hedger=None):
+    """Read the raw status of a device and decode it in tree (blocking).
+
+    Unlike the library's status read, the firmware version is not read again.
+
+    Args:
+        device: The HysenHeatingDevice instance.
+        fwversion: The firmware version of the device.
+        hedger: The HysenHedger of the device, to hedge the read if it is slow.
+
+    Returns:
+        dict: The coordinator data.
+
+    Raises:
+        StatusLayoutError: If the firmware answers with an unknown layout.
+        Exception: Any error raised while reading from the device.
+    """
+    if not device._authenticated:
+        device._authenticated = device.auth()
+    if hedger is not None:
+        reply = send_packet_hedged(device, PACKET_TYPE_COMMAND, frame_hysen_request(STATUS_REQUEST), hedger)
+    else:
+        reply = device.send_packet(PACKET_TYPE_COMMAND, frame_hysen_request(STATUS_REQUEST))
+    check_error(reply[0x22:0x24])
+    return decode_status(device.decrypt(reply[FRAME_HEADER_SIZE:]), fwversion)
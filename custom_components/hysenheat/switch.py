@@ -5,7 +5,6 @@ This module provides switches for frost protection, and schedule slots.
 """
 
 import logging
-import asyncio
 import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_platform
@@ -41,9 +40,10 @@ from .const import (
 #    SERVICE_SET_SLOT6_OFF,
 #    SERVICE_SET_SLOT1_WE_OFF,
 #    SERVICE_SET_SLOT2_WE_OFF,
-#    FROST_PROTECTION_HASS_TO_HYSEN,
+    FROST_PROTECTION_HASS_TO_HYSEN,
 )
 from .entity import HysenEntity
+from .trace import traced
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -155,6 +155,7 @@ class HysenFrostProtectionSwitch(HysenEntity, SwitchEntity):
         """
         return "mdi:snowflake" if self.is_on else "mdi:snowflake-off"
 
+    @traced("switch.turn_on")
     async def async_turn_on(self, **kwargs):
         """Turn the switch on.
 
@@ -169,14 +170,13 @@ class HysenFrostProtectionSwitch(HysenEntity, SwitchEntity):
             "Error in set_frost_protection",
             self.coordinator.device.set_frost_protection,
             FROST_PROTECTION_HASS_TO_HYSEN[STATE_ON],
+            unchanged_if={DATA_KEY_FROST_PROTECTION: STATE_ON},
         )
         if success:
             # Delay to allow device to stabilize
-            await asyncio.sleep(0.2)
-            # Force an immediate update to fetch the latest device state
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
+    @traced("switch.turn_off")
     async def async_turn_off(self, **kwargs):
         """Turn the switch off.
 
@@ -191,14 +191,13 @@ class HysenFrostProtectionSwitch(HysenEntity, SwitchEntity):
             "Error in set_frost_protection",
             self.coordinator.device.set_frost_protection,
             FROST_PROTECTION_HASS_TO_HYSEN[STATE_OFF],
+            unchanged_if={DATA_KEY_FROST_PROTECTION: STATE_OFF},
         )
         if success:
             # Delay to allow device to stabilize
-            await asyncio.sleep(0.2)
-            # Force an immediate update to fetch the latest device state
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
+    @traced("switch.set_frost_protection")
     async def async_set_frost_protection(self, frost_protection):
         """Set the frost protection state.
 
@@ -213,11 +212,9 @@ class HysenFrostProtectionSwitch(HysenEntity, SwitchEntity):
             "Error in set_frost_protection",
             self.coordinator.device.set_frost_protection,
             FROST_PROTECTION_HASS_TO_HYSEN[frost_protection],
+            unchanged_if={DATA_KEY_FROST_PROTECTION: frost_protection},
         )
         if success:
             # Delay to allow device to stabilize
-            await asyncio.sleep(0.2)
-            # Force an immediate update to fetch the latest device state
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
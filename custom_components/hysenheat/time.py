@@ -5,7 +5,6 @@ This module provides time entities for setting time slots for the Hysen controll
 """
 
 import logging
-import asyncio
 import voluptuous as vol
 from datetime import time
 from homeassistant.core import HomeAssistant
@@ -39,6 +38,7 @@ from .const import (
     ATTR_SLOT2_WE_TIME,
 )
 from .entity import HysenEntity
+from .trace import traced
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -140,6 +140,7 @@ class HysenSlotTime(HysenEntity, TimeEntity):
         _LOGGER.debug("[%s] No time value for %s", self._host, self._data_key)
         return None
 
+    @traced("time.set_value")
     async def async_set_value(self, value: time):
         """Set the time value for the slot.
 
@@ -156,14 +157,12 @@ class HysenSlotTime(HysenEntity, TimeEntity):
             value.hour,
             value.minute,
             None,
+            unchanged_if={self._data_key: f"{value.hour}:{value.minute:02d}"},
         )
         if success:
             # Update coordinator.data to reflect the new value
             self.coordinator.data[self._data_key] = value.strftime("%H:%M")
-            await asyncio.sleep(0.2)
-            # Force an immediate update to fetch the latest device state
-            await self.coordinator.async_refresh()
-            self.async_write_ha_state()
+            await self._async_refresh_after_command(0.2)
 
     async def async_set_slot_time(self, slot_time: str):
         """Set the slot time value (for service calls).
@@ -0,0 +1,122 @@
+"""
+Lightweight command tracing for Hysen Heating integration.
+
+This module provides tracing spans that follow a command from the service handler
+down to the device and back to the state write, recorded in a bounded ring buffer.
+"""
+
+import functools
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from .const import DEFAULT_TRACE_BUFFER_SIZE
+
+# Trace and parent span of the code currently running, carried across awaits and tasks
+_CURRENT_TRACE_ID: ContextVar = ContextVar("hysenheat_trace_id", default=None)
+_CURRENT_SPAN_ID: ContextVar = ContextVar("hysenheat_span_id", default=None)
+
+def current_trace_id():
+    """Return the trace ID of the running code path.
+
+    Returns:
+        str: The active trace ID, or None if no trace is active.
+    """
+    return _CURRENT_TRACE_ID.get()
+
+class HysenTracer:
+    """Record tracing spans in a bounded ring buffer.
+
+    A span opened while no trace is active starts a new trace; spans opened
+    inside it inherit its trace ID and record it as their parent.
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_TRACE_BUFFER_SIZE):
+        """Initialize the tracer.
+
+        Args:
+            maxlen: Maximum number of finished spans kept in memory.
+        """
+        self._spans = deque(maxlen=maxlen)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time a block of code as a span.
+
+        Args:
+            name: The name of the stage being timed.
+            **attributes: Extra attributes stored with the span (e.g., host).
+
+        Yields:
+            str: The trace ID the span belongs to.
+        """
+        trace_id = _CURRENT_TRACE_ID.get() or uuid.uuid4().hex[:16]
+        parent_id = _CURRENT_SPAN_ID.get()
+        span_id = uuid.uuid4().hex[:8]
+        trace_token = _CURRENT_TRACE_ID.set(trace_id)
+        span_token = _CURRENT_SPAN_ID.set(span_id)
+        started = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield trace_id
+        except BaseException as exc:
+            error = repr(exc)
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            _CURRENT_SPAN_ID.reset(span_token)
+            _CURRENT_TRACE_ID.reset(trace_token)
+            self._spans.append({
+                "trace_id": trace_id,
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "name": name,
+                "start": started,
+                "duration_ms": round(duration * 1000, 3),
+                "error": error,
+                **attributes,
+            })
+
+    def export(self, trace_id: str = None, limit: int = None):
+        """Return the recorded spans, oldest first.
+
+        Args:
+            trace_id: Only return spans belonging to this trace.
+            limit: Only return the most recent spans, up to this number.
+
+        Returns:
+            list: The recorded spans as dictionaries.
+        """
+        spans = [span for span in self._spans if trace_id is None or span["trace_id"] == trace_id]
+        if limit is not None:
+            spans = spans[-limit:]
+        return spans
+
+    def clear(self):
+        """Drop all recorded spans.
+
+        Returns:
+            None
+        """
+        self._spans.clear()
+
+def traced(name: str):
+    """Decorate an entity coroutine so that it runs inside a span.
+
+    The decorated method must belong to a HysenEntity, whose coordinator owns the tracer.
+
+    Args:
+        name: The name of the span.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            with self.coordinator.tracer.span(name, host=self._host):
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,410 @@
+"""
+Shared datagram transport for Hysen Heating integration.
+
+The library opens a new socket for every packet it sends. With the shared
+transport enabled, status reads of all devices go through one asyncio datagram
+endpoint instead. Replies are routed to the waiting request by source address and
+Broadlink packet counter, so no thread blocks on a socket while a device answers.
+
+Both this transport and send_packet_hedged, used by status reads through the
+library's per-packet sockets, can hedge a read: a copy with a new packet counter
+is sent once the device's usual round-trip time has passed, and the first valid
+reply to either copy is taken.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+from broadlink.exceptions import (
+    check_error,
+    DataValidationError,
+    NetworkTimeoutError,
+)
+from broadlink.helpers import CRC16
+from homeassistant.core import HomeAssistant
+from .const import (
+    DATA_TRANSPORT,
+    TRANSPORT_RETRY_INTERVAL,
+)
+from .capture import record_exchange
+
+_LOGGER = logging.getLogger(__name__)
+
+# Broadlink frame layout
+FRAME_MAGIC = bytes.fromhex("5aa5aa555aa5aa55")
+FRAME_HEADER_SIZE = 0x38
+PACKET_TYPE_COMMAND = 0x6A
+
+def _checksum(data) -> int:
+    """Return the Broadlink checksum of a frame or payload.
+
+    Args:
+        data: The bytes to sum.
+
+    Returns:
+        int: The 16-bit checksum.
+    """
+    return sum(data, 0xBEAF) & 0xFFFF
+
+def build_frame(device, packet_type: int, payload: bytes):
+    """Build an encrypted Broadlink frame for a device, advancing its packet counter.
+
+    The counter is shared with the library, so frames sent by either stay in sequence.
+
+    Args:
+        device: The authenticated HysenHeatingDevice instance.
+        packet_type: The Broadlink packet type.
+        payload: The unencrypted payload.
+
+    Returns:
+        tuple: The frame and its packet counter.
+    """
+    device.count = ((device.count + 1) | 0x8000) & 0xFFFF
+    frame = bytearray(FRAME_HEADER_SIZE)
+    frame[0x00:0x08] = FRAME_MAGIC
+    frame[0x24:0x26] = device.devtype.to_bytes(2, "little")
+    frame[0x26:0x28] = packet_type.to_bytes(2, "little")
+    frame[0x28:0x2A] = device.count.to_bytes(2, "little")
+    frame[0x2A:0x30] = device.mac[::-1]
+    frame[0x30:0x34] = device.id.to_bytes(4, "little")
+    frame[0x34:0x36] = _checksum(payload).to_bytes(2, "little")
+    frame.extend(device.encrypt(payload + bytes((16 - len(payload)) % 16)))
+    frame[0x20:0x22] = _checksum(frame).to_bytes(2, "little")
+    return bytes(frame), device.count
+
+def _reply_count(reply: bytes):
+    """Return the packet counter a reply frame answers.
+
+    Args:
+        reply: The reply frame.
+
+    Returns:
+        int: The packet counter of the request.
+    """
+    return int.from_bytes(reply[0x28:0x2A], "little")
+
+def _check_reply(reply: bytes):
+    """Check the length and checksum of a reply frame, as the library does.
+
+    Args:
+        reply: The reply frame.
+
+    Returns:
+        None
+
+    Raises:
+        DataValidationError: If the reply is damaged.
+    """
+    if len(reply) < 0x30:
+        raise DataValidationError(-4007, "Received data packet length error")
+    if int.from_bytes(reply[0x20:0x22], "little") != (_checksum(reply) - sum(reply[0x20:0x22])) & 0xFFFF:
+        raise DataValidationError(-4008, "Received data packet check error")
+
+def send_packet_hedged(device, packet_type: int, payload: bytes, hedger):
+    """Send a packet like the library does, hedging it once if it is slow (blocking).
+
+    The packet is resent every TRANSPORT_RETRY_INTERVAL seconds until the device's
+    timeout. If the hedger allows, a copy with a new packet counter is also sent
+    once the device's usual round-trip time has passed without a reply.
+
+    Args:
+        device: The authenticated HysenHeatingDevice instance.
+        packet_type: The Broadlink packet type.
+        payload: The unencrypted payload.
+        hedger: The HysenHedger of the device.
+
+    Returns:
+        bytes: The reply frame.
+
+    Raises:
+        NetworkTimeoutError: If the device does not answer within its timeout.
+        DataValidationError: If the reply is damaged.
+    """
+    sent = time.time()
+    start = time.monotonic()
+    deadline = start + device.timeout
+    delay = hedger.begin()
+    hedge_at = start + delay if delay is not None else None
+    next_retry = start + TRANSPORT_RETRY_INTERVAL
+    frame, count = build_frame(device, packet_type, payload)
+    sends = {count: start}
+    resent = set()
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as conn:
+            conn.sendto(frame, device.host)
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise NetworkTimeoutError(
+                        -4000, "Network timeout", f"No response received within {device.timeout}s"
+                    )
+                if hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    if hedger.try_hedge():
+                        frame, count = build_frame(device, packet_type, payload)
+                        sends[count] = now
+                        conn.sendto(frame, device.host)
+                elif now >= next_retry:
+                    conn.sendto(frame, device.host)
+                    resent.add(count)
+                    next_retry = now + TRANSPORT_RETRY_INTERVAL
+                conn.settimeout(max(0.001, min(deadline, next_retry, hedge_at or deadline) - now))
+                try:
+                    reply = conn.recv(2048)
+                except socket.timeout:
+                    continue
+                if len(reply) >= 0x30 and _reply_count(reply) in sends:
+                    break
+        _check_reply(reply)
+    except Exception as exc:
+        record_exchange(device, packet_type, payload, None, sent, time.monotonic() - start, exc)
+        raise
+    answered = _reply_count(reply)
+    if answered not in resent:
+        hedger.observe(time.monotonic() - sends[answered])
+    record_exchange(device, packet_type, payload, reply, sent, time.monotonic() - start)
+    return reply
+
+def frame_hysen_request(request: bytes):
+    """Wrap a Hysen request with its length prefix and CRC.
+
+    Args:
+        request: The Hysen request.
+
+    Returns:
+        bytes: The payload of the Broadlink command packet.
+    """
+    crc = CRC16.calculate(request)
+    return bytes([len(request) + 2, 0x00]) + request + bytes([crc & 0xFF, crc >> 8])
+
+def unframe_hysen_response(payload: bytes):
+    """Check the length prefix and CRC of a decrypted Hysen response.
+
+    Args:
+        payload: The decrypted payload of the Broadlink reply.
+
+    Returns:
+        bytes: The Hysen response without length prefix and CRC.
+
+    Raises:
+        ValueError: If the length or CRC is wrong, as raised by the library.
+    """
+    length = payload[0]
+    if length + 2 > len(payload):
+        raise ValueError("hysen_response_error", "first byte of response is not length")
+    crc = CRC16.calculate(payload[2:length])
+    if payload[length] != crc & 0xFF or payload[length + 1] != crc >> 8:
+        raise ValueError("hysen_response_error", "CRC check on response failed")
+    return payload[2:length]
+
+class _HysenProtocol(asyncio.DatagramProtocol):
+    """Hand the received datagrams to the shared transport."""
+
+    def __init__(self, owner):
+        """Initialize the protocol.
+
+        Args:
+            owner: The HysenDatagramTransport routing the replies.
+        """
+        self._owner = owner
+
+    def datagram_received(self, data, addr):
+        """Handle a reply from a device.
+
+        Args:
+            data: The reply frame.
+            addr: The (host, port) the reply came from.
+
+        Returns:
+            None
+        """
+        self._owner.handle_reply(data, addr)
+
+    def error_received(self, exc):
+        """Log a socket error. The waiting request retries until its timeout.
+
+        Args:
+            exc: The socket error.
+
+        Returns:
+            None
+        """
+        _LOGGER.debug("Shared transport socket error: %s", exc)
+
+class HysenDatagramTransport:
+    """One UDP endpoint multiplexing the requests to all devices."""
+
+    def __init__(self):
+        """Initialize the transport. The endpoint is opened by async_start."""
+        self._transport = None
+        self._pending = {}
+
+    async def async_start(self):
+        """Open the datagram endpoint.
+
+        Returns:
+            None
+        """
+        self._transport, _protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: _HysenProtocol(self), local_addr=("0.0.0.0", 0)
+        )
+        _LOGGER.debug("Opened shared transport on port %s", self._transport.get_extra_info("sockname")[1])
+
+    def handle_reply(self, data: bytes, addr):
+        """Route a reply to the request waiting for it.
+
+        Args:
+            data: The reply frame.
+            addr: The (host, port) the reply came from.
+
+        Returns:
+            None
+        """
+        if len(data) < 0x30:
+            return
+        future = self._pending.get((addr[0], _reply_count(data)))
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    async def async_send_packet(self, device, packet_type: int, payload: bytes, hedger=None):
+        """Send a packet to a device and wait for the matching reply.
+
+        The packet is resent every TRANSPORT_RETRY_INTERVAL seconds until the
+        device's timeout, as the library does, and hedged once if a hedger is
+        given and allows it. The exchange is recorded if the device is being
+        captured.
+
+        Args:
+            device: The authenticated HysenHeatingDevice instance.
+            packet_type: The Broadlink packet type.
+            payload: The unencrypted payload.
+            hedger: The HysenHedger of the device, for idempotent reads only.
+
+        Returns:
+            bytes: The reply frame.
+
+        Raises:
+            NetworkTimeoutError: If the device does not answer within its timeout.
+            DataValidationError: If the reply is damaged.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        sent = time.time()
+        start = loop.time()
+        deadline = start + device.timeout
+        delay = hedger.begin() if hedger is not None else None
+        hedge_at = start + delay if delay is not None else None
+        next_retry = start + TRANSPORT_RETRY_INTERVAL
+        frame, count = build_frame(device, packet_type, payload)
+        sends = {count: start}
+        resent = set()
+        self._pending[(device.host[0], count)] = future
+        try:
+            self._transport.sendto(frame, device.host)
+            while True:
+                now = loop.time()
+                try:
+                    reply = await asyncio.wait_for(
+                        asyncio.shield(future), max(0, min(deadline, next_retry, hedge_at or deadline) - now)
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    pass
+                now = loop.time()
+                if now >= deadline:
+                    raise NetworkTimeoutError(
+                        -4000, "Network timeout", f"No response received within {device.timeout}s"
+                    )
+                if hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    if hedger.try_hedge():
+                        frame, count = build_frame(device, packet_type, payload)
+                        sends[count] = now
+                        self._pending[(device.host[0], count)] = future
+                        self._transport.sendto(frame, device.host)
+                elif now >= next_retry:
+                    self._transport.sendto(frame, device.host)
+                    resent.add(count)
+                    next_retry = now + TRANSPORT_RETRY_INTERVAL
+            _check_reply(reply)
+        except Exception as exc:
+            record_exchange(device, packet_type, payload, None, sent, loop.time() - start, exc)
+            raise
+        finally:
+            for count in sends:
+                self._pending.pop((device.host[0], count), None)
+        answered = _reply_count(reply)
+        if hedger is not None and answered not in resent:
+            hedger.observe(loop.time() - sends[answered])
+        record_exchange(device, packet_type, payload, reply, sent, loop.time() - start)
+        return reply
+
+    async def async_request_payload(self, device, request: bytes, hedger=None):
+        """Send a Hysen request to a device and return the decrypted reply payload.
+
+        Args:
+            device: The authenticated HysenHeatingDevice instance.
+            request: The Hysen request.
+            hedger: The HysenHedger of the device, for idempotent reads only.
+
+        Returns:
+            bytes: The Hysen response with its length prefix and CRC, not yet checked.
+
+        Raises:
+            Exception: Any Broadlink error reported by the device.
+        """
+        reply = await self.async_send_packet(device, PACKET_TYPE_COMMAND, frame_hysen_request(request), hedger)
+        check_error(reply[0x22:0x24])
+        return device.decrypt(reply[FRAME_HEADER_SIZE:])
+
+    async def async_request(self, device, request: bytes):
+        """Send a Hysen request to a device and return its response.
+
+        Args:
+            device: The authenticated HysenHeatingDevice instance.
+            request: The Hysen request.
+
+        Returns:
+            bytes: The Hysen response, with length prefix and CRC checked and removed.
+
+        Raises:
+            Exception: Any Broadlink error reported by the device, or a ValueError if
+                the response is damaged.
+        """
+        return unframe_hysen_response(await self.async_request_payload(device, request))
+
+    def close(self):
+        """Close the endpoint and fail the requests waiting for a reply.
+
+        Returns:
+            None
+        """
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(NetworkTimeoutError(-4000, "Network timeout", "Shared transport closed"))
+        self._pending = {}
+
+async def async_get_transport(hass: HomeAssistant):
+    """Return the integration's shared transport, opening it if needed.
+
+    Args:
+        hass: The Home Assistant instance.
+
+    Returns:
+        HysenDatagramTransport: The transport shared by all devices using it.
+    """
+    transport = hass.data.get(DATA_TRANSPORT)
+    if transport is not None:
+        return transport
+    transport = HysenDatagramTransport()
+    await transport.async_start()
+    if DATA_TRANSPORT in hass.data:
+        # Another device opened the transport while this one was starting
+        transport.close()
+        return hass.data[DATA_TRANSPORT]
+    hass.data[DATA_TRANSPORT] = transport
+    return transport
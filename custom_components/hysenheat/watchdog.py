@@ -0,0 +1,76 @@
+"""
+Event loop blocking detector for Hysen Heating integration.
+
+This module runs a debug-mode watchdog thread that reports integration code
+paths blocking the Home Assistant event loop for longer than a threshold.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+class HysenLoopWatchdog(threading.Thread):
+    """Report integration code blocking the event loop.
+
+    The watchdog schedules a heartbeat on the loop and, if it does not run within
+    the threshold, samples the loop thread's stack. The block is reported once
+    the loop recovers, but only if integration code was on the stack.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold: float):
+        """Initialize the watchdog.
+
+        Must be called from the event loop thread.
+
+        Args:
+            loop: The event loop to watch.
+            threshold: Seconds of blocking after which a block is reported.
+        """
+        super().__init__(name=f"{DOMAIN}_loop_watchdog", daemon=True)
+        self._loop = loop
+        self._threshold = threshold
+        self._loop_thread_id = threading.get_ident()
+        self._package_dir = os.path.dirname(os.path.abspath(__file__))
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Stop the watchdog thread.
+
+        Returns:
+            None
+        """
+        self._stop_event.set()
+
+    def run(self):
+        """Watch the event loop until stopped.
+
+        Returns:
+            None
+        """
+        while not self._stop_event.is_set():
+            heartbeat = threading.Event()
+            start = time.monotonic()
+            try:
+                self._loop.call_soon_threadsafe(heartbeat.set)
+            except RuntimeError:
+                # The loop is closed
+                return
+            if not heartbeat.wait(self._threshold):
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stack = traceback.extract_stack(frame) if frame is not None else []
+                while not heartbeat.wait(self._threshold) and not self._stop_event.is_set():
+                    pass
+                if any(entry.filename.startswith(self._package_dir) for entry in stack):
+                    _LOGGER.warning(
+                        "Event loop blocked for %.0f ms by integration code:\n%s",
+                        (time.monotonic() - start) * 1000,
+                        "".join(traceback.format_list(stack)),
+                    )
+            self._stop_event.wait(self._threshold)
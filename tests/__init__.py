@@ -0,0 +1 @@
+"""Tests for the Hysen Heating integration."""
@@ -0,0 +1,19 @@
+"""
+Fixtures for the Hysen Heating integration tests.
+
+The tests run on pytest-homeassistant-custom-component, see requirements_test.txt.
+"""
+
+import pytest
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Let Home Assistant load the integration from custom_components.
+
+    Args:
+        enable_custom_integrations: The fixture enabling custom integrations.
+
+    Yields:
+        None
+    """
+    yield
@@ -0,0 +1,187 @@
+"""
+Tests for setting up and unloading the Hysen Heating integration.
+
+The device answers from memory: its packets are neither sent nor decrypted, so
+the library still parses and checks the status reply while no socket is opened.
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import threading
+import tracemalloc
+from unittest.mock import patch
+import pytest
+from broadlink.helpers import CRC16
+from homeassistant.const import CONF_HOST, CONF_MAC, CONF_NAME, CONF_TIMEOUT
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from custom_components.hysenheat.const import (
+    DOMAIN,
+    SERVICE_SET_HVAC_MODE,
+    DATA_WATCHDOG,
+    DATA_EXECUTOR,
+    DATA_GATEWAY,
+    DATA_TRANSPORT,
+    DATA_FLEET,
+    DATA_TRACER,
+)
+from custom_components.hysenheat.coordinator import HysenCoordinator
+from custom_components.hysenheat.device import create_device
+from custom_components.hysenheat.entity import HysenEntity
+from custom_components.hysenheat.status import STATUS_HEADER
+
+FWVERSION = 42
+MAC = "34:ea:34:00:00:01"
+
+# Reloads before measuring, so imports, caches and stores are in place
+WARMUP_RELOADS = 3
+RELOADS = 20
+# Memory allocated by the integration and retained by all measured reloads together
+MAX_RETAINED_BYTES = 16 * 1024
+# Only allocations made by the integration's own code are measured, Home Assistant
+# keeps some bookkeeping of its own per unloaded entry
+INTEGRATION_TRACES = tracemalloc.Filter(True, os.path.join("*", "custom_components", "hysenheat", "*"))
+# Seconds to wait for the threads of the unloaded integration to exit
+THREAD_EXIT_TIMEOUT = 5
+
+def build_payload():
+    """Build a decrypted status reply payload with plausible values.
+
+    Returns:
+        bytes: The payload with length prefix and CRC.
+    """
+    words = bytes([
+        0x01, 0x51, 0x2B, 0x2C, 0x11, 0x00, 0x2A, 0x02, 0x23, 0x05, 0xFF, 0xFE,
+        0x00, 0x00, 0x00, 0x28, 0x0E, 0x1E, 0x0A, 0x03,
+        0x06, 0x00, 0x08, 0x00, 0x0B, 0x1E, 0x0C, 0x1E, 0x11, 0x00, 0x16, 0x00,
+        0x08, 0x00, 0x17, 0x00,
+        0x2A, 0x20, 0x2A, 0x2A, 0x2A, 0x20, 0x2A, 0x20, 0x00, 0x00,
+    ])
+    response = STATUS_HEADER + words
+    crc = CRC16.calculate(response)
+    return bytes([len(response) + 2, 0x00]) + response + bytes([crc & 0xFF, crc >> 8])
+
+PAYLOAD = build_payload()
+
+def create_offline_device(host: str, mac: str, timeout: int, session: dict = None):
+    """Create a Hysen device answering every request with the same status.
+
+    Args:
+        host: The host address of the device.
+        mac: The MAC address of the device.
+        timeout: The network timeout in seconds.
+        session: A session to reuse, passed on to create_device.
+
+    Returns:
+        HysenHeatingDevice: The device instance.
+    """
+    device = create_device(host, mac, timeout, session)
+    device._authenticated = True
+    device.send_packet = lambda packet_type, request: bytes(0x38)
+    device.decrypt = lambda encrypted: PAYLOAD
+    device.get_fwversion = lambda: FWVERSION
+    return device
+
+def open_fds():
+    """Return the number of file descriptors open in the process.
+
+    Returns:
+        int: The number of open file descriptors.
+    """
+    return len(os.listdir("/proc/self/fd"))
+
+def integration_objects():
+    """Return the coordinators and entities of the integration still alive.
+
+    Returns:
+        list: The HysenCoordinator and HysenEntity instances.
+    """
+    gc.collect()
+    return [obj for obj in gc.get_objects() if isinstance(obj, (HysenCoordinator, HysenEntity))]
+
+def integration_memory(hass):
+    """Return the memory held by objects the integration allocated.
+
+    The tracer is shared by all entries and bounded, so its spans are dropped first.
+
+    Args:
+        hass: The Home Assistant instance.
+
+    Returns:
+        int: The size in bytes of the live allocations traced in the integration's code.
+    """
+    hass.data[DATA_TRACER].clear()
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces([INTEGRATION_TRACES])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+async def async_settled_threads(expected: int = None):
+    """Wait for exiting threads, then return the number of running threads.
+
+    Args:
+        expected: The number of threads to wait for, or None to wait until the
+            number stops dropping.
+
+    Returns:
+        int: The number of running threads.
+    """
+    previous = None
+    for _ in range(THREAD_EXIT_TIMEOUT * 10):
+        count = threading.active_count()
+        if (expected is not None and count <= expected) or (expected is None and count == previous):
+            break
+        previous = count
+        await asyncio.sleep(0.1)
+    return threading.active_count()
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="counting file descriptors needs /proc")
+async def test_reload_loop_does_not_leak(hass):
+    """Reloading the last entry keeps memory, file descriptors, threads and listeners flat."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=MAC,
+        title="Hysen",
+        data={CONF_HOST: "127.0.0.1", CONF_MAC: MAC, CONF_NAME: "Hysen", CONF_TIMEOUT: 1},
+    )
+    entry.add_to_hass(hass)
+
+    async def _async_reload():
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert hass.services.has_service(DOMAIN, SERVICE_SET_HVAC_MODE)
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    # Debug logging also starts the event loop watchdog and its stop listener, the
+    # records are not propagated so the log capture does not keep them alive
+    logger = logging.getLogger("custom_components.hysenheat")
+    level, propagate = logger.level, logger.propagate
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    tracemalloc.start()
+    try:
+        with patch("custom_components.hysenheat.create_device", create_offline_device):
+            for _ in range(WARMUP_RELOADS):
+                await _async_reload()
+            threads = await async_settled_threads()
+            fds = open_fds()
+            listeners = sum(hass.bus.async_listeners().values())
+            memory = integration_memory(hass)
+            for _ in range(RELOADS):
+                await _async_reload()
+            retained = integration_memory(hass) - memory
+    finally:
+        tracemalloc.stop()
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+    assert not integration_objects()
+    assert retained < MAX_RETAINED_BYTES
+    assert open_fds() <= fds
+    assert await async_settled_threads(threads) <= threads
+    assert sum(hass.bus.async_listeners().values()) <= listeners
+    assert not hass.services.has_service(DOMAIN, SERVICE_SET_HVAC_MODE)
+    for key in (DATA_WATCHDOG, DATA_EXECUTOR, DATA_GATEWAY, DATA_TRANSPORT, DATA_FLEET):
+        assert key not in hass.data
+    assert not hass.data[DOMAIN]